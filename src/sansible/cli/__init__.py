@@ -1 +1,39 @@
 """CLI package for sansible commands."""
+
+import argparse
+import sys
+from typing import Callable, Optional, Sequence
+
+
+class LazyVersionAction(argparse.Action):
+    """
+    ``--version`` action that builds its text only when the flag is used.
+    
+    The detailed version string queries the platform (uname and friends),
+    which every other invocation would otherwise pay for while the parser
+    is being built.
+    """
+    
+    def __init__(self, option_strings, version_factory: Callable[[], str], dest=argparse.SUPPRESS, **kwargs):
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(option_strings, dest=dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+        self.version_factory = version_factory
+    
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser._print_message(self.version_factory() + "\n", sys.stdout)
+        parser.exit()
+
+
+def print_version_only(args: Optional[Sequence[str]], version_factory: Callable[[], str]) -> bool:
+    """
+    Print the version and return True if ``--version`` is the only argument.
+    
+    Lets entrypoints answer the common ``prog --version`` without building
+    their parser. Anything else (including ``--version`` mixed with other
+    arguments) is left to argparse.
+    """
+    argv = sys.argv[1:] if args is None else args
+    if len(argv) == 1 and argv[0] == "--version":
+        print(version_factory())
+        return True
+    return False
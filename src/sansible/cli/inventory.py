@@ -9,15 +9,18 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import sys
-import platform
 
 from sansible import __version__
+from sansible.cli import LazyVersionAction, print_version_only
 
 
 def get_version_string() -> str:
     """Generate a detailed version string."""
+    import platform
+    
     python_version = platform.python_version()
     os_info = f"{platform.system()} {platform.release()}"
     return (
@@ -28,8 +31,13 @@ def get_version_string() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser for sansible-inventory."""
+    """
+    Create the argument parser for sansible-inventory.
+    
+    Built once per process and shared; parse_args() does not modify it.
+    """
     parser = argparse.ArgumentParser(
         prog="sansible-inventory",
         description="Show Ansible inventory information (pure-Python, Windows-native)",
@@ -44,8 +52,8 @@ Examples:
     
     parser.add_argument(
         "--version",
-        action="version",
-        version=get_version_string(),
+        action=LazyVersionAction,
+        version_factory=get_version_string,
     )
     
     parser.add_argument(
@@ -93,6 +101,9 @@ Examples:
 
 def main(args: list[str] | None = None) -> int:
     """Main entrypoint for sansible-inventory CLI."""
+    if print_version_only(args, get_version_string):
+        return 0
+    
     parser = create_parser()
     parsed = parser.parse_args(args)
     
@@ -10,14 +10,17 @@ Supports most ansible-playbook options for compatibility.
 """
 
 import argparse
+import functools
 import sys
-import platform
 
 from sansible import __version__
+from sansible.cli import LazyVersionAction, print_version_only
 
 
 def get_version_string() -> str:
     """Generate a detailed version string."""
+    import platform
+    
     python_version = platform.python_version()
     os_info = f"{platform.system()} {platform.release()}"
     return (
@@ -28,8 +31,13 @@ def get_version_string() -> str:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser for sansible-playbook."""
+    """
+    Create the argument parser for sansible-playbook.
+    
+    Built once per process and shared; parse_args() does not modify it.
+    """
     parser = argparse.ArgumentParser(
         prog="sansible-playbook",
         description="Run Ansible playbooks (pure-Python, Windows-native)",
@@ -45,8 +53,8 @@ Examples:
     
     parser.add_argument(
         "--version",
-        action="version",
-        version=get_version_string(),
+        action=LazyVersionAction,
+        version_factory=get_version_string,
     )
     
     parser.add_argument(
@@ -297,50 +305,77 @@ Examples:
     return parser
 
 
+# First characters a JSON value can start with; anything else is a plain string
+_JSON_VALUE_START = frozenset('{["-0123456789tfnNI')
+
+
 def _parse_extra_vars(extra_vars_list: list[str]) -> dict:
-    """Parse extra vars from command line."""
+    """
+    Parse extra vars from command line.
+    
+    Each item is a JSON object, a key=value pair, or a vars file
+    (``@file`` or a bare path), decided from its first character and the
+    position of the first '='.
+    """
     import json
     
     result = {}
     for item in extra_vars_list:
         item = item.strip()
+        first = item[:1]
         
         # Try JSON first
-        if item.startswith('{'):
+        if first == '{':
             try:
                 result.update(json.loads(item))
                 continue
             except json.JSONDecodeError:
                 pass
         
+        # Explicit vars file
+        if first == '@':
+            _load_extra_vars_file(item[1:], result)
+            continue
+        
         # Try key=value format
-        if '=' in item:
-            key, _, value = item.partition('=')
-            key = key.strip()
-            value = value.strip()
+        eq = item.find('=')
+        if eq != -1:
+            key = item[:eq].strip()
+            value = item[eq + 1:].strip()
             
-            # Try to parse value as JSON for complex types
-            try:
-                value = json.loads(value)
-            except json.JSONDecodeError:
-                pass  # Keep as string
+            # Try to parse value as JSON for complex types; only values that
+            # can start a JSON document are worth the attempt
+            if value[:1] in _JSON_VALUE_START:
+                try:
+                    value = json.loads(value)
+                except json.JSONDecodeError:
+                    pass  # Keep as string
             
             result[key] = value
         else:
             # Maybe it's a file path?
-            from pathlib import Path
-            if Path(item).exists():
-                import yaml
-                with open(item) as f:
-                    file_vars = yaml.safe_load(f)
-                    if isinstance(file_vars, dict):
-                        result.update(file_vars)
+            _load_extra_vars_file(item, result)
     
     return result
 
 
+def _load_extra_vars_file(path: str, result: dict) -> None:
+    """Merge a YAML/JSON vars file into result, if it is a regular file."""
+    from sansible.platform.paths import file_kind
+    if file_kind(path) == "file":
+        import yaml
+        from sansible.engine.playbook import YAML_LOADER
+        with open(path) as f:
+            file_vars = yaml.load(f, Loader=YAML_LOADER)
+            if isinstance(file_vars, dict):
+                result.update(file_vars)
+
+
 def main(args: list[str] | None = None) -> int:
     """Main entrypoint for sansible-playbook CLI."""
+    if print_version_only(args, get_version_string):
+        return 0
+    
     parser = create_parser()
     parsed = parser.parse_args(args)
     
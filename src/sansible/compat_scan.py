@@ -16,6 +16,8 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 import yaml
 
+from sansible.engine.playbook import YAML_LOADER
+
 
 # Known module FQCNs and their short names
 MODULE_ALIASES = {
@@ -302,7 +304,7 @@ class CompatibilityScanner:
         
         try:
             content = file_path.read_text(encoding='utf-8')
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=YAML_LOADER)
         except Exception as e:
             self.result.errors.append(f"{rel_path}: {e}")
             return
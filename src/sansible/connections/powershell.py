@@ -0,0 +1,50 @@
+"""
+Sansible PowerShell Helpers
+
+Render Python values as PowerShell source for WinRM scripts.
+"""
+
+import base64
+from typing import Any, Dict
+
+
+def ps_quote(value: str) -> str:
+    """
+    Quote a string as a PowerShell single-quoted literal.
+    
+    Single-quoted strings are not expanded, so doubling embedded quotes is
+    the only escaping needed.
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def ps_literal(value: Any) -> str:
+    """
+    Render a Python value as a PowerShell literal.
+    
+    Supports None, bools, numbers, strings and lists/tuples of those.
+    """
+    if value is None:
+        return "$null"
+    if isinstance(value, bool):
+        return "$true" if value else "$false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return "@(" + ", ".join(ps_literal(v) for v in value) + ")"
+    return ps_quote(value)
+
+
+def ps_assignments(parameters: Dict[str, Any]) -> str:
+    """Render parameters as ``$name = <literal>`` lines to prefix a script body."""
+    return "".join(f"${key} = {ps_literal(value)}\n" for key, value in parameters.items())
+
+
+def ps_bytes(data: bytes) -> str:
+    """
+    Build a PowerShell expression that evaluates to ``data`` as a byte[].
+    
+    The payload is a single base64 token, so arbitrary content needs no
+    escaping and stays cheap for the PowerShell parser.
+    """
+    return "[Convert]::FromBase64String('" + base64.b64encode(data).decode("ascii") + "')"
@@ -8,10 +8,13 @@ import asyncio
 import base64
 import os
 import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
 from sansible.connections.base import Connection, RunResult
+from sansible.connections.powershell import ps_assignments, ps_quote
 from sansible.engine.inventory import Host
 
 try:
@@ -30,6 +33,29 @@ except ImportError:
 # Chunk size for file transfers (700KB to stay under WinRM limits)
 CHUNK_SIZE = 700 * 1024
 
+# The remote PowerShell host caches every compiled script block keyed by its
+# source text. Modules emit unique scripts (paths, names, payloads), so on a
+# long-lived host the cache only grows. Clear it every N scripts, or right
+# after a script large enough to land on the large object heap.
+SCRIPT_CACHE_CLEAR_INTERVAL = 200
+SCRIPT_CACHE_CLEAR_SIZE = 64 * 1024
+# WS-Management Identify request: answered by the WinRM listener itself,
+# without starting a PowerShell host
+WSMAN_IDENTIFY_XML = (
+    b'<s:Envelope xmlns:s="http://www.w3.org/2003/05/soap-envelope" '
+    b'xmlns:wsmid="http://schemas.dmtf.org/wbem/wsman/identity/1/wsmanidentity.xsd">'
+    b'<s:Header/><s:Body><wsmid:Identify/></s:Body></s:Envelope>'
+)
+
+# ClearScriptBlockCache is private: it may not exist on the target's
+# PowerShell, and ConstrainedLanguage/JEA endpoints refuse the reflection.
+# Any failure is swallowed so it never shows up in the user's command result.
+CLEAR_SCRIPT_CACHE_PS = (
+    "try { $clearCache = [ScriptBlock].GetMethod('ClearScriptBlockCache', "
+    "[Reflection.BindingFlags]'Static,NonPublic'); "
+    "if ($null -ne $clearCache) { [void]$clearCache.Invoke($null, $null) } } catch {}\n"
+)
+
 
 class WinRMConnection(Connection):
     """
@@ -40,6 +66,10 @@ class WinRMConnection(Connection):
     - Basic authentication
     - Kerberos authentication (if configured)
     - SSL/TLS connections
+    
+    Scripts run on one runspace pool that is opened on first use and kept
+    for the life of the connection, so PowerShell host startup is paid once
+    per connection rather than once per command.
     """
     
     def __init__(self, host: Host):
@@ -53,6 +83,14 @@ class WinRMConnection(Connection):
         
         self._client: Optional[Client] = None
         self._wsman: Optional[WSMan] = None
+        self._pool: Optional[RunspacePool] = None
+        # Set once the pool fails to open; later calls go straight to the client
+        self._pool_failed = False
+        self._pool_lock = threading.Lock()
+        self._ps_calls_since_clear = 0
+        self._clear_cache_pending = False
+        # time.monotonic() of the last script that completed with rc == 0
+        self.last_success: Optional[float] = None
     
     async def connect(self) -> None:
         """Establish WinRM connection."""
@@ -123,9 +161,11 @@ class WinRMConnection(Connection):
     
     async def close(self) -> None:
         """Close WinRM connection."""
-        # pypsrp handles connection pooling, just clear references
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._close_pool)
         self._client = None
         self._wsman = None
+        self._pool_failed = False
     
     async def run(
         self,
@@ -142,8 +182,8 @@ class WinRMConnection(Connection):
             command: Command/script to execute
             shell: If True, run as PowerShell script; else as cmd command
             timeout: Optional timeout in seconds
-            cwd: Working directory (prepends Set-Location)
-            environment: Environment variables
+            cwd: Working directory for this command only
+            environment: Environment variables for this command only
             
         Returns:
             RunResult with rc, stdout, stderr
@@ -151,24 +191,17 @@ class WinRMConnection(Connection):
         if not self._client:
             return RunResult(rc=1, stdout="", stderr="Not connected")
         
-        # Build PowerShell script
-        ps_script = ""
-        
-        # Set working directory
-        if cwd:
-            ps_script += f"Set-Location -Path '{cwd}'\n"
-        
-        # Set environment variables
-        if environment:
-            for key, value in environment.items():
-                ps_script += f"$env:{key} = '{value}'\n"
-        
         if shell:
             # Run as PowerShell script
-            ps_script += command
+            ps_script = command
         else:
             # Run as cmd.exe command
-            ps_script += f"cmd.exe /c \"{command}\""
+            ps_script = f"cmd.exe /c \"{command}\""
+        
+        if cwd or environment:
+            ps_script = self._with_cwd_and_environment(ps_script, cwd, environment)
+        
+        ps_script = self._with_cache_maintenance(ps_script)
         
         # Execute in thread pool (pypsrp is synchronous)
         loop = asyncio.get_event_loop()
@@ -178,6 +211,8 @@ class WinRMConnection(Connection):
                 loop.run_in_executor(None, self._run_powershell, ps_script),
                 timeout=timeout
             )
+            if result.rc == 0:
+                self.last_success = time.monotonic()
             return result
         except asyncio.TimeoutError:
             return RunResult(
@@ -186,10 +221,191 @@ class WinRMConnection(Connection):
                 stderr="Command timed out",
             )
     
-    def _run_powershell(self, script: str) -> RunResult:
+    async def run_script(
+        self,
+        script: str,
+        parameters: dict,
+        timeout: Optional[int] = None,
+    ) -> RunResult:
+        """
+        Run a PowerShell script body with parameters bound out of band.
+        
+        The body is wrapped in a ``param()`` block and the values travel as
+        serialized objects, so the script text is the same on every call
+        (cache-friendly on the target) and values never need quoting.
+        
+        Args:
+            script: Script body referring to ``$<name>`` for each parameter
+            parameters: Parameter names and values
+            timeout: Optional timeout in seconds
+        """
+        if not self._client:
+            return RunResult(rc=1, stdout="", stderr="Not connected")
+        
+        loop = asyncio.get_event_loop()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(None, self._run_powershell, script, parameters),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return RunResult(rc=124, stdout="", stderr="Command timed out")
+        if result.rc == 0:
+            self.last_success = time.monotonic()
+        return result
+    
+    async def wsman_identify(self) -> bool:
+        """
+        Send a WS-Management Identify request.
+        
+        This exercises the network path and authentication without starting
+        PowerShell on the target.
+        
+        Returns:
+            True if the listener answered with an IdentifyResponse
+        """
+        if not self._wsman:
+            return False
+        
+        loop = asyncio.get_event_loop()
+        try:
+            response = await loop.run_in_executor(
+                None, self._wsman.transport.send, WSMAN_IDENTIFY_XML
+            )
+        except Exception:
+            return False
+        
+        if b"IdentifyResponse" not in (response or b""):
+            return False
+        self.last_success = time.monotonic()
+        return True
+    
+    @staticmethod
+    def _with_cwd_and_environment(
+        script: str, cwd: Optional[str], environment: Optional[dict]
+    ) -> str:
+        """
+        Run the script in ``cwd`` with ``environment`` set, then put both back.
+        
+        The runspace pool outlives the task, and the location and process
+        environment are shared by every later script on it, so both are
+        restored in a ``finally`` block.
+        """
+        prologue = ""
+        epilogue = ""
+        if environment:
+            names = ", ".join(ps_quote(key) for key in environment)
+            prologue += (
+                "$__sansible_env = @{}\n"
+                f"foreach ($__name in @({names})) {{ "
+                "$__sansible_env[$__name] = [Environment]::GetEnvironmentVariable($__name) }\n"
+            )
+            for key, value in environment.items():
+                prologue += (
+                    f"[Environment]::SetEnvironmentVariable({ps_quote(key)}, {ps_quote(value)})\n"
+                )
+            epilogue += (
+                "    foreach ($__name in $__sansible_env.Keys) { "
+                "[Environment]::SetEnvironmentVariable($__name, $__sansible_env[$__name]) }\n"
+            )
+        if cwd:
+            prologue = f"Push-Location -LiteralPath {ps_quote(cwd)} -ErrorAction Stop\n" + prologue
+            epilogue += "    Pop-Location\n"
+        
+        return f"{prologue}try {{\n{script}\n}} finally {{\n{epilogue}}}"
+    
+    def _with_cache_maintenance(self, script: str) -> str:
+        """Prepend a ScriptBlock cache clear to the script when one is due."""
+        large = len(script) > SCRIPT_CACHE_CLEAR_SIZE
+        due = (
+            self._clear_cache_pending
+            or self._ps_calls_since_clear >= SCRIPT_CACHE_CLEAR_INTERVAL
+        )
+        if due:
+            script = CLEAR_SCRIPT_CACHE_PS + script
+            self._ps_calls_since_clear = 0
+            self._clear_cache_pending = False
+        
+        self._ps_calls_since_clear += 1
+        if large:
+            self._clear_cache_pending = True
+        return script
+    
+    def _execute_ps(self, script: str, parameters: Optional[dict] = None):
+        """
+        Execute a script on the persistent runspace pool.
+        
+        Same return shape as ``Client.execute_ps``: (output, streams, had_errors).
+        Falls back to a one-shot ``Client.execute_ps`` if the pool cannot be
+        opened, and keeps doing so for the rest of the connection rather than
+        retrying the open on every call; a pool that fails mid-command is
+        dropped and reopened on the next call.
+        
+        Scripts run in a local scope so variables and preferences they set
+        (``$ErrorActionPreference`` and the like) do not leak into later
+        scripts on the shared pool.
+        """
+        # The lock covers only opening and fetching the pool; invoke() runs
+        # outside it, so a slow script never holds up other calls or close()
+        with self._pool_lock:
+            if self._pool is None and not self._pool_failed:
+                try:
+                    pool = RunspacePool(self._wsman)
+                    pool.open()
+                except Exception:
+                    self._pool_failed = True
+                else:
+                    self._pool = pool
+            pool = self._pool
+        
+        if pool is None:
+            if parameters:
+                script = ps_assignments(parameters) + script
+            return self._client.execute_ps(script)
+        
+        powershell = PowerShell(pool)
+        if parameters:
+            names = ", ".join(f"${name}" for name in parameters)
+            powershell.add_script(f"param({names})\n{script}", use_local_scope=True)
+            powershell.add_parameters(parameters)
+        else:
+            powershell.add_script(script, use_local_scope=True)
+        try:
+            powershell.invoke()
+        except Exception:
+            self._discard_pool(pool)
+            raise
+        
+        output = "\n".join(str(o) for o in powershell.output)
+        return output, powershell.streams, powershell.had_errors
+    
+    def _close_pool(self) -> None:
+        """Close the persistent runspace pool, if open."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        self._release_pool(pool)
+    
+    def _discard_pool(self, pool: "RunspacePool") -> None:
+        """Drop a failed pool unless another call has already replaced it."""
+        with self._pool_lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        self._release_pool(pool)
+    
+    @staticmethod
+    def _release_pool(pool: Optional["RunspacePool"]) -> None:
+        """Close a pool that is no longer shared, ignoring errors."""
+        if pool is not None:
+            try:
+                pool.close()
+            except Exception:
+                pass
+    
+    def _run_powershell(self, script: str, parameters: Optional[dict] = None) -> RunResult:
         """Synchronous PowerShell execution."""
         try:
-            output, streams, had_errors = self._client.execute_ps(script)
+            output, streams, had_errors = self._execute_ps(script, parameters)
             
             # pypsrp returns None for empty output, and streams is a PSDataStreams object
             stdout = output or ""
@@ -244,7 +460,7 @@ class WinRMConnection(Connection):
         
         # Ensure parent directory exists
         remote_dir = str(Path(remote_path).parent).replace('/', '\\')
-        self._client.execute_ps(
+        self._execute_ps(
             f"New-Item -ItemType Directory -Force -Path '{remote_dir}' | Out-Null"
         )
         
@@ -253,13 +469,13 @@ class WinRMConnection(Connection):
         
         if len(file_bytes) == 0:
             # Empty file - just create it
-            self._client.execute_ps(
+            self._execute_ps(
                 f"Set-Content -Path '{remote_path}' -Value '' -NoNewline"
             )
             return
         
         # Clear any existing file
-        self._client.execute_ps(
+        self._execute_ps(
             f"if (Test-Path '{remote_path}') {{ Remove-Item '{remote_path}' -Force }}"
         )
         
@@ -276,7 +492,7 @@ $stream = [System.IO.File]::Open('{remote_path}', [System.IO.FileMode]::Append)
 $stream.Write($bytes, 0, $bytes.Length)
 $stream.Close()
 """
-            stdout, stderr, had_errors = self._client.execute_ps(ps_script)
+            stdout, stderr, had_errors = self._execute_ps(ps_script)
             
             if had_errors:
                 raise RuntimeError(f"File upload failed: {stderr}")
@@ -308,7 +524,7 @@ $stream.Close()
         remote_path = remote_path.replace('/', '\\')
         
         # Get file size first
-        stdout, stderr, _ = self._client.execute_ps(
+        stdout, stderr, _ = self._execute_ps(
             f"(Get-Item '{remote_path}').Length"
         )
         file_size = int(stdout.strip()) if stdout.strip() else 0
@@ -334,7 +550,7 @@ $stream.Read($buffer, 0, {chunk_size}) | Out-Null
 $stream.Close()
 [Convert]::ToBase64String($buffer)
 """
-                stdout, stderr, had_errors = self._client.execute_ps(ps_script)
+                stdout, stderr, had_errors = self._execute_ps(ps_script)
                 
                 if had_errors:
                     raise RuntimeError(f"File download failed: {stderr}")
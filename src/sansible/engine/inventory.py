@@ -15,11 +15,15 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import yaml
 
 from sansible.engine.errors import InventoryError, ParseError
+from sansible.engine.playbook import YAML_LOADER
+from sansible.platform.paths import file_kind
 
 
 class Host:
     """Represents a single host in the inventory."""
     
+    __slots__ = ("name", "vars", "_groups")
+    
     def __init__(self, name: str, variables: Optional[Dict[str, Any]] = None):
         self.name = name
         self.vars: Dict[str, Any] = variables.copy() if variables else {}
@@ -166,10 +170,11 @@ class InventoryManager:
         
         source_path = Path(source) if isinstance(source, str) else source
         
-        if not source_path.exists():
+        kind = file_kind(source_path)
+        if kind == "missing":
             raise InventoryError(f"Inventory path does not exist: {source_path}")
         
-        if source_path.is_file():
+        if kind == "file":
             self._inventory_dir = source_path.parent
             
             # Check if it's an executable (dynamic inventory script)
@@ -181,7 +186,7 @@ class InventoryManager:
                 self._parse_dynamic_inventory(source_path)
             else:
                 self._parse_file(source_path)
-        elif source_path.is_dir():
+        elif kind == "dir":
             self._inventory_dir = source_path
             self._parse_directory(source_path)
         else:
@@ -449,7 +454,7 @@ class InventoryManager:
                 if item.is_file() and item.suffix in ('.yml', '.yaml'):
                     if group_name not in self.groups:
                         self.groups[group_name] = Group(group_name)
-                    vars_data = yaml.safe_load(item.read_text(encoding='utf-8')) or {}
+                    vars_data = yaml.load(item.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                     for key, value in vars_data.items():
                         self.groups[group_name].set_variable(key, value)
                 elif item.is_dir():
@@ -457,11 +462,11 @@ class InventoryManager:
                     if group_name not in self.groups:
                         self.groups[group_name] = Group(group_name)
                     for yaml_file in item.glob('*.yml'):
-                        vars_data = yaml.safe_load(yaml_file.read_text(encoding='utf-8')) or {}
+                        vars_data = yaml.load(yaml_file.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                         for key, value in vars_data.items():
                             self.groups[group_name].set_variable(key, value)
                     for yaml_file in item.glob('*.yaml'):
-                        vars_data = yaml.safe_load(yaml_file.read_text(encoding='utf-8')) or {}
+                        vars_data = yaml.load(yaml_file.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                         for key, value in vars_data.items():
                             self.groups[group_name].set_variable(key, value)
         
@@ -473,16 +478,16 @@ class InventoryManager:
                 if host_name in self.hosts:
                     host = self.hosts[host_name]
                     if item.is_file() and item.suffix in ('.yml', '.yaml'):
-                        vars_data = yaml.safe_load(item.read_text(encoding='utf-8')) or {}
+                        vars_data = yaml.load(item.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                         for key, value in vars_data.items():
                             host.set_variable(key, value)
                     elif item.is_dir():
                         for yaml_file in item.glob('*.yml'):
-                            vars_data = yaml.safe_load(yaml_file.read_text(encoding='utf-8')) or {}
+                            vars_data = yaml.load(yaml_file.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                             for key, value in vars_data.items():
                                 host.set_variable(key, value)
                         for yaml_file in item.glob('*.yaml'):
-                            vars_data = yaml.safe_load(yaml_file.read_text(encoding='utf-8')) or {}
+                            vars_data = yaml.load(yaml_file.read_text(encoding='utf-8'), Loader=YAML_LOADER) or {}
                             for key, value in vars_data.items():
                                 host.set_variable(key, value)
     
@@ -630,7 +635,7 @@ class InventoryManager:
     
     def _parse_yaml_string(self, content: str, source_path: Optional[Path] = None) -> None:
         """Parse YAML format inventory."""
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=YAML_LOADER)
         if data:
             self._parse_yaml_data(data, source_path)
     
@@ -4,14 +4,96 @@ Sansible Playbook Parser
 Parses YAML playbooks into executable Play and Task objects.
 """
 
+import hashlib
+import os
 import re
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 
 from sansible.engine.errors import ParseError, UnsupportedFeatureError
+from sansible.platform import DATACLASS_SLOTS
+
+# PyYAML's libyaml binding parses the same documents in C; PyYAML builds
+# without libyaml fall back to the pure-Python loader
+try:
+    from yaml import CSafeLoader as YAML_LOADER
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as YAML_LOADER  # type: ignore[assignment]
+
+
+# Node tags _construct_node builds itself
+_STR_TAG = 'tag:yaml.org,2002:str'
+_SEQ_TAG = 'tag:yaml.org,2002:seq'
+_MAP_TAG = 'tag:yaml.org,2002:map'
+
+
+def _construct_node(loader: Any, node: Any, memo: Dict[int, Any]) -> Any:
+    """
+    Build the Python value of a composed node.
+    
+    Playbooks are almost entirely string-keyed mappings, lists and plain
+    strings, which are built straight from the node tree. Every other tag
+    (bools, ints, nulls, merge keys, non-string keys) goes through the
+    loader's own constructor, so the result is what yaml.load returns.
+    
+    Aliases point at the same node object, so values are memoized by
+    ``id(node)`` for the document (as the loader's constructed_objects
+    does): an alias is built once and shared, however deeply anchors nest.
+    Containers are memoized before their items are built, which also ties
+    self-referencing aliases back to the container.
+    """
+    tag = node.tag
+    if tag == _STR_TAG:
+        return node.value
+    key = id(node)
+    if key in memo:
+        return memo[key]
+    if tag == _SEQ_TAG:
+        sequence = memo[key] = []
+        sequence.extend(_construct_node(loader, item, memo) for item in node.value)
+        return sequence
+    if tag == _MAP_TAG and all(k.tag == _STR_TAG for k, _ in node.value):
+        mapping = memo[key] = {}
+        for key_node, value_node in node.value:
+            mapping[key_node.value] = _construct_node(loader, value_node, memo)
+        return mapping
+    value = memo[key] = loader.construct_object(node, deep=True)
+    return value
+
+
+def _construct_document(loader: Any, node: Any) -> Any:
+    """Build a document's value, falling back to the full constructor."""
+    try:
+        return _construct_node(loader, node, {})
+    except RecursionError:
+        # Nesting deeper than the fast path's recursion limit
+        return loader.construct_document(node)
+
+
+def _load_yaml(text: str) -> Any:
+    """Load a single YAML document, like yaml.load with YAML_LOADER."""
+    loader = YAML_LOADER(text)
+    try:
+        node = loader.get_single_node()
+        return None if node is None else _construct_document(loader, node)
+    finally:
+        loader.dispose()
+
+
+def _load_yaml_documents(text: str) -> List[Any]:
+    """Load every YAML document in text, like yaml.load_all with YAML_LOADER."""
+    loader = YAML_LOADER(text)
+    try:
+        documents = []
+        while loader.check_node():
+            documents.append(_construct_document(loader, loader.get_node()))
+        return documents
+    finally:
+        loader.dispose()
 
 
 # Pattern for Galaxy collection module names (namespace.collection.module)
@@ -83,7 +165,7 @@ UNSUPPORTED_TASK_KEYS = {
 }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Task:
     """Represents a single task in a playbook."""
     
@@ -116,11 +198,14 @@ class Task:
     _is_rescue: bool = False
     _is_always: bool = False
     
+    # Variables from the role this task came from (merged in the runner)
+    _role_vars: Dict[str, Any] = field(default_factory=dict)
+    
     def __repr__(self) -> str:
         return f"Task(name={self.name!r}, module={self.module!r})"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Block:
     """Represents a block of tasks with error handling."""
     
@@ -138,7 +223,7 @@ class Block:
         return f"Block(name={self.name!r}, tasks={len(self.block)})"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Play:
     """Represents a single play in a playbook."""
     
@@ -163,6 +248,77 @@ class Play:
         return f"Play(name={self.name!r}, hosts={self.hosts!r}, tasks={len(self.tasks)})"
 
 
+# Parsed playbooks, most recently used last. Keys are (playbook path, cwd,
+# digest of the playbook bytes); values pair the stamps of every other file
+# the parse read with the parsed plays. See PlaybookParser.parse.
+PARSE_CACHE_SIZE = 256
+_FileStamp = Optional[Tuple[int, int]]
+_ParseKey = Tuple[str, str, bytes]
+_parse_cache: "OrderedDict[_ParseKey, Tuple[Tuple[Tuple[str, _FileStamp], ...], List[Play]]]" = OrderedDict()
+
+
+def _file_stamp(path: Union[str, Path]) -> _FileStamp:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _clone_data(value: Any) -> Any:
+    """
+    Copy a YAML-derived value.
+    
+    Parsed YAML is a tree of dicts and lists over immutable scalars, so
+    rebuilding the containers is a full copy, without deepcopy's memo and
+    reduce machinery.
+    """
+    if isinstance(value, dict):
+        return {k: _clone_data(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone_data(v) for v in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _clone_task(task: Task) -> Task:
+    """Copy a Task; scalar fields are shared, containers are rebuilt."""
+    return replace(
+        task,
+        args=_clone_data(task.args),
+        loop=_clone_data(task.loop),
+        loop_control=_clone_data(task.loop_control),
+        environment=dict(task.environment),
+        tags=list(task.tags),
+        notify=list(task.notify),
+        listen=list(task.listen),
+        _role_vars=_clone_data(task._role_vars),
+    )
+
+
+def _clone_plays(plays: List[Play]) -> List[Play]:
+    """Copy parsed plays for a caller that may modify them."""
+    return [
+        replace(
+            play,
+            tasks=[_clone_task(t) for t in play.tasks],
+            handlers=[_clone_task(t) for t in play.handlers],
+            vars=_clone_data(play.vars),
+            vars_files=list(play.vars_files),
+            environment=dict(play.environment),
+            tags=list(play.tags),
+        )
+        for play in plays
+    ]
+
+
+def clear_parse_cache() -> None:
+    """Forget all cached parse results."""
+    _parse_cache.clear()
+
+
 class PlaybookParser:
     """
     Parse YAML playbooks into Play and Task objects.
@@ -174,14 +330,21 @@ class PlaybookParser:
         self.playbook_path = Path(playbook_path)
         self.plays: List[Play] = []
         self._base_dir = self.playbook_path.parent
+        # Stamps of the files read by the current parse (vars_files, roles,
+        # included task files), used to validate cached results
+        self._dependencies: Dict[str, _FileStamp] = {}
     
     def parse(self) -> List[Play]:
         """
         Parse the playbook file.
         
+        Results are cached per process, keyed on the playbook's path and
+        content; a cached result is reused only while every other file the
+        parse read is unchanged. Callers always get their own copy.
+        
         Returns:
             List of Play objects
-            
+        
         Raises:
             ParseError: If the playbook has syntax errors
             UnsupportedFeatureError: If playbook uses unsupported features
@@ -192,11 +355,35 @@ class PlaybookParser:
                 file_path=str(self.playbook_path)
             )
         
-        content = self.playbook_path.read_text(encoding='utf-8')
+        data = self.playbook_path.read_bytes()
+        key = (
+            str(self.playbook_path.resolve()),
+            os.getcwd(),
+            hashlib.blake2b(data, digest_size=16).digest(),
+        )
         
+        cached = _parse_cache.get(key)
+        if cached is not None and all(
+            _file_stamp(path) == stamp for path, stamp in cached[0]
+        ):
+            _parse_cache.move_to_end(key)
+            plays = _clone_plays(cached[1])
+        else:
+            self._dependencies = {}
+            plays = self._parse_content(data.decode('utf-8'))
+            _parse_cache[key] = (tuple(self._dependencies.items()), _clone_plays(plays))
+            _parse_cache.move_to_end(key)
+            while len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        
+        self.plays.extend(plays)
+        return self.plays
+    
+    def _parse_content(self, content: str) -> List[Play]:
+        """Parse playbook text into plays."""
         try:
-            # Use safe_load_all for multi-document YAML (though playbooks are usually single-doc)
-            documents = list(yaml.safe_load_all(content))
+            # Multi-document YAML is allowed (though playbooks are usually single-doc)
+            documents = _load_yaml_documents(content)
         except yaml.YAMLError as e:
             raise ParseError(
                 f"YAML syntax error: {e}",
@@ -213,12 +400,23 @@ class PlaybookParser:
             elif isinstance(doc, dict):
                 all_plays.append(doc)
         
-        for play_data in all_plays:
-            if isinstance(play_data, dict):
-                play = self._parse_play(play_data)
-                self.plays.append(play)
-        
-        return self.plays
+        return [
+            self._parse_play(play_data)
+            for play_data in all_plays
+            if isinstance(play_data, dict)
+        ]
+    
+    def _read_text(self, path: Path) -> str:
+        """Read a file the parse depends on, recording its stamp."""
+        self._dependencies[str(path)] = _file_stamp(path)
+        return path.read_text(encoding='utf-8')
+    
+    def _read_optional(self, path: Path) -> Optional[str]:
+        """Like _read_text, but None (still recorded) if the file is missing."""
+        stamp = self._dependencies[str(path)] = _file_stamp(path)
+        if stamp is None:
+            return None
+        return path.read_text(encoding='utf-8')
     
     def _parse_play(self, data: Dict[str, Any]) -> Play:
         """Parse a single play from YAML data."""
@@ -264,7 +462,7 @@ class PlaybookParser:
             for vars_file in play.vars_files:
                 vars_path = self._base_dir / vars_file
                 if vars_path.exists():
-                    vars_data = yaml.safe_load(vars_path.read_text(encoding='utf-8')) or {}
+                    vars_data = _load_yaml(self._read_text(vars_path)) or {}
                     if isinstance(vars_data, dict):
                         play.vars.update(vars_data)
                 else:
@@ -340,7 +538,7 @@ class PlaybookParser:
         Args:
             role_entry: Either a string (role name) or dict with role, vars, etc.
             play_vars: Variables from the play level
-            
+        
         Returns:
             List of Task objects from the role
         """
@@ -377,16 +575,18 @@ class PlaybookParser:
         
         # Load role defaults (lowest priority)
         defaults_file = role_path / "defaults" / "main.yml"
-        if defaults_file.exists():
-            defaults = yaml.safe_load(defaults_file.read_text(encoding='utf-8')) or {}
+        defaults_text = self._read_optional(defaults_file)
+        if defaults_text is not None:
+            defaults = _load_yaml(defaults_text) or {}
             if isinstance(defaults, dict):
                 # Defaults have lower priority than play vars
                 role_vars = {**defaults, **role_vars}
         
         # Load role vars (higher priority than defaults, lower than play vars)
         vars_file = role_path / "vars" / "main.yml"
-        if vars_file.exists():
-            role_specific_vars = yaml.safe_load(vars_file.read_text(encoding='utf-8')) or {}
+        vars_text = self._read_optional(vars_file)
+        if vars_text is not None:
+            role_specific_vars = _load_yaml(vars_text) or {}
             if isinstance(role_specific_vars, dict):
                 role_vars.update(role_specific_vars)
         
@@ -398,7 +598,7 @@ class PlaybookParser:
                 file_path=str(self.playbook_path)
             )
         
-        tasks_data = yaml.safe_load(tasks_file.read_text(encoding='utf-8')) or []
+        tasks_data = _load_yaml(self._read_text(tasks_file)) or []
         if not isinstance(tasks_data, list):
             raise ParseError(
                 f"Role tasks must be a list: {tasks_file}",
@@ -422,9 +622,7 @@ class PlaybookParser:
                         task.when = role_when
                 
                 # Store role vars for later use (will be merged in runner)
-                if not hasattr(task, '_role_vars'):
-                    task._role_vars = {}  # type: ignore
-                task._role_vars.update(role_vars)  # type: ignore
+                task._role_vars.update(role_vars)
                 
                 tasks.append(task)
         
@@ -435,8 +633,11 @@ class PlaybookParser:
         Find the path to a role.
         
         Searches in:
-        1. ./roles/<role_name>
-        2. <playbook_dir>/roles/<role_name>
+        1. <playbook_dir>/roles/<role_name>
+        2. ./roles/<role_name>
+        
+        Candidates that miss are recorded as dependencies, so a cached parse
+        is dropped once an earlier candidate appears.
         
         Returns:
             Path to role directory or None if not found
@@ -449,6 +650,7 @@ class PlaybookParser:
         for path in search_paths:
             if path.is_dir():
                 return path
+            self._dependencies[str(path)] = _file_stamp(path)
         
         return None
     
@@ -488,7 +690,7 @@ class PlaybookParser:
             )
         
         # Load and parse the tasks file
-        tasks_data = yaml.safe_load(tasks_path.read_text(encoding='utf-8')) or []
+        tasks_data = _load_yaml(self._read_text(tasks_path)) or []
         if not isinstance(tasks_data, list):
             raise ParseError(
                 f"Tasks file must contain a list: {tasks_file}",
@@ -623,9 +825,7 @@ class PlaybookParser:
                     tasks.append(apply_block_props(parsed))
         
         return tasks
-        
-        return tasks
-
+    
     def _parse_task(self, data: Dict[str, Any]) -> Task:
         """Parse a single task from YAML data."""
         # Check for unsupported task-level features
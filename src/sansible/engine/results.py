@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 from enum import Enum
 import json
 
+from sansible.platform import DATACLASS_SLOTS
+
 
 class TaskStatus(Enum):
     """Status of a task execution."""
@@ -19,7 +21,7 @@ class TaskStatus(Enum):
     UNREACHABLE = "unreachable"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TaskResult:
     """Result of executing a single task on a single host."""
     
@@ -7,6 +7,7 @@ connections, module execution, and output.
 
 import asyncio
 import sys
+from dataclasses import fields
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Type
 
@@ -29,6 +30,11 @@ from sansible.galaxy.loader import GalaxyModuleLoader
 from sansible.galaxy.module import GalaxyModule
 
 
+def _result_fields(result: TaskResult) -> Dict[str, Any]:
+    """A loop iteration's result as a flat dict of its fields."""
+    return {f.name: getattr(result, f.name) for f in fields(result)}
+
+
 class PlaybookRunner:
     """
     High-level playbook runner.
@@ -329,15 +335,14 @@ class PlaybookRunner:
         task_results: List[Dict[str, TaskResult]] = []
         all_task_results: List[TaskResult] = []
         
-        # Track block failure state per host: {host: {block_name: failed}}
-        block_failed: Dict[str, Dict[str, bool]] = {h: {} for h in host_contexts}
-        block_rescued: Dict[str, Dict[str, bool]] = {h: {} for h in host_contexts}
-        
+        # Block failure state is tracked per host in ctx.failed_blocks and
+        # ctx.rescued_blocks. Every task of a block shares one _block_name
+        # string, so the sets only hold references to it.
         for task in play.tasks:
             # Check if this is a rescue or always task
-            is_rescue = getattr(task, '_is_rescue', False)
-            is_always = getattr(task, '_is_always', False)
-            block_name = getattr(task, '_block_name', None)
+            is_rescue = task._is_rescue
+            is_always = task._is_always
+            block_name = task._block_name
             
             # Determine which hosts should run this task
             hosts_to_run = {}
@@ -345,15 +350,14 @@ class PlaybookRunner:
                 should_run = True
                 
                 if block_name:
-                    host_block_failed = block_failed.get(host_name, {}).get(block_name, False)
-                    host_block_rescued = block_rescued.get(host_name, {}).get(block_name, False)
+                    host_block_failed = block_name in ctx.failed_blocks
                     
                     if is_rescue:
                         # Rescue tasks only run if block failed and not yet rescued
-                        should_run = host_block_failed and not host_block_rescued
+                        should_run = host_block_failed and block_name not in ctx.rescued_blocks
                         if should_run:
                             # Mark as rescued so subsequent rescue tasks know
-                            block_rescued[host_name][block_name] = True
+                            ctx.rescued_blocks.add(block_name)
                             # Reset host failed state to allow rescue tasks
                             ctx.failed = False
                     elif is_always:
@@ -381,7 +385,7 @@ class PlaybookRunner:
             for host_name, result in task_result.items():
                 if result.status == TaskStatus.FAILED:
                     if block_name and not is_rescue and not is_always:
-                        block_failed[host_name][block_name] = True
+                        host_contexts[host_name].failed_blocks.add(block_name)
                         # Don't mark host as permanently failed if there's rescue
                         # The host.failed state is already set by _run_task_single
             
@@ -674,7 +678,7 @@ class PlaybookRunner:
                     status=TaskStatus.FAILED,
                     changed=all_changed,
                     msg=result.msg,
-                    results={'results': [r.__dict__ for r in all_results]},
+                    results={'results': [_result_fields(r) for r in all_results]},
                 )
         
         # All loop iterations succeeded
@@ -683,7 +687,7 @@ class PlaybookRunner:
             task_name=task.name,
             status=TaskStatus.CHANGED if all_changed else TaskStatus.OK,
             changed=all_changed,
-            results={'results': [r.__dict__ for r in all_results]},
+            results={'results': [_result_fields(r) for r in all_results]},
         )
     
     def _resolve_hosts(self, pattern: str) -> List[Host]:
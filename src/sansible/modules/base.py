@@ -4,10 +4,14 @@ Sansible Module Base
 Base class and registry for all modules.
 """
 
+import importlib
+import inspect
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Type
 
+from sansible.connections.base import RunResult
+from sansible.connections.powershell import ps_assignments
 from sansible.engine.playbook import Task
 from sansible.engine.results import TaskResult, TaskStatus
 from sansible.engine.scheduler import HostContext
@@ -50,6 +54,13 @@ class ModuleResult:
         )
 
 
+def become_command(cmd: str, method: str, user: str) -> str:
+    """Wrap a command for privilege escalation with sudo or su (default sudo)."""
+    if method == "su":
+        return f"su - {user} -c '{cmd}'"
+    return f"sudo -u {user} {cmd}"
+
+
 class Module(ABC):
     """
     Base class for all modules.
@@ -110,18 +121,22 @@ class Module(ABC):
         """Wrap command with privilege escalation if become is enabled."""
         if not self.context.become:
             return cmd
+        return become_command(cmd, self.context.become_method, self.context.become_user)
+    
+    async def run_ps(self, script: str, parameters: Dict[str, Any]) -> RunResult:
+        """
+        Run a constant PowerShell script body with parameters.
         
-        method = self.context.become_method
-        user = self.context.become_user
-        
-        if method == "sudo":
-            return f"sudo -u {user} {cmd}"
-        elif method == "su":
-            return f"su - {user} -c '{cmd}'"
-        else:
-            # Default to sudo
-            return f"sudo -u {user} {cmd}"
-
+        Connections that can bind parameters (``run_script``) receive the
+        values out of band, so the script text stays identical across calls
+        and needs no quoting. Otherwise the values are rendered as literal
+        assignments in front of the body.
+        """
+        run_script = getattr(self.connection, "run_script", None)
+        if inspect.iscoroutinefunction(run_script):
+            return await run_script(script, parameters)
+        return await self.connection.run(ps_assignments(parameters) + script, shell=True)
+    
     @abstractmethod
     async def run(self) -> ModuleResult:
         """
@@ -137,6 +152,13 @@ class Module(ABC):
 _modules: Dict[str, Type[Module]] = {}
 _modules_imported = False
 
+# Modules registered from a file other than builtin_<name>.py / win_*.py
+_MODULE_FILES = {
+    'dnf': 'builtin_yum',
+    'get_url': 'builtin_uri',
+    'systemd_service': 'builtin_systemd',
+}
+
 
 def register_module(cls: Type[Module]) -> Type[Module]:
     """Decorator to register a module class."""
@@ -145,9 +167,40 @@ def register_module(cls: Type[Module]) -> Type[Module]:
 
 
 def get_module(name: str) -> Optional[Type[Module]]:
-    """Get a module class by name."""
-    _ensure_modules_imported()
-    return _modules.get(name)
+    """
+    Get a module class by name.
+    
+    Only the file that defines the module is imported, so a play that uses
+    a handful of modules does not pay for importing all of them.
+    """
+    module_class = _modules.get(name)
+    if module_class is None and not _modules_imported:
+        _import_module_file(name)
+        module_class = _modules.get(name)
+    return module_class
+
+
+def _module_file(name: str) -> Optional[str]:
+    """Dotted name of the file that registers module `name` (None for FQCNs)."""
+    if not name.isidentifier():
+        return None
+    file_name = _MODULE_FILES.get(name)
+    if file_name is None:
+        file_name = name if name.startswith('win_') else f'builtin_{name}'
+    return f'sansible.modules.{file_name}'
+
+
+def _import_module_file(name: str) -> None:
+    """Import the file that registers module `name`, if there is one."""
+    target = _module_file(name)
+    if target is None:
+        return
+    try:
+        importlib.import_module(target)
+    except ModuleNotFoundError as e:
+        # Unknown module name; anything missing *inside* the file is a real error
+        if e.name != target:
+            raise
 
 
 def _ensure_modules_imported() -> None:
@@ -193,13 +246,10 @@ def create_module_runner(
     Args:
         verbose: Verbosity level
         json_output: If True, suppress console output
-        
+    
     Returns:
         Async callable that runs modules
     """
-    # Import modules to register them
-    _import_builtin_modules()
-    
     async def runner(
         task: Task,
         ctx: HostContext,
@@ -5,6 +5,8 @@ Copy files to remote hosts.
 """
 
 import hashlib
+import os
+import stat
 from pathlib import Path
 from typing import Optional
 
@@ -124,13 +126,16 @@ class CopyModule(Module):
         """Copy a file from control node to target."""
         src_path = Path(src)
         
-        if not src_path.exists():
+        # One stat answers exists, is-a-directory and size
+        try:
+            src_stat = os.stat(src_path)
+        except (OSError, ValueError):
             return ModuleResult(
                 failed=True,
                 msg=f"Source file not found: {src}",
             )
         
-        if src_path.is_dir():
+        if stat.S_ISDIR(src_stat.st_mode):
             # TODO: Implement directory copy
             return ModuleResult(
                 failed=True,
@@ -142,8 +147,7 @@ class CopyModule(Module):
             remote_stat = await self.connection.stat(dest)
             if remote_stat and remote_stat.get("exists"):
                 # Check if sizes match (simple idempotency)
-                local_size = src_path.stat().st_size
-                if remote_stat.get("size") == local_size:
+                if remote_stat.get("size") == src_stat.st_size:
                     return ModuleResult(
                         changed=False,
                         msg="File already exists with same size",
@@ -159,7 +163,7 @@ class CopyModule(Module):
             results={
                 "dest": dest,
                 "src": src,
-                "size": src_path.stat().st_size,
+                "size": src_stat.st_size,
             },
         )
     
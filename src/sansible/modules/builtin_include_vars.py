@@ -8,6 +8,9 @@ import json
 import os
 from typing import Any, Dict
 
+import yaml
+
+from sansible.engine.playbook import YAML_LOADER
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
@@ -99,15 +102,13 @@ class IncludeVarsModule(Module):
         
         try:
             if ext in (".yml", ".yaml"):
-                import yaml
-                return yaml.safe_load(content) or {}
+                return yaml.load(content, Loader=YAML_LOADER) or {}
             elif ext == ".json":
                 return json.loads(content)
             else:
                 # Try YAML first, then JSON
-                import yaml
                 try:
-                    return yaml.safe_load(content) or {}
+                    return yaml.load(content, Loader=YAML_LOADER) or {}
                 except Exception:
                     return json.loads(content)
         except Exception:
@@ -4,6 +4,7 @@ Sansible win_hostname module
 Manage Windows hostname.
 """
 
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
@@ -45,7 +46,7 @@ class WinHostnameModule(Module):
             )
         
         # Set hostname using Rename-Computer
-        rename_cmd = f"Rename-Computer -NewName '{name}' -Force"
+        rename_cmd = f"Rename-Computer -NewName {ps_quote(name)} -Force"
         
         result = await self.connection.run(rename_cmd, shell=True)
         if result.rc != 0:
@@ -4,16 +4,58 @@ Sansible win_lineinfile module
 Manage lines in text files on Windows.
 """
 
+import base64
+import codecs
+import functools
+import itertools
 import re
+from typing import Tuple
+
+from sansible.connections.powershell import ps_bytes, ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# Printed by the read script when the desired line is already in place
+UNCHANGED_MARKER = "#UNCHANGED"
+
+# Byte order marks recognised on read, with the codec the file is kept in.
+# Windows PowerShell 5 writes UTF-16LE with a BOM for Out-File and ``>``.
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# For state=present, look for the desired line on the target first so an
+# already-correct file is never shipped back to the controller.
+_PRESENT_PRECHECK = """
+$line = {line}
+$regexp = {regexp}
+try {{
+    $lines = [IO.File]::ReadAllLines($path)
+    if ($regexp) {{
+        $hit = $lines | Where-Object {{ $_ -cmatch $regexp }} | Select-Object -First 1
+    }} else {{
+        $hit = if ($lines -ccontains $line) {{ $line }}
+    }}
+    if ($null -ne $hit -and $hit -ceq $line) {{ '{marker}'; exit 0 }}
+}} catch {{ }}
+"""
+
+
+@functools.lru_cache(maxsize=64)
+def _get_pattern(regexp: str) -> "re.Pattern[str]":
+    """Compile a user regexp once; the same object is returned on every call."""
+    return re.compile(regexp)
+
+
 @register_module
 class WinLineinfileModule(Module):
     """
     Ensure a particular line is in a file on Windows.
     
-    Uses PowerShell for file operations.
+    The file is read and written as base64-encoded bytes; line editing
+    happens on the controller.
     """
     
     name = "win_lineinfile"
@@ -47,17 +89,29 @@ class WinLineinfileModule(Module):
                 msg="'line' is required when state=present",
             )
         
-        # Read file with PowerShell
+        ps_path = ps_quote(path)
+        
+        precheck = ""
+        if state == "present":
+            precheck = _PRESENT_PRECHECK.format(
+                line=ps_quote(line),
+                regexp=ps_quote(regexp or ""),
+                marker=UNCHANGED_MARKER,
+            )
+        
+        # Read raw bytes as base64 so the content never passes through
+        # PowerShell's text pipeline
         read_ps = f'''
-$path = "{path}"
-if (Test-Path -LiteralPath $path) {{
-    Get-Content -LiteralPath $path -Raw
-}} else {{
+$path = {ps_path}
+if (-not (Test-Path -LiteralPath $path -PathType Leaf)) {{
     Write-Error "FILE_NOT_FOUND"
     exit 1
 }}
+{precheck}
+[Convert]::ToBase64String([IO.File]::ReadAllBytes($path))
 '''
         
+        encoding, bom = "utf-8", b""
         try:
             result = await self.connection.run(read_ps, shell=True)
             if result.rc != 0:
@@ -68,22 +122,36 @@ if (Test-Path -LiteralPath $path) {{
                         failed=True,
                         msg=f"File not found: {path}",
                     )
+            elif result.stdout.strip() == UNCHANGED_MARKER:
+                return ModuleResult(
+                    changed=False,
+                    msg=f"No change to {path}" if self.context.check_mode else "No change needed",
+                )
             else:
-                content = result.stdout
+                raw = base64.b64decode(result.stdout.strip())
+                try:
+                    content, encoding, bom = self._decode(raw)
+                except UnicodeDecodeError:
+                    return ModuleResult(
+                        failed=True,
+                        msg=f"Unsupported encoding: {path} is not UTF-8, UTF-16 or cp1252",
+                    )
         except Exception as e:
             return ModuleResult(
                 failed=True,
                 msg=f"Failed to read file: {e}",
             )
         
-        lines = content.splitlines()
-        original_count = len(lines)
-        changed = False
-        
-        if state == "present":
-            changed = self._ensure_present(lines, line, regexp)
+        # Only tokenize the file when it may actually need editing
+        if self._is_unchanged(content, state, line, regexp):
+            lines = None
+            changed = False
         else:
-            changed = self._ensure_absent(lines, line, regexp)
+            lines = content.splitlines()
+            if state == "present":
+                changed = self._ensure_present(lines, line, regexp)
+            else:
+                changed = self._ensure_absent(lines, line, regexp)
         
         if self.context.check_mode:
             return ModuleResult(
@@ -95,11 +163,17 @@ if (Test-Path -LiteralPath $path) {{
             newline = "\r\n" if self.args.get("newline", "windows") == "windows" else "\n"
             new_content = newline.join(lines)
             
-            # Escape for PowerShell
-            escaped = new_content.replace('"', '`"').replace('$', '`$')
+            try:
+                data = bom + new_content.encode(encoding)
+            except UnicodeEncodeError:
+                return ModuleResult(
+                    failed=True,
+                    msg=f"Unsupported encoding: the new content cannot be written as {encoding}",
+                )
+            
             write_ps = f'''
-$content = "{escaped}"
-Set-Content -LiteralPath "{path}" -Value $content -NoNewline
+$path = {ps_path}
+[IO.File]::WriteAllBytes($path, {ps_bytes(data)})
 '''
             
             try:
@@ -120,10 +194,43 @@ Set-Content -LiteralPath "{path}" -Value $content -NoNewline
             msg=f"{'Line managed' if changed else 'No change needed'}",
         )
     
+    @staticmethod
+    def _decode(raw: bytes) -> Tuple[str, str, bytes]:
+        """
+        Decode file bytes, returning (text, codec, bom) for writing it back.
+        
+        Raises UnicodeDecodeError rather than replacing bytes that do not
+        decode, so a file is never rewritten with its text lost.
+        """
+        for bom, encoding in _BOMS:
+            if raw.startswith(bom):
+                return raw[len(bom):].decode(encoding), encoding, bom
+        try:
+            return raw.decode("utf-8"), "utf-8", b""
+        except UnicodeDecodeError:
+            # Without a BOM, Get-Content read non-UTF-8 text as the ANSI
+            # code page (cp1252 on Western systems)
+            return raw.decode("cp1252"), "cp1252", b""
+    
+    @staticmethod
+    def _is_unchanged(content: str, state: str, line: str = None, regexp: str = None) -> bool:
+        """
+        Cheap no-change test on the raw content for literal lines.
+        
+        Returns True only when the file certainly needs no edit; False means
+        the caller has to split the content and check properly.
+        """
+        if regexp or not line or "\n" in line or "\r" in line:
+            return False
+        if state == "present":
+            pattern = re.compile(r"^" + re.escape(line) + r"\r?$", re.MULTILINE)
+            return pattern.search(content) is not None
+        return line not in content
+    
     def _ensure_present(self, lines: list, line: str, regexp: str = None) -> bool:
         """Ensure line is present."""
         if regexp:
-            pattern = re.compile(regexp)
+            pattern = _get_pattern(regexp)
             for i, existing in enumerate(lines):
                 if pattern.search(existing):
                     if existing != line:
@@ -140,11 +247,13 @@ Set-Content -LiteralPath "{path}" -Value $content -NoNewline
     
     def _ensure_absent(self, lines: list, line: str = None, regexp: str = None) -> bool:
         """Remove matching lines."""
+        # filterfalse drives the per-line test from C, with no Python frame
+        # per line; matching stays per line so anchors behave as before
         if regexp:
-            pattern = re.compile(regexp)
-            new_lines = [l for l in lines if not pattern.search(l)]
+            pattern = _get_pattern(regexp)
+            new_lines = list(itertools.filterfalse(pattern.search, lines))
         elif line:
-            new_lines = [l for l in lines if l != line]
+            new_lines = list(filter(line.__ne__, lines))
         else:
             return False
         
@@ -4,15 +4,27 @@ Sansible win_ping module
 Ping Windows hosts to verify connectivity.
 """
 
+import inspect
+import time
+
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# A successful command this recent counts as a successful ping
+RECENT_SUCCESS_SECONDS = 5.0
+
+
 @register_module
 class WinPingModule(Module):
     """
     Windows ping module to verify WinRM connectivity.
     
     Returns 'pong' on success, similar to the linux ping module.
+    
+    A connection that completed a command in the last few seconds is taken
+    as proof of connectivity; otherwise a WS-Management Identify is tried
+    before falling back to running PowerShell.
     """
     
     name = "win_ping"
@@ -31,9 +43,17 @@ class WinPingModule(Module):
                 msg="No connection available",
             )
         
+        last_success = getattr(self.connection, "last_success", None)
+        if isinstance(last_success, float) and time.monotonic() - last_success < RECENT_SUCCESS_SECONDS:
+            return ModuleResult(changed=False, msg=data, results={"ping": data})
+        
+        identify = getattr(self.connection, "wsman_identify", None)
+        if inspect.iscoroutinefunction(identify) and await identify():
+            return ModuleResult(changed=False, msg=data, results={"ping": data})
+        
         # Execute a simple PowerShell command to verify connectivity
         result = await self.connection.run(
-            f"Write-Output '{data}'",
+            f"Write-Output {ps_quote(data)}",
             shell=True,
         )
         
@@ -4,9 +4,60 @@ Sansible win_service module
 Manage Windows services via PowerShell.
 """
 
+import json
+from typing import Optional
+
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# Map Ansible start_mode to PowerShell StartupType
+START_MODE_MAP = {
+    "auto": "Automatic",
+    "automatic": "Automatic",
+    "delayed": "AutomaticDelayedStart",
+    "disabled": "Disabled",
+    "manual": "Manual",
+}
+
+# Map PowerShell ServiceControllerStatus (lowercased) to Ansible states
+STATE_MAP = {
+    "running": "running",
+    "stopped": "stopped",
+    "paused": "paused",
+    "startpending": "starting",
+    "stoppending": "stopping",
+}
+
+# Single round-trip script: read state, converge, report.
+_SERVICE_SCRIPT = """
+$ErrorActionPreference = 'Stop'
+$name = {name}
+$desired = {state}
+$mode = {mode}
+$force = {force}
+$s = Get-Service -Name $name -ErrorAction SilentlyContinue
+if (-not $s) {{ '{{"exists":false}}'; return }}
+$cur = $s.Status.ToString()
+$changed = $false
+switch ($desired) {{
+    'started' {{ if ($cur -ne 'Running') {{ Start-Service -Name $name -Force:$force; $changed = $true }} }}
+    'stopped' {{ if ($cur -ne 'Stopped') {{ Stop-Service -Name $name -Force:$force; $changed = $true }} }}
+    'restarted' {{ Restart-Service -Name $name -Force:$force; $changed = $true }}
+    'paused' {{ if ($cur -ne 'Paused') {{ Suspend-Service -Name $name; $changed = $true }} }}
+    'absent' {{ Remove-Service -Name $name; $changed = $true }}
+}}
+if ($mode -ne '' -and $desired -ne 'absent') {{
+    if ($mode -eq 'AutomaticDelayedStart' -or $s.StartType.ToString() -ne $mode) {{
+        Set-Service -Name $name -StartupType $mode
+        $changed = $true
+    }}
+}}
+$state = if ($desired -eq 'absent') {{ 'absent' }} else {{ (Get-Service -Name $name).Status.ToString() }}
+@{{exists = $true; state = $state; changed = $changed}} | ConvertTo-Json -Compress
+"""
+
+
 @register_module
 class WinServiceModule(Module):
     """
@@ -17,7 +68,8 @@ class WinServiceModule(Module):
     - Setting startup type (start_mode)
     - Checking service state
     
-    Uses PowerShell Get-Service, Start-Service, Stop-Service, Set-Service.
+    Uses PowerShell Get-Service, Start-Service, Stop-Service, Set-Service,
+    fused into a single script per task.
     """
     
     name = "win_service"
@@ -54,10 +106,24 @@ class WinServiceModule(Module):
                 results={"name": name, "state": state, "start_mode": start_mode},
             )
         
-        # Get current service state
-        current_state = await self._get_service_state(name)
+        script = self._build_script(name, state, start_mode, force)
+        result = await self.connection.run(script, shell=True)
+        
+        output = result.stdout.strip()
+        try:
+            data = json.loads(output) if output else None
+        except json.JSONDecodeError:
+            data = None
+        
+        if result.rc != 0 or data is None:
+            return ModuleResult(
+                failed=True,
+                msg=f"Failed to manage service '{name}': {result.stderr}",
+                rc=result.rc,
+                results={"name": name},
+            )
         
-        if current_state is None:
+        if not data.get("exists"):
             # Service doesn't exist
             if state == "absent":
                 return ModuleResult(
@@ -71,20 +137,10 @@ class WinServiceModule(Module):
                 results={"name": name, "exists": False},
             )
         
-        changed = False
-        
-        # Handle state changes
-        if state:
-            state_changed = await self._ensure_state(name, state, current_state, force)
-            changed = changed or state_changed
-        
-        # Handle start_mode changes
-        if start_mode:
-            mode_changed = await self._ensure_start_mode(name, start_mode)
-            changed = changed or mode_changed
+        current_state = self._map_state(data.get("state", ""))
         
         return ModuleResult(
-            changed=changed,
+            changed=bool(data.get("changed")),
             msg=f"Service '{name}' configured successfully",
             results={
                 "name": name,
@@ -94,63 +150,29 @@ class WinServiceModule(Module):
             },
         )
     
-    async def _get_service_state(self, name: str) -> str | None:
-        """Get current service state via PowerShell."""
-        cmd = f"Get-Service -Name '{name}' -ErrorAction SilentlyContinue | Select-Object -ExpandProperty Status"
-        result = await self.connection.run(cmd, shell=True)
-        
-        if result.rc != 0 or not result.stdout.strip():
-            return None
-        
-        state = result.stdout.strip().lower()
-        # Map PowerShell states to Ansible states
-        state_map = {
-            "running": "running",
-            "stopped": "stopped",
-            "paused": "paused",
-            "startpending": "starting",
-            "stoppending": "stopping",
-        }
-        return state_map.get(state, state)
+    @staticmethod
+    def _map_state(ps_state: str) -> str:
+        """Map a PowerShell ServiceControllerStatus to an Ansible state."""
+        state = ps_state.strip().lower()
+        return STATE_MAP.get(state, state)
     
-    async def _ensure_state(self, name: str, desired: str, current: str, force: bool) -> bool:
-        """Ensure service is in the desired state."""
-        force_flag = "-Force" if force else ""
-        
-        if desired == "started":
-            if current == "running":
-                return False  # Already running
-            cmd = f"Start-Service -Name '{name}' {force_flag}"
-        elif desired == "stopped":
-            if current == "stopped":
-                return False  # Already stopped
-            cmd = f"Stop-Service -Name '{name}' {force_flag}"
-        elif desired == "restarted":
-            cmd = f"Restart-Service -Name '{name}' {force_flag}"
-        elif desired == "paused":
-            if current == "paused":
-                return False
-            cmd = f"Suspend-Service -Name '{name}'"
-        elif desired == "absent":
-            cmd = f"Remove-Service -Name '{name}' {force_flag}"
-        else:
-            return False
+    @staticmethod
+    def _build_script(
+        name: str, state: Optional[str], start_mode: Optional[str], force: bool
+    ) -> str:
+        """
+        Build a single PowerShell script that reads the service, applies the
+        requested state and start mode, and reports the outcome as JSON.
         
-        result = await self.connection.run(cmd, shell=True)
-        return result.rc == 0
-    
-    async def _ensure_start_mode(self, name: str, start_mode: str) -> bool:
-        """Set service startup type."""
-        # Map Ansible start_mode to PowerShell StartupType
-        mode_map = {
-            "auto": "Automatic",
-            "automatic": "Automatic",
-            "delayed": "AutomaticDelayedStart",
-            "disabled": "Disabled",
-            "manual": "Manual",
-        }
-        ps_mode = mode_map.get(start_mode.lower(), start_mode)
+        Doing everything in one script keeps the task to one WinRM round-trip.
+        """
+        ps_mode = ""
+        if start_mode:
+            ps_mode = START_MODE_MAP.get(start_mode.lower(), start_mode)
         
-        cmd = f"Set-Service -Name '{name}' -StartupType '{ps_mode}'"
-        result = await self.connection.run(cmd, shell=True)
-        return result.rc == 0
+        return _SERVICE_SCRIPT.format(
+            name=ps_quote(name),
+            state=ps_quote(state or ""),
+            mode=ps_quote(ps_mode),
+            force="$true" if force else "$false",
+        )
@@ -4,10 +4,14 @@ Sansible win_slurp module
 Read file contents from Windows hosts.
 """
 
-import base64
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# Bytes read per block on the target (48 KiB, a multiple of 3)
+READ_BLOCK_SIZE = 48 * 1024
+
+
 @register_module
 class WinSlurpModule(Module):
     """
@@ -28,26 +32,48 @@ class WinSlurpModule(Module):
                 msg="No connection available",
             )
         
-        # Check if file exists
-        check_cmd = f"Test-Path -Path '{src}' -PathType Leaf"
-        result = await self.connection.run(check_cmd, shell=True)
-        if 'True' not in result.stdout:
-            return ModuleResult(
-                failed=True,
-                msg=f"File not found: {src}",
-            )
-        
-        # Read file content and encode as base64
-        read_cmd = f"[Convert]::ToBase64String([System.IO.File]::ReadAllBytes('{src}'))"
+        # Stream the file in fixed-size blocks so the target never holds the
+        # whole file (and its base64 copy) in memory at once. The block size is
+        # a multiple of 3, so the encoded blocks concatenate without padding.
+        # Stream.Read may return short (e.g. on SMB shares), so each block is
+        # filled completely before it is encoded; only the last can be short.
+        read_cmd = f"""
+$path = {ps_quote(src)}
+if (-not (Test-Path -LiteralPath $path -PathType Leaf)) {{
+    Write-Error "FILE_NOT_FOUND"
+    exit 1
+}}
+$stream = [System.IO.File]::OpenRead($path)
+try {{
+    $buffer = New-Object byte[] {READ_BLOCK_SIZE}
+    do {{
+        $filled = 0
+        while ($filled -lt $buffer.Length -and
+               ($read = $stream.Read($buffer, $filled, $buffer.Length - $filled)) -gt 0) {{
+            $filled += $read
+        }}
+        if ($filled -gt 0) {{
+            [Convert]::ToBase64String($buffer, 0, $filled)
+        }}
+    }} while ($filled -eq $buffer.Length)
+}} finally {{
+    $stream.Dispose()
+}}
+"""
         result = await self.connection.run(read_cmd, shell=True)
         
         if result.rc != 0:
+            if "FILE_NOT_FOUND" in result.stderr:
+                return ModuleResult(
+                    failed=True,
+                    msg=f"File not found: {src}",
+                )
             return ModuleResult(
                 failed=True,
                 msg=f"Failed to read file: {result.stderr}",
             )
         
-        content_b64 = result.stdout.strip()
+        content_b64 = "".join(result.stdout.split())
         
         return ModuleResult(
             changed=False,
@@ -4,7 +4,7 @@ Sansible win_stat module
 Retrieve file or directory status on Windows.
 """
 
-import json
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
@@ -33,24 +33,17 @@ class WinStatModule(Module):
                 msg="No connection available",
             )
         
-        # PowerShell to get file info
+        # PowerShell to get file info as one pipe-delimited line;
+        # avoids the reflection-heavy ConvertTo-Json path
         ps_script = f'''
-$path = "{path}"
-$result = @{{}}
-
+$path = {ps_quote(path)}
 if (Test-Path -LiteralPath $path) {{
     $item = Get-Item -LiteralPath $path -Force
-    $result.Exists = $true
-    $result.IsDirectory = $item.PSIsContainer
-    $result.Length = if ($item.PSIsContainer) {{ 0 }} else {{ $item.Length }}
-    $result.Mode = $item.Mode
-    $result.LastWriteTime = $item.LastWriteTime.ToString("o")
-    $result.CreationTime = $item.CreationTime.ToString("o")
+    $length = if ($item.PSIsContainer) {{ 0 }} else {{ $item.Length }}
+    "{{0}}|{{1}}|{{2}}|{{3}}|{{4}}" -f $item.PSIsContainer, $length, $item.Mode, $item.LastWriteTime.ToString("o"), $item.CreationTime.ToString("o")
 }} else {{
-    $result.Exists = $false
+    "NOEXIST"
 }}
-
-$result | ConvertTo-Json -Compress
 '''
         
         try:
@@ -63,20 +56,26 @@ $result | ConvertTo-Json -Compress
                     rc=result.rc,
                 )
             
-            # Parse JSON output
-            stat_data = json.loads(result.stdout.strip())
-            
+            output = result.stdout.strip()
             stat_result = {
-                "exists": stat_data.get("Exists", False),
+                "exists": output != "NOEXIST",
                 "path": path,
             }
             
-            if stat_data.get("Exists"):
+            if stat_result["exists"]:
+                fields = output.split("|")
+                if len(fields) != 5:
+                    return ModuleResult(
+                        failed=True,
+                        msg=f"Failed to parse stat output: {output!r}",
+                    )
+                is_dir, length, mode, _mtime, _ctime = fields
+                is_dir = is_dir == "True"
                 stat_result.update({
-                    "isdir": stat_data.get("IsDirectory", False),
-                    "isreg": not stat_data.get("IsDirectory", True),
-                    "size": stat_data.get("Length", 0),
-                    "mode": stat_data.get("Mode", ""),
+                    "isdir": is_dir,
+                    "isreg": not is_dir,
+                    "size": int(length or 0),
+                    "mode": mode,
                 })
             
             return ModuleResult(
@@ -84,11 +83,6 @@ $result | ConvertTo-Json -Compress
                 msg="File stat retrieved",
                 results={"stat": stat_result},
             )
-        except json.JSONDecodeError as e:
-            return ModuleResult(
-                failed=True,
-                msg=f"Failed to parse stat output: {e}",
-            )
         except Exception as e:
             return ModuleResult(
                 failed=True,
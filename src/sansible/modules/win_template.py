@@ -5,9 +5,64 @@ Template files for Windows targets.
 """
 
 import os
+from typing import Any, Dict, Optional, Tuple
+
+from sansible.connections.powershell import ps_bytes, ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+_WRITE_SCRIPT = """
+$dest = {dest}
+$exists = Test-Path -LiteralPath $dest -PathType Leaf
+if ($exists -and -not {force}) {{ 'SKIPPED'; exit 0 }}
+if ($exists -and {backup}) {{
+    $timestamp = Get-Date -Format 'yyyyMMdd_HHmmss'
+    Copy-Item -LiteralPath $dest -Destination ($dest + '.' + $timestamp + '.bak')
+}}
+[IO.File]::WriteAllBytes($dest, {content})
+"""
+
+
+# Shared Jinja2 environment and compiled templates, keyed by path and
+# invalidated when the file's mtime or size changes
+_jinja_env: Optional[Any] = None
+_template_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _get_environment() -> Any:
+    """Build the Jinja2 environment on first use."""
+    global _jinja_env
+    if _jinja_env is None:
+        from jinja2 import Environment, StrictUndefined
+        
+        env = Environment(
+            undefined=StrictUndefined,
+            keep_trailing_newline=True,
+        )
+        
+        # Add common filters from sansible templating
+        from sansible.engine.templating import CUSTOM_FILTERS
+        for name, func in CUSTOM_FILTERS.items():
+            env.filters[name] = func
+        
+        _jinja_env = env
+    return _jinja_env
+
+
+def _load_template(path: str) -> Any:
+    """Return the compiled template for path, compiling it only when it changed."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _template_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    with open(path, 'r') as f:
+        template = _get_environment().from_string(f.read())
+    _template_cache[path] = (stamp, template)
+    return template
+
+
 @register_module
 class WinTemplateModule(Module):
     """
@@ -58,25 +113,9 @@ class WinTemplateModule(Module):
                 msg=f"Template not found: {src}",
             )
         
-        # Read template
-        with open(src, 'r') as f:
-            template_content = f.read()
-        
         # Render template using Jinja2
         try:
-            from jinja2 import Environment, StrictUndefined
-            
-            env = Environment(
-                undefined=StrictUndefined,
-                keep_trailing_newline=True,
-            )
-            
-            # Add common filters from sansible templating
-            from sansible.engine.templating import CUSTOM_FILTERS
-            for name, func in CUSTOM_FILTERS.items():
-                env.filters[name] = func
-            
-            template = env.from_string(template_content)
+            template = _load_template(src)
             
             # Build template variables from context vars
             template_vars = self.context.vars.copy() if hasattr(self.context, 'vars') else {}
@@ -102,30 +141,13 @@ class WinTemplateModule(Module):
                 msg=f"Would template {src} to {dest}",
             )
         
-        # Check if dest exists and compare
-        if not force:
-            check_cmd = f"Test-Path -Path '{dest}'"
-            result = await self.connection.run(check_cmd, shell=True)
-            if 'True' in result.stdout:
-                return ModuleResult(
-                    changed=False,
-                    msg=f"Destination exists and force=false",
-                )
-        
-        # Backup if requested
-        if backup:
-            backup_cmd = f"""
-if (Test-Path -Path '{dest}') {{
-    $timestamp = Get-Date -Format 'yyyyMMdd_HHmmss'
-    Copy-Item -Path '{dest}' -Destination ('{dest}.' + $timestamp + '.bak')
-}}
-"""
-            await self.connection.run(backup_cmd, shell=True)
-        
-        # Write content using PowerShell
-        # Escape for PowerShell
-        escaped = rendered.replace("'", "''")
-        write_cmd = f"Set-Content -Path '{dest}' -Value @'\n{escaped}\n'@ -NoNewline"
+        # Guard, backup and upload in a single round-trip
+        write_cmd = _WRITE_SCRIPT.format(
+            dest=ps_quote(dest),
+            force="$true" if force else "$false",
+            backup="$true" if backup else "$false",
+            content=ps_bytes(rendered.encode('utf-8')),
+        )
         
         result = await self.connection.run(write_cmd, shell=True)
         if result.rc != 0:
@@ -134,6 +156,12 @@ if (Test-Path -Path '{dest}') {{
                 msg=f"Failed to write template: {result.stderr}",
             )
         
+        if "SKIPPED" in result.stdout:
+            return ModuleResult(
+                changed=False,
+                msg=f"Destination exists and force=false",
+            )
+        
         return ModuleResult(
             changed=True,
             msg=f"Templated {src} to {dest}",
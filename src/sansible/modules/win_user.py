@@ -4,13 +4,127 @@ Sansible win_user module
 Manage Windows user accounts.
 """
 
+import json
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# Whole user lifecycle in one round-trip: look up, converge, report as JSON.
+# The body is constant; every value arrives as a parameter.
+_USER_SCRIPT = """
+$ErrorActionPreference = 'Stop'
+# One group's membership update; prints the action taken or 'error:<msg>'
+$groupOp = @'
+param($group, $name, $groupsAction)
+$ErrorActionPreference = 'Stop'
+try {
+    $members = @(Get-LocalGroupMember -Group $group | ForEach-Object { ($_.Name -split '\\\\')[-1] })
+    if ($groupsAction -eq 'remove') {
+        if ($members -contains $name) {
+            Remove-LocalGroupMember -Group $group -Member $name
+            "group-:$group"
+        }
+    } elseif ($members -notcontains $name) {
+        Add-LocalGroupMember -Group $group -Member $name
+        "group+:$group"
+    }
+} catch {
+    "error:$_"
+}
+'@
+$changed = $false
+$actions = @()
+$user = Get-LocalUser -Name $name -ErrorAction SilentlyContinue
+$exists = [bool]$user
+try {
+    if ($checkMode) {
+        # Existence is all check mode needs
+    } elseif ($state -eq 'absent') {
+        if ($exists) {
+            Remove-LocalUser -Name $name
+            $changed = $true; $actions += 'removed'
+        }
+    } else {
+        if (-not $exists) {
+            if (-not $password) { $password = 'P@ssw0rd' }
+            $params = @{ Name = $name; Password = (ConvertTo-SecureString $password -AsPlainText -Force) }
+            if ($description) { $params.Description = $description }
+            if ($fullname) { $params.FullName = $fullname }
+            New-LocalUser @params | Out-Null
+            $changed = $true; $actions += 'created'
+        } else {
+            if ($setPassword) {
+                Set-LocalUser -Name $name -Password (ConvertTo-SecureString $password -AsPlainText -Force)
+                $changed = $true; $actions += 'password'
+            }
+            if ($null -ne $description -and $user.Description -ne $description) {
+                Set-LocalUser -Name $name -Description $description
+                $changed = $true; $actions += 'description'
+            }
+        }
+        # PowerShell 7 updates several groups concurrently; 5.1 goes one by one
+        if ($groups.Count -gt 1 -and $PSVersionTable.PSVersion.Major -ge 7) {
+            $parallel = [scriptblock]::Create('& ([scriptblock]::Create($using:groupOp)) $_ $using:name $using:groupsAction')
+            $groupResults = $groups | ForEach-Object -Parallel $parallel -ThrottleLimit 8
+        } else {
+            $groupBlock = [scriptblock]::Create($groupOp)
+            $groupResults = foreach ($group in $groups) { & $groupBlock $group $name $groupsAction }
+        }
+        foreach ($result in $groupResults) {
+            if ($result -like 'error:*') { throw $result.Substring(6) }
+            $changed = $true; $actions += $result
+        }
+        $enabled = (Get-LocalUser -Name $name).Enabled
+        if ($disabled -and $enabled) {
+            Disable-LocalUser -Name $name
+            $changed = $true; $actions += 'disabled'
+        } elseif (-not $disabled -and -not $enabled) {
+            Enable-LocalUser -Name $name
+            $changed = $true; $actions += 'enabled'
+        }
+    }
+} catch {
+    @{ exists = $exists; changed = $changed; actions = $actions; failed = $true; msg = $_.ToString() } | ConvertTo-Json -Compress
+    return
+}
+@{ exists = $exists; changed = $changed; actions = $actions } | ConvertTo-Json -Compress
+"""
+
+
+# Seconds a known user existence result stays valid
+USER_CACHE_TTL = 60.0
+
+# connection -> {user name: (expires_at, exists)}; entries die with the connection
+_user_cache: "weakref.WeakKeyDictionary[Any, Dict[str, Tuple[float, bool]]]" = weakref.WeakKeyDictionary()
+
+
+def _cached_exists(connection: Any, name: str) -> Optional[bool]:
+    """Return the cached existence of a user, or None if unknown or expired."""
+    entry = _user_cache.get(connection, {}).get(name)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _remember_exists(connection: Any, name: str, exists: bool) -> None:
+    """Record whether a user exists on the connection's host."""
+    try:
+        users = _user_cache.setdefault(connection, {})
+    except TypeError:
+        return  # connection cannot be weakly referenced
+    users[name] = (time.monotonic() + USER_CACHE_TTL, exists)
+
+
 @register_module
 class WinUserModule(Module):
     """
     Manage local Windows user accounts.
+    
+    Lookup, create/update/remove, group membership and enable/disable all run
+    in a single PowerShell script.
     """
     
     name = "win_user"
@@ -41,8 +155,6 @@ class WinUserModule(Module):
         description = self.get_arg("description")
         fullname = self.get_arg("fullname")
         account_disabled = self.get_arg("account_disabled", False)
-        password_expired = self.get_arg("password_expired", False)
-        password_never_expires = self.get_arg("password_never_expires", False)
         update_password = self.get_arg("update_password", "always")
         
         if not self.connection:
@@ -51,87 +163,71 @@ class WinUserModule(Module):
                 msg="No connection available",
             )
         
-        # Check if user exists
-        check_cmd = f"""
-$user = Get-LocalUser -Name '{name}' -ErrorAction SilentlyContinue
-if ($user) {{ 'exists' }} else {{ 'absent' }}
-"""
-        result = await self.connection.run(check_cmd, shell=True)
-        user_exists = 'exists' in result.stdout.strip()
+        if isinstance(groups, str):
+            groups = [groups]
+        
+        # Check mode only needs existence; reuse a recent answer if we have one
+        if self.context.check_mode:
+            user_exists = _cached_exists(self.connection, name)
+            if user_exists is not None:
+                return self._check_mode_result(name, state, user_exists)
+        
+        result = await self.run_ps(_USER_SCRIPT, {
+            "name": name,
+            "state": state,
+            "password": password,
+            "description": description,
+            "fullname": fullname,
+            "groups": list(groups or []),
+            "groupsAction": groups_action,
+            "setPassword": bool(password and update_password == "always"),
+            "disabled": bool(account_disabled),
+            "checkMode": bool(self.context.check_mode),
+        })
+        output = result.stdout.strip()
+        # The JSON report is the script's last line; anything printed before
+        # it (warnings, host output) is not parsed
+        report = output.rpartition("\n")[2]
+        try:
+            data = json.loads(report) if report else None
+        except json.JSONDecodeError:
+            data = None
         
-        changed = False
+        if data is None:
+            return ModuleResult(
+                failed=True,
+                msg=f"Failed to manage user {name}: {result.stderr or output}",
+                rc=result.rc,
+            )
+        
+        user_exists = bool(data.get("exists"))
         
         if self.context.check_mode:
-            if state == "absent" and user_exists:
-                return ModuleResult(changed=True, msg=f"Would remove user {name}")
-            elif state == "present" and not user_exists:
-                return ModuleResult(changed=True, msg=f"Would create user {name}")
-            return ModuleResult(changed=False, msg=f"User {name} would be unchanged")
+            _remember_exists(self.connection, name, user_exists)
+            return self._check_mode_result(name, state, user_exists)
+        
+        if data.get("failed"):
+            _user_cache.get(self.connection, {}).pop(name, None)
+            return ModuleResult(
+                failed=True,
+                changed=bool(data.get("changed")),
+                msg=f"Failed to manage user {name}: {data.get('msg', '')}",
+            )
         
-        if state == "absent":
-            if user_exists:
-                delete_cmd = f"Remove-LocalUser -Name '{name}'"
-                result = await self.connection.run(delete_cmd, shell=True)
-                if result.rc != 0:
-                    return ModuleResult(
-                        failed=True,
-                        msg=f"Failed to remove user: {result.stderr}",
-                    )
-                changed = True
-        else:  # state == present
-            if not user_exists:
-                # Create user
-                create_cmd = f"$pass = ConvertTo-SecureString '{password or 'P@ssw0rd'}' -AsPlainText -Force; New-LocalUser -Name '{name}' -Password $pass"
-                if description:
-                    create_cmd += f" -Description '{description}'"
-                if fullname:
-                    create_cmd += f" -FullName '{fullname}'"
-                
-                result = await self.connection.run(create_cmd, shell=True)
-                if result.rc != 0:
-                    return ModuleResult(
-                        failed=True,
-                        msg=f"Failed to create user: {result.stderr}",
-                    )
-                changed = True
-            else:
-                # Update user
-                updates = []
-                if password and update_password == "always":
-                    updates.append(f"$pass = ConvertTo-SecureString '{password}' -AsPlainText -Force; Set-LocalUser -Name '{name}' -Password $pass")
-                if description is not None:
-                    updates.append(f"Set-LocalUser -Name '{name}' -Description '{description}'")
-                
-                for update_cmd in updates:
-                    result = await self.connection.run(update_cmd, shell=True)
-                    if result.rc == 0:
-                        changed = True
-            
-            # Handle groups
-            if groups:
-                if isinstance(groups, str):
-                    groups = [groups]
-                
-                for group in groups:
-                    if groups_action == "add" or groups_action == "replace":
-                        add_cmd = f"Add-LocalGroupMember -Group '{group}' -Member '{name}' -ErrorAction SilentlyContinue"
-                        result = await self.connection.run(add_cmd, shell=True)
-                        if result.rc == 0:
-                            changed = True
-                    elif groups_action == "remove":
-                        remove_cmd = f"Remove-LocalGroupMember -Group '{group}' -Member '{name}' -ErrorAction SilentlyContinue"
-                        result = await self.connection.run(remove_cmd, shell=True)
-                        if result.rc == 0:
-                            changed = True
-            
-            # Handle account settings
-            if account_disabled:
-                result = await self.connection.run(f"Disable-LocalUser -Name '{name}'", shell=True)
-            else:
-                result = await self.connection.run(f"Enable-LocalUser -Name '{name}'", shell=True)
+        changed = bool(data.get("changed"))
+        _remember_exists(self.connection, name, state != "absent")
         
         return ModuleResult(
             changed=changed,
             msg=f"User {name} {'created' if not user_exists and state == 'present' else 'removed' if state == 'absent' and user_exists else 'updated' if changed else 'unchanged'}",
-            results={"name": name, "state": state},
+            results={"name": name, "state": state, "actions": data.get("actions") or []},
         )
+    
+    @staticmethod
+    def _check_mode_result(name: str, state: str, user_exists: bool) -> ModuleResult:
+        """Report what a real run would do."""
+        if state == "absent" and user_exists:
+            return ModuleResult(changed=True, msg=f"Would remove user {name}")
+        elif state == "present" and not user_exists:
+            return ModuleResult(changed=True, msg=f"Would create user {name}")
+        return ModuleResult(changed=False, msg=f"User {name} would be unchanged")
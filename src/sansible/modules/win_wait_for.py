@@ -5,15 +5,27 @@ Wait for a condition before continuing (Windows).
 """
 
 import asyncio
+import random
+import time
+from sansible.connections.powershell import ps_quote
 from sansible.modules.base import Module, ModuleResult, register_module
 
 
+# First poll interval; doubles after each failed check up to `sleep`
+INITIAL_POLL_DELAY = 0.1
+
+# Hosts that mean "the target itself" when seen from the target
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "localhost", "::1"})
+
+
 @register_module
 class WinWaitForModule(Module):
     """
     Wait for a port or file on Windows.
     
-    Uses PowerShell for checks.
+    Uses PowerShell for checks. For ports that should be open, a direct
+    TCP connect from the controller is tried first and PowerShell is only
+    used when that fails (or when use_remote is set).
     """
     
     name = "win_wait_for"
@@ -26,6 +38,7 @@ class WinWaitForModule(Module):
         "delay": 0,
         "timeout": 300,
         "sleep": 1,
+        "use_remote": False,  # always probe ports from the target
     }
     
     async def run(self) -> ModuleResult:
@@ -37,6 +50,7 @@ class WinWaitForModule(Module):
         delay = float(self.args.get("delay", 0))
         timeout = float(self.args.get("timeout", 300))
         sleep = float(self.args.get("sleep", 1))
+        use_remote = self.get_arg("use_remote", False)
         
         if not self.connection:
             return ModuleResult(
@@ -53,11 +67,14 @@ class WinWaitForModule(Module):
         if delay > 0:
             await asyncio.sleep(delay)
         
-        elapsed = 0
+        # Poll quickly at first and back off to the user's sleep interval;
+        # the deadline is wall-clock, so slow checks count against it
+        start = time.monotonic()
+        poll_delay = min(INITIAL_POLL_DELAY, sleep)
         
-        while elapsed < timeout:
+        while time.monotonic() - start < timeout:
             if port is not None:
-                success = await self._check_port(host, port, state)
+                success = await self._check_port(host, port, state, use_remote, sleep)
             else:
                 success = await self._check_path(path, state)
             
@@ -73,8 +90,8 @@ class WinWaitForModule(Module):
                         msg=f"Path {path} meets condition",
                     )
             
-            await asyncio.sleep(sleep)
-            elapsed += sleep
+            await asyncio.sleep(poll_delay + random.uniform(0, poll_delay * 0.1))
+            poll_delay = min(poll_delay * 2, sleep)
         
         if port:
             return ModuleResult(
@@ -87,12 +104,21 @@ class WinWaitForModule(Module):
                 msg=f"Timed out waiting for path {path} to be {state}",
             )
     
-    async def _check_port(self, host: str, port: int, state: str) -> bool:
-        """Check if port is available using PowerShell."""
+    async def _check_port(
+        self, host: str, port: int, state: str, use_remote: bool = False, sleep: float = 1
+    ) -> bool:
+        """Check if port is available, directly when possible, else via PowerShell."""
+        # A successful connect from the controller proves the port is open; a
+        # failure proves nothing (firewalls, loopback-only listeners), so
+        # closed-port waits and failed probes still ask the target.
+        if state in ("started", "present") and not use_remote:
+            if await self._probe_port_direct(host, port, min(max(sleep, 0.5), 5.0)):
+                return True
+        
         ps_cmd = f'''
 $tcp = New-Object System.Net.Sockets.TcpClient
 try {{
-    $tcp.Connect("{host}", {port})
+    $tcp.Connect({ps_quote(host)}, {port})
     $tcp.Close()
     exit 0
 }} catch {{
@@ -112,6 +138,27 @@ try {{
                 return False
             return True
     
+    async def _probe_port_direct(self, host: str, port: int, timeout: float) -> bool:
+        """Try a TCP connect to the port from the controller."""
+        if host.lower() in LOOPBACK_HOSTS:
+            # Loopback on the target is the target's own address from here
+            host = self.host.ansible_host if self.host else host
+        
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, int(port)),
+                timeout=timeout,
+            )
+        except (OSError, asyncio.TimeoutError, ValueError):
+            return False
+        
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+    
     async def _check_path(self, path: str, state: str) -> bool:
         """Check if path exists using PowerShell."""
         ps_cmd = f'if (Test-Path -LiteralPath "{path}") {{ exit 0 }} else {{ exit 1 }}'
@@ -6,6 +6,7 @@ ensuring sansible works identically on Windows and Unix systems.
 """
 
 import platform as _platform
+import sys as _sys
 
 # Detect current platform
 IS_WINDOWS = _platform.system() == "Windows"
@@ -14,3 +15,7 @@ IS_MACOS = _platform.system() == "Darwin"
 IS_POSIX = not IS_WINDOWS
 
 PLATFORM_NAME = _platform.system().lower()
+
+# Keyword arguments for @dataclass that give instances __slots__ (no
+# per-instance __dict__) where the interpreter supports it (3.10+)
+DATACLASS_SLOTS = {"slots": True} if _sys.version_info >= (3, 10) else {}
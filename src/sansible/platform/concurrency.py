@@ -5,7 +5,11 @@ Provides portable concurrency primitives that work correctly on both Windows and
 avoiding fork-based assumptions that don't work on Windows.
 """
 
+import atexit
 import concurrent.futures
+import itertools
+import multiprocessing
+import os
 import threading
 import queue
 from typing import TypeVar, Callable, Iterable, Optional, Any
@@ -27,10 +31,79 @@ class TaskResult:
     task_id: Any
 
 
+# Batches up to this size skip as_completed and are collected in order
+SMALL_BATCH_SIZE = 8
+
+
+def _future_result(future: concurrent.futures.Future, idx: int) -> TaskResult:
+    """Wait for a future and wrap its outcome in a TaskResult."""
+    try:
+        return TaskResult(
+            success=True,
+            value=future.result(),
+            error=None,
+            task_id=idx,
+        )
+    except Exception as e:
+        return TaskResult(
+            success=False,
+            value=None,
+            error=e,
+            task_id=idx,
+        )
+
+
+def _run_windowed(
+    executor: concurrent.futures.Executor,
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_inflight: int,
+) -> list[TaskResult]:
+    """
+    Submit items as they are produced, keeping at most max_inflight running.
+    
+    Items are pulled from the iterable only when there is room, so a lazy
+    source is never materialized up front.
+    
+    If the executor stops accepting work (a worker died and broke the pool,
+    or it was shut down), that error is recorded for the item being
+    submitted and every item after it.
+    """
+    results: list[TaskResult] = []
+    pending: dict[concurrent.futures.Future, int] = {}
+    submit_error: Optional[Exception] = None
+    
+    for idx, item in enumerate(items):
+        if submit_error is not None:
+            results.append(TaskResult(success=False, value=None, error=submit_error, task_id=idx))
+            continue
+        if len(pending) >= max_inflight:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                done_idx = pending.pop(future)
+                results[done_idx] = _future_result(future, done_idx)
+        try:
+            pending[executor.submit(func, item)] = idx
+        except (concurrent.futures.BrokenExecutor, RuntimeError) as e:
+            submit_error = e
+            results.append(TaskResult(success=False, value=None, error=e, task_id=idx))
+            continue
+        results.append(None)  # type: ignore
+    
+    for future in concurrent.futures.as_completed(pending):
+        idx = pending[future]
+        results[idx] = _future_result(future, idx)
+    
+    return results
+
+
 def run_parallel_threads(
     func: Callable[[T], R],
     items: Iterable[T],
     max_workers: Optional[int] = None,
+    max_inflight: Optional[int] = None,
 ) -> list[TaskResult]:
     """
     Run a function in parallel using threads.
@@ -40,49 +113,38 @@ def run_parallel_threads(
     
     Args:
         func: Function to call for each item
-        items: Items to process
+        items: Items to process; consumed lazily
         max_workers: Maximum number of worker threads (default: min(32, cpu_count + 4))
+        max_inflight: Maximum number of submitted, unfinished items
+            (default: twice the number of workers)
     
     Returns:
         List of TaskResult objects in same order as input items
     """
-    items_list = list(items)
-    results: list[TaskResult] = []
+    items_iter = iter(items)
+    head = list(itertools.islice(items_iter, SMALL_BATCH_SIZE + 1))
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_idx = {
-            executor.submit(func, item): idx
-            for idx, item in enumerate(items_list)
-        }
-        
-        # Pre-allocate results list
-        results = [None] * len(items_list)  # type: ignore
+        if len(head) <= SMALL_BATCH_SIZE:
+            # Waiting in submission order is cheaper than as_completed's
+            # per-future waiter bookkeeping for a handful of items
+            futures = [executor.submit(func, item) for item in head]
+            return [_future_result(future, idx) for idx, future in enumerate(futures)]
         
-        for future in concurrent.futures.as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            try:
-                value = future.result()
-                results[idx] = TaskResult(
-                    success=True,
-                    value=value,
-                    error=None,
-                    task_id=idx,
-                )
-            except Exception as e:
-                results[idx] = TaskResult(
-                    success=False,
-                    value=None,
-                    error=e,
-                    task_id=idx,
-                )
-    
-    return results
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        return _run_windowed(
+            executor,
+            func,
+            itertools.chain(head, items_iter),
+            max_inflight or workers * 2,
+        )
 
 
 def run_parallel_processes(
     func: Callable[[T], R],
     items: Iterable[T],
     max_workers: Optional[int] = None,
+    max_inflight: Optional[int] = None,
 ) -> list[TaskResult]:
     """
     Run a function in parallel using processes.
@@ -92,60 +154,105 @@ def run_parallel_processes(
     
     Prefer run_parallel_threads unless you need to bypass the GIL.
     
+    Worker processes are kept in a shared pool and reused by later calls.
+    
     Args:
         func: Function to call for each item (must be picklable)
-        items: Items to process (must be picklable)
+        items: Items to process (must be picklable); consumed lazily
         max_workers: Maximum number of worker processes
+        max_inflight: Maximum number of submitted, unfinished items
+            (default: twice the number of workers)
     
     Returns:
         List of TaskResult objects in same order as input items
     """
-    items_list = list(items)
-    results: list[TaskResult] = []
+    executor = _get_process_pool(max_workers)
+    workers = max_workers or os.cpu_count() or 1
     
-    # Use spawn context on all platforms for consistency
-    # This is the only option on Windows anyway
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        future_to_idx = {
-            executor.submit(func, item): idx
-            for idx, item in enumerate(items_list)
-        }
-        
-        results = [None] * len(items_list)  # type: ignore
-        
-        for future in concurrent.futures.as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            try:
-                value = future.result()
-                results[idx] = TaskResult(
-                    success=True,
-                    value=value,
-                    error=None,
-                    task_id=idx,
-                )
-            except Exception as e:
-                results[idx] = TaskResult(
-                    success=False,
-                    value=None,
-                    error=e,
-                    task_id=idx,
-                )
+    broken = True
+    try:
+        results = _run_windowed(executor, func, items, max_inflight or workers * 2)
+        broken = any(isinstance(r.error, concurrent.futures.BrokenExecutor) for r in results)
+    finally:
+        # Also drop the pool if collecting results raised, so a broken pool
+        # never outlives the call that broke it
+        if broken:
+            _discard_process_pool(executor)
     
     return results
 
 
+def _get_process_pool(max_workers: Optional[int]) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use.
+    
+    Worker start-up (a full interpreter and import graph per worker under
+    spawn) is paid once per process rather than once per call. Asking for a
+    different max_workers replaces the pool.
+    """
+    global _PROC_POOL, _PROC_POOL_WORKERS
+    
+    pool = _PROC_POOL
+    if pool is not None and _PROC_POOL_WORKERS == max_workers:
+        return pool
+    
+    with _PROC_POOL_LOCK:
+        if _PROC_POOL is not None and _PROC_POOL_WORKERS != max_workers:
+            _PROC_POOL.shutdown(wait=False)
+            _PROC_POOL = None
+        if _PROC_POOL is None:
+            # Use spawn context on all platforms for consistency
+            # This is the only option on Windows anyway
+            _PROC_POOL = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _PROC_POOL_WORKERS = max_workers
+        return _PROC_POOL
+
+
+def _discard_process_pool(pool: concurrent.futures.ProcessPoolExecutor) -> None:
+    """Drop a broken shared pool so the next call starts a fresh one."""
+    global _PROC_POOL
+    
+    with _PROC_POOL_LOCK:
+        if _PROC_POOL is pool:
+            _PROC_POOL = None
+    pool.shutdown(wait=False)
+
+
+def _shutdown_process_pool() -> None:
+    """Shut down the shared process pool at interpreter exit."""
+    global _PROC_POOL
+    
+    with _PROC_POOL_LOCK:
+        pool, _PROC_POOL = _PROC_POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+# Shared process pool for run_parallel_processes
+_PROC_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_PROC_POOL_WORKERS: Optional[int] = None
+_PROC_POOL_LOCK = threading.Lock()
+atexit.register(_shutdown_process_pool)
+
+
 class WorkerPool:
     """
     A thread-based worker pool for running tasks.
     
     This provides more control than run_parallel_threads for
     long-running task processing.
+    
+    At most ``max_pending`` results are held; once that many are waiting to
+    be collected, workers block until get_result makes room.
     """
     
-    def __init__(self, num_workers: int = 4):
+    def __init__(self, num_workers: int = 4, max_pending: int = 1024):
         self.num_workers = num_workers
         self._task_queue: queue.Queue = queue.Queue()
-        self._result_queue: queue.Queue = queue.Queue()
+        self._result_queue: queue.Queue = queue.Queue(maxsize=max_pending)
         self._workers: list[threading.Thread] = []
         self._shutdown = threading.Event()
         self._started = False
@@ -194,31 +301,46 @@ class WorkerPool:
     
     def _worker_loop(self) -> None:
         """Main loop for worker threads."""
-        while not self._shutdown.is_set():
-            try:
-                task = self._task_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
+        # Block until work or a poison pill arrives; idle workers never wake
+        while True:
+            task = self._task_queue.get()
             
-            if task is None:  # Poison pill
+            if task is None or self._shutdown.is_set():  # Poison pill
                 break
             
             func, args, kwargs = task
             try:
-                result = func(*args, **kwargs)
-                self._result_queue.put(TaskResult(
+                result = TaskResult(
                     success=True,
-                    value=result,
+                    value=func(*args, **kwargs),
                     error=None,
                     task_id=id(task),
-                ))
+                )
             except Exception as e:
-                self._result_queue.put(TaskResult(
+                result = TaskResult(
                     success=False,
                     value=None,
                     error=e,
                     task_id=id(task),
-                ))
+                )
+            
+            if not self._put_result(result):
+                break
+    
+    def _put_result(self, result: TaskResult) -> bool:
+        """
+        Queue a result, waiting while the result queue is full.
+        
+        Returns False if the pool shut down before there was room, so a
+        worker never hangs on results nobody will collect.
+        """
+        while True:
+            try:
+                self._result_queue.put(result, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._shutdown.is_set():
+                    return False
     
     def __enter__(self) -> "WorkerPool":
         self.start()
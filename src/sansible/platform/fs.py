@@ -15,15 +15,32 @@ from . import IS_WINDOWS
 from .paths import PathLike
 
 
+# os.copy_file_range exists on Linux with Python 3.8+
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+# Bytes requested per copy_file_range call
+_COPY_CHUNK_SIZE = 1 << 30
+
+# Extensions Windows treats as executable
+_WIN_EXEC_EXTS = frozenset({".exe", ".bat", ".cmd", ".com", ".ps1"})
+
+
 def read_file(path: PathLike, encoding: str = "utf-8") -> str:
-    """Read entire file as string."""
-    with open(path, "r", encoding=encoding) as f:
-        return f.read()
+    """Read entire file as string (with universal newlines, like text mode)."""
+    text = read_bytes(path).decode(encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def read_bytes(path: PathLike) -> bytes:
-    """Read entire file as bytes."""
-    with open(path, "rb") as f:
+    """
+    Read entire file as bytes.
+    
+    FileIO.readall already sizes its buffer from fstat, so a plain read()
+    makes a single allocation for the whole file.
+    """
+    with open(path, "rb", buffering=0) as f:
         return f.read()
 
 
@@ -50,25 +67,33 @@ def atomic_write(
     Writes to a temporary file first, then renames to target path.
     This ensures the file is never partially written.
     """
-    path_str = str(path)
+    path_str = os.fspath(path)
     dir_path = os.path.dirname(path_str) or "."
     
+    # Encode once; bytes-like content is written without a copy
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        data = memoryview(content)
+    else:
+        data = memoryview(content.encode(encoding))
+    
     # Create temp file in same directory for atomic rename
     fd, tmp_path = tempfile.mkstemp(dir=dir_path, prefix=".tmp_")
+    closed = False
     try:
-        if isinstance(content, bytes):
-            os.write(fd, content)
-        else:
-            os.write(fd, content.encode(encoding))
+        # os.write may write less than asked for; keep going from where it stopped
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+        if not IS_WINDOWS:
+            os.fsync(fd)
         os.close(fd)
+        closed = True
         
-        # On Windows, we need to remove the target first
-        if IS_WINDOWS and os.path.exists(path_str):
-            os.remove(path_str)
-        
-        os.rename(tmp_path, path_str)
-    except:
-        os.close(fd) if not os.get_inheritable(fd) else None
+        # os.replace overwrites atomically on Windows as well as POSIX
+        os.replace(tmp_path, path_str)
+    except BaseException:
+        if not closed:
+            os.close(fd)
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
         raise
@@ -76,32 +101,77 @@ def atomic_write(
 
 def makedirs(path: PathLike, exist_ok: bool = True) -> None:
     """Create directory and all parent directories."""
-    os.makedirs(str(path), exist_ok=exist_ok)
+    os.makedirs(os.fspath(path), exist_ok=exist_ok)
 
 
 def remove(path: PathLike) -> None:
     """Remove a file."""
-    os.remove(str(path))
+    os.remove(os.fspath(path))
 
 
 def rmtree(path: PathLike) -> None:
     """Remove a directory tree."""
-    shutil.rmtree(str(path))
+    shutil.rmtree(os.fspath(path))
 
 
 def copy_file(src: PathLike, dst: PathLike) -> None:
     """Copy a file, preserving metadata where possible."""
-    shutil.copy2(str(src), str(dst))
+    shutil.copy2(os.fspath(src), os.fspath(dst))
 
 
 def copy_tree(src: PathLike, dst: PathLike) -> None:
-    """Copy a directory tree."""
-    shutil.copytree(str(src), str(dst))
+    """
+    Copy a directory tree.
+    
+    Behaves like shutil.copytree (symlinks are followed, metadata is
+    preserved), but walks with os.scandir and copies file contents in the
+    kernel where copy_file_range is available.
+    """
+    src_str = os.fspath(src)
+    dst_str = os.fspath(dst)
+    os.makedirs(dst_str)
+    with os.scandir(src_str) as entries:
+        for entry in entries:
+            dst_path = os.path.join(dst_str, entry.name)
+            if entry.is_dir():
+                copy_tree(entry.path, dst_path)
+            else:
+                _copy_contents(entry.path, dst_path)
+                shutil.copystat(entry.path, dst_path)
+    shutil.copystat(src_str, dst_str)
+
+
+def _copy_contents(src: str, dst: str) -> None:
+    """Copy file contents, in-kernel via copy_file_range when possible."""
+    if not _HAS_COPY_FILE_RANGE:
+        shutil.copyfile(src, dst)
+        return
+    
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        copied = 0
+        try:
+            while True:
+                n = os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK_SIZE)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            # Unsupported filesystem pair (or a pseudo-file); start over in user space
+            if copied:
+                raise
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+        else:
+            return
+        shutil.copyfileobj(fsrc, fdst)
 
 
 def move(src: PathLike, dst: PathLike) -> None:
     """Move a file or directory."""
-    shutil.move(str(src), str(dst))
+    shutil.move(os.fspath(src), os.fspath(dst))
 
 
 def chmod(path: PathLike, mode: int, follow_symlinks: bool = True) -> bool:
@@ -114,31 +184,28 @@ def chmod(path: PathLike, mode: int, follow_symlinks: bool = True) -> bool:
         # Windows doesn't have Unix permissions
         # We can only toggle read-only flag
         try:
-            if mode & stat.S_IWRITE:
-                os.chmod(str(path), stat.S_IWRITE)
-            else:
-                os.chmod(str(path), stat.S_IREAD)
+            os.chmod(os.fspath(path), stat.S_IWRITE if mode & stat.S_IWRITE else stat.S_IREAD)
             return True
         except OSError:
             return False
     else:
-        os.chmod(str(path), mode, follow_symlinks=follow_symlinks)
+        os.chmod(os.fspath(path), mode, follow_symlinks=follow_symlinks)
         return True
 
 
 def get_mode(path: PathLike) -> int:
     """Get file permission mode."""
-    return os.stat(str(path)).st_mode
+    return os.stat(os.fspath(path)).st_mode
 
 
 def is_executable(path: PathLike) -> bool:
     """Check if file is executable."""
     if IS_WINDOWS:
-        # On Windows, check extension
-        ext = os.path.splitext(str(path))[1].lower()
-        return ext in {".exe", ".bat", ".cmd", ".com", ".ps1"}
+        # On Windows, check extension; every entry is four characters long,
+        # so the lowercased tail of the path is the whole test
+        return os.fspath(path)[-4:].lower() in _WIN_EXEC_EXTS
     else:
-        return os.access(str(path), os.X_OK)
+        return os.access(os.fspath(path), os.X_OK)
 
 
 def make_executable(path: PathLike) -> bool:
@@ -146,17 +213,14 @@ def make_executable(path: PathLike) -> bool:
     if IS_WINDOWS:
         return True  # Windows uses extensions, not permissions
     
-    current = get_mode(path)
-    # Add execute permission for owner, group, others (where read is set)
-    new_mode = current
-    if current & stat.S_IRUSR:
-        new_mode |= stat.S_IXUSR
-    if current & stat.S_IRGRP:
-        new_mode |= stat.S_IXGRP
-    if current & stat.S_IROTH:
-        new_mode |= stat.S_IXOTH
+    path_str = os.fspath(path)
+    current = os.stat(path_str).st_mode
+    # Add execute permission for owner, group, others (where read is set):
+    # each read bit sits two places above its execute bit
+    new_mode = current | ((current & 0o444) >> 2)
     
-    os.chmod(str(path), new_mode)
+    if new_mode != current:
+        os.chmod(path_str, new_mode)
     return True
 
 
@@ -168,7 +232,7 @@ def symlink(src: PathLike, dst: PathLike) -> bool:
     Note: Windows symlinks require special permissions.
     """
     try:
-        os.symlink(str(src), str(dst))
+        os.symlink(os.fspath(src), os.fspath(dst))
         return True
     except OSError:
         return False
@@ -176,17 +240,17 @@ def symlink(src: PathLike, dst: PathLike) -> bool:
 
 def is_symlink(path: PathLike) -> bool:
     """Check if path is a symbolic link."""
-    return os.path.islink(str(path))
+    return os.path.islink(os.fspath(path))
 
 
 def listdir(path: PathLike) -> list[str]:
     """List directory contents."""
-    return os.listdir(str(path))
+    return os.listdir(os.fspath(path))
 
 
 def walk(path: PathLike):
     """Walk directory tree."""
-    return os.walk(str(path))
+    return os.walk(os.fspath(path))
 
 
 @contextmanager
@@ -5,13 +5,45 @@ Provides portable file locking that works on both Windows and Unix
 using only pure Python (no compiled extensions).
 """
 
+import _thread
 import os
+import random
 import time
 from typing import Optional
 from contextlib import contextmanager
 
 from . import IS_WINDOWS
 
+if IS_WINDOWS:
+    import msvcrt
+    
+    def _do_lock(fd: int) -> None:
+        """Take a non-blocking lock on the first byte of the file."""
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    
+    def _do_unlock(fd: int) -> None:
+        """Release the lock on the first byte of the file."""
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except Exception:
+            pass  # Best effort unlock
+else:
+    import fcntl
+    
+    def _do_lock(fd: int) -> None:
+        """Take a non-blocking exclusive lock on the file."""
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    
+    def _do_unlock(fd: int) -> None:
+        """Release the lock on the file."""
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+# Retry delays while waiting for a contended lock (seconds)
+LOCK_RETRY_INITIAL = 0.001
+LOCK_RETRY_MAX = 0.1
+
 
 class LockError(Exception):
     """Exception raised when a lock cannot be acquired."""
@@ -36,9 +68,25 @@ class FileLock:
         """
         self.path = path
         self.timeout = timeout
-        self._lock_file = None
+        self._fd: Optional[int] = None
         self._locked = False
     
+    def _open(self) -> int:
+        """
+        Open the lock file once and keep it for later acquires.
+        
+        The file is not truncated, so anything a holder wrote into it
+        (a PID, say) survives other processes taking the lock.
+        """
+        if self._fd is None:
+            # Create lock file directory if needed
+            lock_dir = os.path.dirname(self.path)
+            if lock_dir and not os.path.exists(lock_dir):
+                os.makedirs(lock_dir, exist_ok=True)
+            
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+    
     def acquire(self, blocking: bool = True) -> bool:
         """
         Acquire the lock.
@@ -52,81 +100,48 @@ class FileLock:
         Raises:
             LockError: If blocking with timeout and timeout exceeded.
         """
-        # Create lock file directory if needed
-        lock_dir = os.path.dirname(self.path)
-        if lock_dir and not os.path.exists(lock_dir):
-            os.makedirs(lock_dir, exist_ok=True)
-        
-        # Open lock file
-        self._lock_file = open(self.path, "w")
+        fd = self._open()
         
         start_time = time.monotonic()
+        delay = LOCK_RETRY_INITIAL
         
         while True:
             try:
-                if IS_WINDOWS:
-                    self._lock_windows()
-                else:
-                    self._lock_unix()
+                _do_lock(fd)
                 
                 self._locked = True
                 return True
-                
+            
             except (IOError, OSError):
                 if not blocking:
-                    self._lock_file.close()
-                    self._lock_file = None
                     return False
                 
                 # Check timeout
                 if self.timeout is not None:
                     elapsed = time.monotonic() - start_time
                     if elapsed >= self.timeout:
-                        self._lock_file.close()
-                        self._lock_file = None
                         raise LockError(f"Timeout waiting for lock: {self.path}")
                 
-                # Wait a bit before retrying
-                time.sleep(0.1)
+                # Back off exponentially, with jitter so waiters spread out
+                time.sleep(delay + random.uniform(0, delay * 0.25))
+                delay = min(delay * 2, LOCK_RETRY_MAX)
     
     def release(self) -> None:
-        """Release the lock."""
-        if not self._locked or self._lock_file is None:
+        """Release the lock; the lock file stays open for the next acquire."""
+        if not self._locked or self._fd is None:
             return
         
         try:
-            if IS_WINDOWS:
-                self._unlock_windows()
-            else:
-                self._unlock_unix()
+            _do_unlock(self._fd)
         finally:
             self._locked = False
-            self._lock_file.close()
-            self._lock_file = None
-    
-    def _lock_unix(self) -> None:
-        """Acquire lock on Unix using fcntl."""
-        import fcntl
-        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-    
-    def _unlock_unix(self) -> None:
-        """Release lock on Unix using fcntl."""
-        import fcntl
-        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
-    
-    def _lock_windows(self) -> None:
-        """Acquire lock on Windows using msvcrt."""
-        import msvcrt
-        msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_NBLCK, 1)
-    
-    def _unlock_windows(self) -> None:
-        """Release lock on Windows using msvcrt."""
-        import msvcrt
-        try:
-            self._lock_file.seek(0)
-            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
-        except Exception:
-            pass  # Best effort unlock
+    
+    def close(self) -> None:
+        """Release the lock if held and close the lock file."""
+        self.release()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
     
     @property
     def is_locked(self) -> bool:
@@ -141,7 +156,7 @@ class FileLock:
         self.release()
     
     def __del__(self) -> None:
-        self.release()
+        self.close()
 
 
 @contextmanager
@@ -159,19 +174,22 @@ def file_lock(path: str, timeout: Optional[float] = None):
     try:
         yield lock
     finally:
-        lock.release()
+        lock.close()
 
 
 class SimpleLock:
     """
     A simple in-memory lock for thread synchronization.
     
-    This is just a wrapper around threading.Lock for API consistency.
+    This is just a wrapper around threading.Lock for API consistency. The
+    context manager calls the underlying lock directly, skipping the
+    acquire/release wrappers.
     """
     
+    __slots__ = ("_lock",)
+    
     def __init__(self):
-        import threading
-        self._lock = threading.Lock()
+        self._lock = _thread.allocate_lock()
     
     def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
         return self._lock.acquire(blocking, timeout)
@@ -180,8 +198,8 @@ class SimpleLock:
         self._lock.release()
     
     def __enter__(self) -> "SimpleLock":
-        self.acquire()
+        self._lock.acquire()
         return self
     
     def __exit__(self, *args) -> None:
-        self.release()
+        self._lock.release()
@@ -4,10 +4,12 @@ Cross-platform path handling.
 Provides portable path operations that work correctly on both Windows and Unix.
 """
 
+import functools
 import os
 import pathlib
+import stat
 import tempfile
-from typing import Union
+from typing import Literal, Optional, Union
 
 from . import IS_WINDOWS
 
@@ -21,19 +23,28 @@ def normalize(path: PathLike) -> str:
     
     Converts forward/backslashes appropriately and resolves . and ..
     """
-    return os.path.normpath(str(path))
+    return os.path.normpath(os.fspath(path))
 
 
 def to_posix(path: PathLike) -> str:
     """Convert a path to POSIX format (forward slashes)."""
-    return str(path).replace("\\", "/")
+    # str.replace hands back the same object when there is nothing to
+    # replace, so paths that are already POSIX cost no allocation
+    return os.fspath(path).replace("\\", "/")
 
 
-def to_native(path: PathLike) -> str:
+def _to_native_windows(path: PathLike) -> str:
     """Convert a path to native format for current OS."""
-    if IS_WINDOWS:
-        return str(path).replace("/", "\\")
-    return str(path).replace("\\", "/")
+    return os.fspath(path).replace("/", "\\")
+
+
+def _to_native_posix(path: PathLike) -> str:
+    """Convert a path to native format for current OS."""
+    return os.fspath(path).replace("\\", "/")
+
+
+# The platform is fixed at import; bind the right conversion once
+to_native = _to_native_windows if IS_WINDOWS else _to_native_posix
 
 
 def join(*parts: PathLike) -> str:
@@ -48,15 +59,34 @@ def safe_join(base: PathLike, *parts: PathLike) -> str:
     Raises ValueError if the result would escape the base directory.
     """
     base_resolved = os.path.abspath(str(base))
-    result = os.path.abspath(os.path.join(base_resolved, *[str(p) for p in parts]))
+    # Joined onto an absolute base the result is absolute already, so
+    # normpath does everything abspath would (without asking for the cwd)
+    result = os.path.normpath(os.path.join(base_resolved, *[str(p) for p in parts]))
     
     # Ensure result is under base
-    if not result.startswith(base_resolved + os.sep) and result != base_resolved:
+    if not _is_within(base_resolved, result):
         raise ValueError(f"Path traversal detected: {result} escapes {base_resolved}")
     
     return result
 
 
+def _is_within(base: str, path: str) -> bool:
+    """
+    Check that a normalized absolute path is base or lies under it.
+    
+    Compares whole components: the prefix must end at a separator (or be
+    the root, which already ends in one). Case is ignored on Windows, where
+    paths on another drive never match.
+    """
+    if IS_WINDOWS:
+        base = os.path.normcase(base)
+        path = os.path.normcase(path)
+    if not path.startswith(base):
+        return False
+    n = len(base)
+    return len(path) == n or base[-1] == os.sep or path[n] == os.sep
+
+
 def get_temp_dir() -> str:
     """Get the system temporary directory."""
     return tempfile.gettempdir()
@@ -69,7 +99,11 @@ def make_temp_dir(prefix: str = "sansible_") -> str:
 
 def expand_user(path: PathLike) -> str:
     """Expand ~ to user home directory."""
-    return os.path.expanduser(str(path))
+    path_str = os.fspath(path)
+    # Only a leading ~ is expanded; everything else comes back as-is
+    if not path_str.startswith("~"):
+        return path_str
+    return os.path.expanduser(path_str)
 
 
 def expand_vars(path: PathLike) -> str:
@@ -83,8 +117,14 @@ def expand(path: PathLike) -> str:
 
 
 def get_home_dir() -> str:
-    """Get current user's home directory."""
-    return os.path.expanduser("~")
+    """Get current user's home directory (looked up once per process)."""
+    global _home_dir
+    if _home_dir is None:
+        _home_dir = os.path.expanduser("~")
+    return _home_dir
+
+
+_home_dir: Optional[str] = None
 
 
 def splitext(path: PathLike) -> tuple[str, str]:
@@ -117,6 +157,24 @@ def is_dir(path: PathLike) -> bool:
     return os.path.isdir(str(path))
 
 
+def file_kind(path: PathLike) -> Literal["missing", "file", "dir", "other"]:
+    """
+    Classify a path with a single stat call (symlinks are followed).
+    
+    Use this instead of chaining exists/is_file/is_dir, each of which
+    stats the path again.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return "missing"
+    if stat.S_ISREG(mode):
+        return "file"
+    if stat.S_ISDIR(mode):
+        return "dir"
+    return "other"
+
+
 def is_absolute(path: PathLike) -> bool:
     """Check if path is absolute."""
     return os.path.isabs(str(path))
@@ -130,3 +188,28 @@ def abspath(path: PathLike) -> str:
 def realpath(path: PathLike) -> str:
     """Get real path, resolving symlinks."""
     return os.path.realpath(str(path))
+
+
+def cached_realpath(path: PathLike) -> str:
+    """
+    Get real path, resolving symlinks, with results cached per process.
+    
+    Relative paths are cached per working directory. Resolving costs an
+    lstat per path component, so this suits hot paths over trees whose
+    symlinks do not change; call clear_realpath_cache() after changing
+    symlinks that were already resolved.
+    """
+    path_str = str(path)
+    cwd = "" if os.path.isabs(path_str) else os.getcwd()
+    return _realpath_cached(path_str, cwd)
+
+
+@functools.lru_cache(maxsize=4096)
+def _realpath_cached(path: str, cwd: str) -> str:
+    """Resolve a path; cwd is only part of the cache key."""
+    return os.path.realpath(os.path.join(cwd, path) if cwd else path)
+
+
+def clear_realpath_cache() -> None:
+    """Forget all cached realpath results."""
+    _realpath_cached.cache_clear()
@@ -4,8 +4,11 @@ Cross-platform process execution.
 Provides portable subprocess operations that work correctly on both Windows and Unix.
 """
 
+import functools
 import os
+import re
 import shlex
+import shutil
 import subprocess
 import sys
 from typing import Optional, Union, Sequence, Mapping
@@ -13,6 +16,16 @@ from typing import Optional, Union, Sequence, Mapping
 from . import IS_WINDOWS
 
 
+# Finds a character that makes an argument unsafe for a POSIX shell
+# (the same set shlex.quote checks)
+_POSIX_UNSAFE = re.compile(r"[^\w@%+=:,./-]", re.ASCII).search
+
+# Characters that force an argument to be quoted for cmd.exe
+_WIN_QUOTE_RE = re.compile(r'[ \t\n\r"^&|<>()]')
+
+# A run of backslashes followed by a quote or the end of the argument
+_WIN_ESCAPE_RE = re.compile(r'(\\*)("|\Z)')
+
 # Type aliases
 CommandArg = Union[str, bytes, "os.PathLike[str]", "os.PathLike[bytes]"]
 CommandSequence = Sequence[CommandArg]
@@ -21,6 +34,8 @@ CommandSequence = Sequence[CommandArg]
 class ProcessResult:
     """Result of a process execution."""
     
+    __slots__ = ("returncode", "stdout", "stderr", "command")
+    
     def __init__(
         self,
         returncode: int,
@@ -47,18 +62,6 @@ class ProcessResult:
         return f"ProcessResult(returncode={self.returncode}, stdout={len(self.stdout)} chars)"
 
 
-def quote_arg(arg: str) -> str:
-    """
-    Quote a single argument for shell use.
-    
-    Uses appropriate quoting for the current platform.
-    """
-    if IS_WINDOWS:
-        return _quote_windows(arg)
-    else:
-        return shlex.quote(arg)
-
-
 def _quote_windows(arg: str) -> str:
     """
     Quote an argument for Windows cmd.exe.
@@ -69,35 +72,35 @@ def _quote_windows(arg: str) -> str:
         return '""'
     
     # Check if quoting is needed
-    if not any(c in arg for c in ' \t\n\r"^&|<>()'):
+    if _WIN_QUOTE_RE.search(arg) is None:
         return arg
     
-    # Escape internal quotes and wrap
-    result = []
-    num_backslashes = 0
-    
-    for char in arg:
-        if char == '\\':
-            num_backslashes += 1
-        elif char == '"':
-            # Escape backslashes before quote
-            result.extend(['\\'] * (num_backslashes * 2 + 1))
-            result.append('"')
-            num_backslashes = 0
-        else:
-            result.extend(['\\'] * num_backslashes)
-            result.append(char)
-            num_backslashes = 0
-    
-    # Handle trailing backslashes
-    result.extend(['\\'] * (num_backslashes * 2))
-    
-    return '"' + ''.join(result) + '"'
+    # Backslashes only need escaping before a quote or the closing quote:
+    # double them, and escape the quote itself
+    return '"' + _WIN_ESCAPE_RE.sub(_escape_windows_run, arg) + '"'
+
+
+def _escape_windows_run(match: "re.Match[str]") -> str:
+    """Escape a run of backslashes ending in a quote or the end of the arg."""
+    backslashes = "\\" * (len(match.group(1)) * 2)
+    return backslashes + '\\"' if match.group(2) else backslashes
+
+
+def _quote_posix(arg: str) -> str:
+    """Quote an argument for a POSIX shell; safe words are returned as-is."""
+    if arg and _POSIX_UNSAFE(arg) is None:
+        return arg
+    return shlex.quote(arg)
+
+
+# Quote a single argument for shell use, with the platform's quoting
+# (bound once; the platform cannot change at runtime)
+quote_arg = _quote_windows if IS_WINDOWS else _quote_posix
 
 
 def quote_command(args: Sequence[str]) -> str:
     """Quote a command sequence for shell execution."""
-    return " ".join(quote_arg(arg) for arg in args)
+    return " ".join(map(quote_arg, args))
 
 
 def run(
@@ -133,10 +136,8 @@ def run(
         subprocess.TimeoutExpired: If timeout exceeded
         subprocess.CalledProcessError: If check=True and process fails
     """
-    # Prepare environment
-    run_env = dict(os.environ)
-    if env:
-        run_env.update(env)
+    # Prepare environment; without overrides the child simply inherits ours
+    run_env = {**os.environ, **env} if env else None
     
     # Prepare subprocess arguments
     kwargs: dict = {
@@ -217,10 +218,27 @@ def which(program: str) -> Optional[str]:
     """
     Find the full path to an executable.
     
-    Returns None if not found.
+    Returns None if not found. Lookups are cached per PATH (and PATHEXT on
+    Windows), since each one probes every PATH entry; use
+    clear_which_cache() after installing something into an unchanged PATH.
     """
-    import shutil
-    return shutil.which(program)
+    env = os.environ
+    return _which_cached(
+        program,
+        env.get("PATH"),
+        env.get("PATHEXT") if IS_WINDOWS else None,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _which_cached(program: str, path: Optional[str], pathext: Optional[str]) -> Optional[str]:
+    """shutil.which keyed on the environment it depends on."""
+    return shutil.which(program, path=path)
+
+
+def clear_which_cache() -> None:
+    """Forget all cached which() results."""
+    _which_cached.cache_clear()
 
 
 def get_python_executable() -> str:
@@ -4,8 +4,12 @@ Cross-platform TTY and terminal handling.
 Provides portable terminal/console operations that work on both Windows and Unix.
 """
 
+import functools
 import os
+import signal
 import sys
+import threading
+import time
 from typing import Optional, TextIO
 
 from . import IS_WINDOWS
@@ -32,46 +36,96 @@ def supports_color(stream: Optional[TextIO] = None) -> bool:
     
     On Windows, this checks for Windows Terminal, ConEmu, or
     other terminals that support ANSI escape sequences.
+    
+    The relevant environment variables are read once, at import; call
+    refresh_env_snapshot() after changing them. The decision is memoized
+    on TTY-ness and that snapshot.
     """
     if stream is None:
         stream = sys.stdout
     
+    return _supports_color_cached(is_tty(stream), *_color_env)
+
+
+def _read_color_env() -> tuple[bool, bool, str, str, str, str]:
+    """Read the environment variables that decide color support."""
+    env = os.environ
+    return (
+        bool(env.get("NO_COLOR")),
+        bool(env.get("FORCE_COLOR")),
+        env.get("TERM", ""),
+        env.get("WT_SESSION", ""),
+        env.get("ConEmuANSI", ""),
+        env.get("TERM_PROGRAM", ""),
+    )
+
+
+def refresh_env_snapshot() -> None:
+    """Re-read the color-related environment variables."""
+    global _color_env
+    _color_env = _read_color_env()
+
+
+# Snapshot of the color-related environment, in _supports_color_cached order
+_color_env = _read_color_env()
+
+
+@functools.lru_cache(maxsize=8)
+def _supports_color_cached(
+    tty: bool,
+    no_color: bool,
+    force_color: bool,
+    term: str,
+    wt_session: str,
+    conemu_ansi: str,
+    term_program: str,
+) -> bool:
+    """Decide color support from hashable inputs."""
     # If not a TTY, no color support
-    if not is_tty(stream):
+    if not tty:
         return False
     
     # Check for explicit disable
-    if os.environ.get("NO_COLOR"):
+    if no_color:
         return False
     
     # Check for explicit enable
-    if os.environ.get("FORCE_COLOR"):
+    if force_color:
         return True
     
     if IS_WINDOWS:
-        return _windows_supports_color()
+        return _windows_supports_color(wt_session, conemu_ansi, term_program)
     else:
         # Most Unix terminals support color
-        term = os.environ.get("TERM", "")
         return term != "dumb"
 
 
-def _windows_supports_color() -> bool:
+# Result of trying to enable virtual terminal processing; probed once
+_windows_vt_enabled: Optional[bool] = None
+
+
+def _windows_supports_color(wt_session: str, conemu_ansi: str, term_program: str) -> bool:
     """Check if Windows console supports ANSI colors."""
+    global _windows_vt_enabled
+    
     # Windows Terminal always supports ANSI
-    if os.environ.get("WT_SESSION"):
+    if wt_session:
         return True
     
     # ConEmu supports ANSI
-    if os.environ.get("ConEmuANSI") == "ON":
+    if conemu_ansi == "ON":
         return True
     
     # VSCode terminal supports ANSI
-    if os.environ.get("TERM_PROGRAM") == "vscode":
+    if term_program == "vscode":
         return True
     
+    if _windows_vt_enabled is not None:
+        return _windows_vt_enabled
+    
     # Windows 10 1511+ supports ANSI in cmd.exe with VirtualTerminalLevel
     # Try to enable it
+    _windows_vt_enabled = False
     try:
         import ctypes
         kernel32 = ctypes.windll.kernel32
@@ -87,11 +141,11 @@ def _windows_supports_color() -> bool:
         # Try to enable it
         new_mode = mode.value | 0x0004
         if kernel32.SetConsoleMode(handle, new_mode):
-            return True
+            _windows_vt_enabled = True
     except Exception:
         pass
     
-    return False
+    return _windows_vt_enabled
 
 
 def get_terminal_size() -> tuple[int, int]:
@@ -99,12 +153,67 @@ def get_terminal_size() -> tuple[int, int]:
     Get terminal size as (columns, lines).
     
     Returns (80, 24) as default if size cannot be determined.
+    
+    The size is cached. Where SIGWINCH can be watched (Unix, called from
+    the main thread, no handler already installed) the cache is dropped on
+    resize; otherwise it is refreshed every TERM_SIZE_TTL seconds.
     """
+    global _term_size, _term_size_time, _term_size_watched
+    
+    size = _term_size
+    if size is not None and (
+        _term_size_watched or time.monotonic() - _term_size_time < TERM_SIZE_TTL
+    ):
+        return size
+    
+    if not _term_size_watched:
+        _term_size_watched = _watch_resize()
+    
     try:
-        size = os.get_terminal_size()
-        return (size.columns, size.lines)
+        term = os.get_terminal_size()
+        size = (term.columns, term.lines)
     except OSError:
-        return (80, 24)
+        size = (80, 24)
+    
+    _term_size = size
+    _term_size_time = time.monotonic()
+    return size
+
+
+def clear_terminal_size_cache() -> None:
+    """Forget the cached terminal size."""
+    global _term_size
+    _term_size = None
+
+
+def _on_resize(signum, frame) -> None:
+    """SIGWINCH handler: the next get_terminal_size() asks the terminal again."""
+    global _term_size
+    _term_size = None
+
+
+def _watch_resize() -> bool:
+    """Install the SIGWINCH handler if that is possible and harmless."""
+    if not hasattr(signal, "SIGWINCH"):
+        return False
+    if threading.current_thread() is not threading.main_thread():
+        return False  # signal.signal only works in the main thread
+    if signal.getsignal(signal.SIGWINCH) not in (signal.SIG_DFL, None):
+        return False  # Leave someone else's handler alone
+    try:
+        signal.signal(signal.SIGWINCH, _on_resize)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+# Seconds a cached terminal size is trusted when resizes cannot be watched
+TERM_SIZE_TTL = 2.0
+
+# Cached terminal size, when it was read, and whether SIGWINCH is watched
+_term_size: Optional[tuple[int, int]] = None
+_term_size_time = 0.0
+_term_size_watched = False
 
 
 # ANSI color codes
@@ -147,51 +256,49 @@ class Colors:
     BG_WHITE = "\033[47m"
 
 
+def _color_template(*codes: str):
+    """Precompose codes and RESET into a str.format that wraps its argument."""
+    return ("".join(codes) + "{}" + Colors.RESET).format
+
+
 class ColorPrinter:
-    """Helper class for printing colored output."""
+    """
+    Helper class for printing colored output.
+    
+    Each style is a precomposed format template, so coloring a string is a
+    single str.format call. When color is disabled the styles are replaced
+    on the instance by a function that returns the text unchanged.
+    """
+    
+    _STYLES = (
+        "red", "green", "yellow", "blue", "cyan", "bold", "dim",
+        "success", "error", "warning", "info",
+    )
+    
+    red = staticmethod(_color_template(Colors.RED))
+    green = staticmethod(_color_template(Colors.GREEN))
+    yellow = staticmethod(_color_template(Colors.YELLOW))
+    blue = staticmethod(_color_template(Colors.BLUE))
+    cyan = staticmethod(_color_template(Colors.CYAN))
+    bold = staticmethod(_color_template(Colors.BOLD))
+    dim = staticmethod(_color_template(Colors.DIM))
+    success = staticmethod(_color_template(Colors.BRIGHT_GREEN, Colors.BOLD))
+    error = staticmethod(_color_template(Colors.BRIGHT_RED, Colors.BOLD))
+    warning = staticmethod(_color_template(Colors.BRIGHT_YELLOW))
+    info = staticmethod(_color_template(Colors.BRIGHT_CYAN))
     
     def __init__(self, stream: Optional[TextIO] = None):
         self.stream = stream or sys.stdout
         self.enabled = supports_color(self.stream)
-    
-    def _wrap(self, text: str, *codes: str) -> str:
-        """Wrap text with color codes if enabled."""
         if not self.enabled:
-            return text
-        return "".join(codes) + text + Colors.RESET
-    
-    def red(self, text: str) -> str:
-        return self._wrap(text, Colors.RED)
-    
-    def green(self, text: str) -> str:
-        return self._wrap(text, Colors.GREEN)
-    
-    def yellow(self, text: str) -> str:
-        return self._wrap(text, Colors.YELLOW)
-    
-    def blue(self, text: str) -> str:
-        return self._wrap(text, Colors.BLUE)
-    
-    def cyan(self, text: str) -> str:
-        return self._wrap(text, Colors.CYAN)
-    
-    def bold(self, text: str) -> str:
-        return self._wrap(text, Colors.BOLD)
-    
-    def dim(self, text: str) -> str:
-        return self._wrap(text, Colors.DIM)
-    
-    def success(self, text: str) -> str:
-        return self._wrap(text, Colors.BRIGHT_GREEN, Colors.BOLD)
-    
-    def error(self, text: str) -> str:
-        return self._wrap(text, Colors.BRIGHT_RED, Colors.BOLD)
-    
-    def warning(self, text: str) -> str:
-        return self._wrap(text, Colors.BRIGHT_YELLOW)
+            # Decided once: plain text needs no per-call check
+            for name in self._STYLES:
+                setattr(self, name, self._plain)
     
-    def info(self, text: str) -> str:
-        return self._wrap(text, Colors.BRIGHT_CYAN)
+    @staticmethod
+    def _plain(text: str) -> str:
+        """Return text unchanged (colors disabled)."""
+        return text
 
 
 # Default color printer for stdout
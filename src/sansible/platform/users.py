@@ -3,45 +3,100 @@ Cross-platform user and permission handling.
 
 Provides portable user/permission operations that work on both Windows and Unix.
 On Windows, many Unix-specific concepts (uid, gid) are stubbed or adapted.
+
+IS_WINDOWS cannot change at runtime, so each public function is bound to
+its platform's implementation once, at import.
 """
 
+import functools
 import os
 from typing import Optional, Tuple
 
 from . import IS_WINDOWS
+from .paths import get_home_dir
+from .proc import which
+
 
+def _windows_username() -> str:
+    """Current username from the environment (Windows)."""
+    return os.environ.get("USERNAME", os.environ.get("USER", ""))
 
-def get_current_user() -> str:
+
+def _get_current_user_windows() -> str:
     """Get the current username."""
-    if IS_WINDOWS:
-        return os.environ.get("USERNAME", os.environ.get("USER", "unknown"))
-    else:
-        import pwd
-        return pwd.getpwuid(os.getuid()).pw_name
+    return os.environ.get("USERNAME", os.environ.get("USER", "unknown"))
+
+
+def _get_current_user_posix() -> str:
+    """Get the current username."""
+    return _current_user_info_posix()[2]
+
+
+def _current_user_info_windows() -> Tuple[int, int, str, str]:
+    """Get (uid, gid, username, home) for the current user."""
+    return (_get_uid_windows(), _get_gid_windows(), _get_current_user_windows(), get_home_dir())
+
+
+def _current_user_info_posix() -> Tuple[int, int, str, str]:
+    """
+    Get (uid, gid, username, home) for the current user.
+    
+    The name and home come from one (cached) passwd lookup; uid and gid
+    are read from the process, so they follow setuid/setgid.
+    """
+    uid = os.getuid()
+    entry = _pw_by_uid(uid)
+    return (uid, os.getgid(), entry.pw_name, entry.pw_dir)
 
 
-def get_uid() -> int:
+@functools.lru_cache(maxsize=128)
+def _pw_by_uid(uid: int):
+    """
+    Cached pwd.getpwuid.
+    
+    NSS lookups can go over the network (LDAP/SSSD); the answers are kept
+    for the life of the process.
+    """
+    import pwd
+    return pwd.getpwuid(uid)
+
+
+@functools.lru_cache(maxsize=128)
+def _pw_by_name_cached(username: str):
+    """
+    Cached pwd.getpwnam.
+    
+    Raises KeyError for unknown users; lru_cache does not keep exceptions,
+    so only users that exist are cached and one created later is found.
+    """
+    import pwd
+    return pwd.getpwnam(username)
+
+
+def _pw_by_name(username: str):
+    """pwd.getpwnam through the cache; None if the user does not exist."""
+    try:
+        return _pw_by_name_cached(username)
+    except KeyError:
+        return None
+
+
+def _get_uid_windows() -> int:
     """
     Get current user ID.
     
     On Windows, returns a placeholder value (always 1000).
     """
-    if IS_WINDOWS:
-        return 1000  # Placeholder for Windows
-    else:
-        return os.getuid()
+    return 1000  # Placeholder for Windows
 
 
-def get_gid() -> int:
+def _get_gid_windows() -> int:
     """
     Get current group ID.
     
     On Windows, returns a placeholder value (always 1000).
     """
-    if IS_WINDOWS:
-        return 1000  # Placeholder for Windows
-    else:
-        return os.getgid()
+    return 1000  # Placeholder for Windows
 
 
 def get_uid_gid() -> Tuple[int, int]:
@@ -49,82 +104,95 @@ def get_uid_gid() -> Tuple[int, int]:
     return (get_uid(), get_gid())
 
 
-def get_home_dir() -> str:
-    """Get the current user's home directory."""
-    return os.path.expanduser("~")
-
-
-def user_exists(username: str) -> bool:
+def _user_exists_windows(username: str) -> bool:
     """
     Check if a user exists on the system.
     
     On Windows, this checks environment variables only (limited).
     """
-    if IS_WINDOWS:
-        current = os.environ.get("USERNAME", os.environ.get("USER", ""))
-        return username.lower() == current.lower()
-    else:
-        import pwd
-        try:
-            pwd.getpwnam(username)
-            return True
-        except KeyError:
-            return False
+    return username.lower() == _windows_username().lower()
+
 
+def _user_exists_posix(username: str) -> bool:
+    """Check if a user exists on the system."""
+    return _pw_by_name(username) is not None
 
-def get_user_home(username: str) -> Optional[str]:
+
+def _get_user_home_windows(username: str) -> Optional[str]:
     """
     Get the home directory for a specific user.
     
     Returns None if user not found.
     On Windows, only works for current user.
     """
-    if IS_WINDOWS:
-        current = os.environ.get("USERNAME", os.environ.get("USER", ""))
-        if username.lower() == current.lower():
-            return get_home_dir()
-        return None
-    else:
-        import pwd
-        try:
-            return pwd.getpwnam(username).pw_dir
-        except KeyError:
-            return None
+    if username.lower() == _windows_username().lower():
+        return get_home_dir()
+    return None
 
 
-def is_root() -> bool:
+def _get_user_home_posix(username: str) -> Optional[str]:
     """
-    Check if running as root/administrator.
+    Get the home directory for a specific user.
     
-    On Windows, checks for admin rights.
+    Returns None if user not found.
     """
-    if IS_WINDOWS:
-        try:
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin() != 0
-        except Exception:
-            return False
-    else:
-        return os.getuid() == 0
+    entry = _pw_by_name(username)
+    return entry.pw_dir if entry is not None else None
+
+
+@functools.lru_cache(maxsize=None)
+def _is_root_windows() -> bool:
+    """Check if running with administrator rights (fixed for the process)."""
+    try:
+        import ctypes
+        return ctypes.windll.shell32.IsUserAnAdmin() != 0
+    except Exception:
+        return False
 
 
-def can_become_user(username: str) -> bool:
+def _is_root_posix() -> bool:
+    """Check if running as root."""
+    return os.getuid() == 0
+
+
+def _can_become_user_windows(username: str) -> bool:
     """
     Check if we can become (sudo to) another user.
     
     On Windows, always returns False (use RunAs instead).
     """
-    if IS_WINDOWS:
-        return False
-    else:
-        # On Unix, check if we're root or if sudo is available
-        if is_root():
-            return True
-        
-        # Check if sudo is available and configured
-        # This is a simplified check
-        import shutil
-        return shutil.which("sudo") is not None
+    return False
+
+
+def _can_become_user_posix(username: str) -> bool:
+    """Check if we can become (sudo to) another user."""
+    # On Unix, check if we're root or if sudo is available
+    if is_root():
+        return True
+    
+    # Check if sudo is available and configured
+    # This is a simplified check
+    return which("sudo") is not None
+
+
+if IS_WINDOWS:
+    current_user_info = _current_user_info_windows
+    get_current_user = _get_current_user_windows
+    get_uid = _get_uid_windows
+    get_gid = _get_gid_windows
+    user_exists = _user_exists_windows
+    get_user_home = _get_user_home_windows
+    is_root = _is_root_windows
+    can_become_user = _can_become_user_windows
+else:
+    current_user_info = _current_user_info_posix
+    get_current_user = _get_current_user_posix
+    get_uid = os.getuid
+    get_gid = os.getgid
+    user_exists = _user_exists_posix
+    get_user_home = _get_user_home_posix
+    is_root = _is_root_posix
+    can_become_user = _can_become_user_posix
 
 
 class UserContext:
@@ -140,22 +208,20 @@ class UserContext:
         self._original_uid: Optional[int] = None
         self._original_gid: Optional[int] = None
     
-    def __enter__(self) -> "UserContext":
-        if IS_WINDOWS:
+    if IS_WINDOWS:
+        def __enter__(self) -> "UserContext":
             return self  # No-op on Windows
-        
-        self._original_uid = os.getuid()
-        self._original_gid = os.getgid()
-        
-        # Note: Actually switching users requires root privileges
-        # This is mainly a placeholder for the interface
-        
-        return self
+    else:
+        def __enter__(self) -> "UserContext":
+            self._original_uid = os.getuid()
+            self._original_gid = os.getgid()
+            
+            # Note: Actually switching users requires root privileges
+            # This is mainly a placeholder for the interface
+            
+            return self
     
     def __exit__(self, *args) -> None:
-        if IS_WINDOWS:
-            return  # No-op on Windows
-        
         # Restore original context if changed
         # (In practice, this requires careful handling)
         pass
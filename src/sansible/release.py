@@ -9,5 +9,5 @@ __version__ = "0.4.1"
 __author__ = "Sansible Contributors"
 __codename__ = "ModuleStorm"
 
-# Version info tuple for programmatic comparison
-VERSION_INFO = (0, 4, 0)
+# Version info tuple for programmatic comparison (derived, so it cannot drift)
+VERSION_INFO: tuple[int, ...] = tuple(int(part) for part in __version__.split("."))
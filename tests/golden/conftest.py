@@ -4,6 +4,9 @@ Golden Tests Fixtures and Configuration
 
 import pytest
 from pathlib import Path
+from typing import Generator
+
+from .sansible_worker import SansibleWorker
 
 
 @pytest.fixture
@@ -22,3 +25,11 @@ def fixtures_dir(project_root: Path) -> Path:
 def playbooks_dir(fixtures_dir: Path) -> Path:
     """Return the playbooks directory."""
     return fixtures_dir / "playbooks"
+
+
+@pytest.fixture(scope="module")
+def sansible_worker() -> Generator[SansibleWorker, None, None]:
+    """One Sansible process serving every playbook run in the module."""
+    worker = SansibleWorker()
+    yield worker
+    worker.close()
@@ -0,0 +1,132 @@
+"""
+Long-lived Sansible process for the golden tests.
+
+Starting ``python -m sansible.cli.playbook`` for every run pays for a fresh
+interpreter and the whole import graph each time. The worker imports
+Sansible once and then serves runs over a pipe: one JSON request per line
+on stdin (``{"args": [...]}``), one JSON reply per line on stdout
+(``{"returncode": ..., "stdout": ..., "stderr": ...}``).
+
+Run as a script to serve; use SansibleWorker from the tests.
+"""
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import traceback
+from typing import Optional, Sequence
+
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+
+
+class SansibleWorker:
+    """Client side: a worker process and the requests sent to it."""
+    
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+    
+    def run(self, args: Sequence[str], timeout: float = 120) -> subprocess.CompletedProcess:
+        """
+        Run sansible-playbook with args, like subprocess.run(capture_output=True).
+        
+        Raises subprocess.TimeoutExpired (and stops the worker) if the run
+        takes longer than timeout.
+        """
+        if self._proc is None:
+            raise RuntimeError("sansible worker is closed")
+        
+        self._proc.stdin.write(json.dumps({"args": list(args)}) + "\n")
+        self._proc.stdin.flush()
+        
+        reply = self._readline(args, timeout)
+        if not reply:
+            self.close()
+            raise RuntimeError("sansible worker exited unexpectedly")
+        
+        data = json.loads(reply)
+        return subprocess.CompletedProcess(
+            list(args), data["returncode"], data["stdout"], data["stderr"]
+        )
+    
+    def _readline(self, args: Sequence[str], timeout: float) -> str:
+        """Read one reply line, giving up after timeout seconds."""
+        lines: list[str] = []
+        reader = threading.Thread(
+            target=lambda: lines.append(self._proc.stdout.readline()),
+            daemon=True,
+        )
+        reader.start()
+        reader.join(timeout)
+        if reader.is_alive():
+            self.close()
+            raise subprocess.TimeoutExpired(list(args), timeout)
+        return lines[0]
+    
+    def close(self) -> None:
+        """Stop the worker process."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """The process exit status a SystemExit would have produced."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def serve() -> int:
+    """Answer run requests from stdin until it is closed."""
+    # Replies get a private copy of stdout; fd 1 itself is pointed at
+    # stderr so nothing written to it directly can corrupt the protocol
+    replies = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+    
+    from sansible.cli.playbook import main as playbook_main
+    
+    for line in sys.stdin:
+        request = json.loads(line)
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                returncode = playbook_main(request["args"])
+            except SystemExit as e:
+                returncode = _exit_code(e)
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+        
+        replies.write(json.dumps({
+            "returncode": returncode,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }) + "\n")
+        replies.flush()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
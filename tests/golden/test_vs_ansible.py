@@ -5,113 +5,239 @@ These tests run the same playbooks with both Sansible and real Ansible,
 then compare the results to ensure compatibility.
 """
 
+import concurrent.futures
+import functools
 import json
 import os
+import shutil
 import subprocess
 import sys
-import tempfile
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, Optional, Tuple, Union
 
 import pytest
 
+from .sansible_worker import SansibleWorker
 
-# Check if ansible-playbook is available
-def ansible_available() -> bool:
-    """Check if ansible-playbook is installed and available."""
+
+# Where probe results are kept between pytest invocations, and for how long
+PROBE_CACHE_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "sansible" / "ansible_probe.json"
+)
+PROBE_CACHE_TTL = 24 * 60 * 60
+
+
+def _cached_probe(name: str, probe: Callable[[], bool]) -> bool:
+    """
+    Run an ansible probe, reusing a result cached on disk.
+    
+    Entries are keyed on the ansible-playbook path and mtime, so upgrading
+    or switching Ansible invalidates them; they also expire after
+    PROBE_CACHE_TTL (installed collections can change underneath).
+    """
+    exe = shutil.which("ansible-playbook")
+    if exe is None:
+        return False
     try:
-        result = subprocess.run(
-            ["ansible-playbook", "--version"],
-            capture_output=True,
-            timeout=10,
-        )
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        key = f"{exe}:{os.stat(exe).st_mtime_ns}"
+    except OSError:
         return False
+    
+    try:
+        cache = json.loads(PROBE_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(name)
+    if (
+        isinstance(entry, dict)
+        and entry.get("key") == key
+        and time.time() - entry.get("time", 0) < PROBE_CACHE_TTL
+    ):
+        return bool(entry.get("value"))
+    
+    value = probe()
+    cache[name] = {"key": key, "time": time.time(), "value": value}
+    try:
+        PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent xdist workers never see half a file
+        tmp = PROBE_CACHE_FILE.with_name(f"{PROBE_CACHE_FILE.name}.{os.getpid()}")
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, PROBE_CACHE_FILE)
+    except OSError:
+        pass
+    return value
 
 
-def ansible_json_callback_available() -> bool:
+# Static playbook used by the json callback probe
+JSON_CALLBACK_PROBE = Path(__file__).parent.parent / "fixtures" / "probes" / "json_callback_probe.yml"
+
+
+def _probe_json_callback() -> bool:
     """Check if Ansible json callback is available."""
     try:
-        import tempfile
-        import yaml
-        
-        # Create a minimal playbook to test
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
-            yaml.dump([{'hosts': 'localhost', 'gather_facts': False, 
-                       'tasks': [{'ping': None}]}], f)
-            playbook_path = f.name
-        
         env = os.environ.copy()
         env["ANSIBLE_STDOUT_CALLBACK"] = "json"
         env["ANSIBLE_HOST_KEY_CHECKING"] = "False"
         result = subprocess.run(
-            ["ansible-playbook", "-i", "localhost,", playbook_path],
+            ["ansible-playbook", "-i", "localhost,", str(JSON_CALLBACK_PROBE)],
             capture_output=True,
             timeout=30,
             env=env,
         )
         
-        # Clean up
-        os.unlink(playbook_path)
-        
         # Check if json callback error appears in stderr
         return b"Could not load 'json'" not in result.stderr
     except Exception:
         return False
 
 
-ANSIBLE_AVAILABLE = ansible_available()
-ANSIBLE_JSON_CALLBACK_AVAILABLE = ansible_available() and ansible_json_callback_available()
+@functools.lru_cache(maxsize=None)
+def ansible_available() -> bool:
+    """
+    Check if ansible-playbook is installed and available.
+    
+    A PATH lookup is enough here; running --version would start Ansible's
+    whole runtime. The json callback probe does actually run it.
+    """
+    return shutil.which("ansible-playbook") is not None
+
+
+@functools.lru_cache(maxsize=None)
+def ansible_json_callback_available() -> bool:
+    """Check if Ansible json callback is available (probed once)."""
+    return ansible_available() and _cached_probe("json_callback_available", _probe_json_callback)
+
+
 SKIP_REASON = "ansible-playbook not installed (run with dev dependencies)"
 SKIP_REASON_JSON = "ansible json callback not available (missing collection)"
 
 
-@pytest.fixture
+# The probes run when a test that needs Ansible is set up, not at import,
+# so collecting (or running only the Sansible-side tests) spawns nothing
+@pytest.fixture(scope="session")
+def requires_ansible() -> None:
+    """Skip the test unless ansible-playbook is available."""
+    if not ansible_available():
+        pytest.skip(SKIP_REASON)
+
+
+@pytest.fixture(scope="session")
+def requires_ansible_json() -> None:
+    """Skip the test unless Ansible's json callback is available."""
+    if not ansible_json_callback_available():
+        pytest.skip(SKIP_REASON_JSON)
+
+
+@pytest.fixture(scope="module")
 def fixtures_dir() -> Path:
     """Path to test fixtures directory."""
     return Path(__file__).parent.parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def inventory_file(fixtures_dir: Path) -> Path:
     """Path to inventory file."""
     return fixtures_dir / "inventory.ini"
 
 
+@pytest.fixture
+def smoke_vars(tmp_path: Path) -> Dict[str, Any]:
+    """
+    Extra vars giving each linux_smoke.yml run its own scratch file.
+    
+    The playbook defaults to a fixed /tmp path; a per-test file lets the
+    tests run concurrently under pytest-xdist.
+    """
+    return {"test_file": str(tmp_path / "neo_test.txt")}
+
+
+def as_text(output: Union[str, bytes]) -> str:
+    """Decode captured output (bytes from subprocess, str from the worker)."""
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output
+
+
+def find_json_document(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode the first JSON object in text, skipping any noise before it.
+    
+    Decodes in place from each candidate '{' with raw_decode, so the output
+    is never split into per-line copies, and a pretty-printed document
+    spanning many lines is found as well as a one-line one.
+    """
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(obj, dict):
+            return obj
+        start = text.find("{", start + 1)
+    return None
+
+
 class GoldenTestRunner:
     """
     Runs playbooks with both Sansible and Ansible and compares results.
     """
     
-    def __init__(self, inventory: str, playbook: str):
+    def __init__(
+        self,
+        inventory: str,
+        playbook: str,
+        extra_vars: Optional[Dict[str, Any]] = None,
+        worker: Optional[SansibleWorker] = None,
+        ansible_extra_vars: Optional[Dict[str, Any]] = None,
+    ):
         self.inventory = inventory
         self.playbook = playbook
+        self.extra_vars = extra_vars
+        self.worker = worker
+        # Lets the Ansible run use different vars (e.g. its own scratch
+        # file) so both tools can run at once; defaults to extra_vars
+        self.ansible_extra_vars = ansible_extra_vars
         self.san_result: Optional[Dict[str, Any]] = None
         self.ansible_result: Optional[Dict[str, Any]] = None
         self.san_exit_code: int = -1
         self.ansible_exit_code: int = -1
     
+    @staticmethod
+    def _extra_vars_args(extra_vars: Optional[Dict[str, Any]]) -> list:
+        """Command-line arguments passing extra vars (as JSON) to either tool."""
+        if not extra_vars:
+            return []
+        return ["-e", json.dumps(extra_vars)]
+    
     def run_sansible(self) -> Tuple[int, Dict[str, Any]]:
         """Run playbook with Sansible and return exit code and JSON result."""
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "sansible.cli.playbook",
-                "-i", self.inventory,
-                self.playbook,
-                "--json",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
+        args = [
+            "-i", self.inventory,
+            self.playbook,
+            "--json",
+            *self._extra_vars_args(self.extra_vars),
+        ]
+        if self.worker is not None:
+            result = self.worker.run(args, timeout=120)
+        else:
+            result = subprocess.run(
+                [sys.executable, "-m", "sansible.cli.playbook", *args],
+                capture_output=True,
+                timeout=120,
+            )
         
         self.san_exit_code = result.returncode
         
+        # json.loads takes the captured bytes as they are
         try:
             self.san_result = json.loads(result.stdout)
         except json.JSONDecodeError:
-            self.san_result = {"error": "Failed to parse JSON", "stdout": result.stdout}
+            self.san_result = {"error": "Failed to parse JSON", "stdout": as_text(result.stdout)}
         
         return self.san_exit_code, self.san_result
     
@@ -127,57 +253,54 @@ class GoldenTestRunner:
                 "ansible-playbook",
                 "-i", self.inventory,
                 self.playbook,
+                *self._extra_vars_args(self.ansible_extra_vars or self.extra_vars),
             ],
             capture_output=True,
-            text=True,
             timeout=120,
             env=env,
         )
         
         self.ansible_exit_code = result.returncode
         
+        # Usually stdout is just the document; only otherwise is it decoded
+        # to look for it among extra lines
         try:
             self.ansible_result = json.loads(result.stdout)
         except json.JSONDecodeError:
-            # Ansible JSON callback output may have extra lines
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                try:
-                    self.ansible_result = json.loads(line)
-                    break
-                except json.JSONDecodeError:
-                    continue
+            stdout = as_text(result.stdout)
+            self.ansible_result = find_json_document(stdout)
             if self.ansible_result is None:
-                self.ansible_result = {"error": "Failed to parse JSON", "stdout": result.stdout}
+                self.ansible_result = {"error": "Failed to parse JSON", "stdout": stdout}
         
         return self.ansible_exit_code, self.ansible_result
     
+    def run_both(self) -> Tuple[Tuple[int, Dict[str, Any]], Tuple[int, Dict[str, Any]]]:
+        """
+        Run the playbook with Sansible and Ansible concurrently.
+        
+        Both runs are subprocess-bound, so wall time is the slower of the
+        two rather than their sum. Playbooks that write fixed paths need
+        ansible_extra_vars to keep the runs apart.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            san = pool.submit(self.run_sansible)
+            ansible = pool.submit(self.run_ansible)
+            return san.result(), ansible.result()
+    
     def compare_exit_codes(self) -> bool:
         """Check if both exit codes indicate same success/failure."""
-        san_success = self.san_exit_code == 0
-        ansible_success = self.ansible_exit_code == 0
-        return san_success == ansible_success
+        return (self.san_exit_code == 0) == (self.ansible_exit_code == 0)
     
     def compare_stats(self) -> Dict[str, Any]:
         """Compare aggregate stats between Sansible and Ansible."""
-        comparison = {
+        return {
             "san_exit": self.san_exit_code,
             "ansible_exit": self.ansible_exit_code,
             "exit_codes_match": self.compare_exit_codes(),
-            "san_stats": {},
-            "ansible_stats": {},
+            "san_stats": (self.san_result or {}).get("stats", {}),
+            # Ansible's stats format varies by callback
+            "ansible_stats": (self.ansible_result or {}).get("stats", {}),
         }
-        
-        # Extract Sansible stats
-        if self.san_result and "stats" in self.san_result:
-            comparison["san_stats"] = self.san_result["stats"]
-        
-        # Extract Ansible stats (format varies by callback)
-        if self.ansible_result:
-            if "stats" in self.ansible_result:
-                comparison["ansible_stats"] = self.ansible_result["stats"]
-        
-        return comparison
 
 
 # Helper to check if a file exists on the target
@@ -191,35 +314,56 @@ def file_content(path: str) -> str:
     return Path(path).read_text()
 
 
-@pytest.mark.skipif(not ANSIBLE_JSON_CALLBACK_AVAILABLE, reason=SKIP_REASON_JSON)
+@pytest.fixture(scope="class")
+def smoke_runner(
+    requires_ansible_json: None,
+    inventory_file: Path,
+    fixtures_dir: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    sansible_worker: SansibleWorker,
+) -> GoldenTestRunner:
+    """
+    linux_smoke.yml run once with each tool, shared by a test class.
+    
+    Each Ansible run takes tens of seconds; the assertions only read the
+    results, so there is no need to repeat the runs per test.
+    """
+    playbook = str(fixtures_dir / "playbooks" / "linux_smoke.yml")
+    scratch = tmp_path_factory.mktemp("smoke")
+    
+    runner = GoldenTestRunner(
+        str(inventory_file),
+        playbook,
+        {"test_file": str(scratch / "sansible.txt")},
+        sansible_worker,
+        ansible_extra_vars={"test_file": str(scratch / "ansible.txt")},
+    )
+    runner.run_both()
+    return runner
+
+
+@pytest.mark.usefixtures("requires_ansible_json")
 class TestGoldenLinuxSmoke:
     """Golden tests for linux_smoke.yml playbook."""
     
-    def test_both_run_successfully(self, inventory_file: Path, fixtures_dir: Path):
+    def test_both_run_successfully(self, smoke_runner: GoldenTestRunner):
         """Both Sansible and Ansible should succeed with linux_smoke.yml."""
-        playbook = str(fixtures_dir / "playbooks" / "linux_smoke.yml")
-        
-        runner = GoldenTestRunner(str(inventory_file), playbook)
-        
-        san_exit, san_result = runner.run_sansible()
-        ansible_exit, ansible_result = runner.run_ansible()
+        runner = smoke_runner
         
         # Both should succeed
-        assert san_exit == 0, f"Sansible failed with exit {san_exit}: {san_result}"
-        assert ansible_exit == 0, f"Ansible failed with exit {ansible_exit}: {ansible_result}"
+        assert runner.san_exit_code == 0, (
+            f"Sansible failed with exit {runner.san_exit_code}: {runner.san_result}"
+        )
+        assert runner.ansible_exit_code == 0, (
+            f"Ansible failed with exit {runner.ansible_exit_code}: {runner.ansible_result}"
+        )
         
         # Exit codes should match
         assert runner.compare_exit_codes(), "Exit codes don't match"
     
-    def test_stats_comparable(self, inventory_file: Path, fixtures_dir: Path):
+    def test_stats_comparable(self, smoke_runner: GoldenTestRunner):
         """Stats from Sansible and Ansible should be comparable."""
-        playbook = str(fixtures_dir / "playbooks" / "linux_smoke.yml")
-        
-        runner = GoldenTestRunner(str(inventory_file), playbook)
-        runner.run_sansible()
-        runner.run_ansible()
-        
-        comparison = runner.compare_stats()
+        comparison = smoke_runner.compare_stats()
         
         # Both should have some ok tasks
         san_stats = comparison.get("san_stats", {}).get("localhost", {})
@@ -230,19 +374,23 @@ class TestGoldenLinuxSmoke:
 class TestNeoOnly:
     """Tests that only run Sansible (don't require ansible-playbook)."""
     
-    def test_json_output_format(self, inventory_file: Path, fixtures_dir: Path):
+    def test_json_output_format(
+        self,
+        inventory_file: Path,
+        fixtures_dir: Path,
+        smoke_vars: Dict[str, Any],
+        sansible_worker: SansibleWorker,
+    ):
         """Sansible JSON output should have correct structure."""
         playbook = str(fixtures_dir / "playbooks" / "linux_smoke.yml")
         
-        result = subprocess.run(
+        result = sansible_worker.run(
             [
-                sys.executable, "-m", "sansible.cli.playbook",
                 "-i", str(inventory_file),
                 playbook,
                 "--json",
+                "-e", json.dumps(smoke_vars),
             ],
-            capture_output=True,
-            text=True,
             timeout=60,
         )
         
@@ -271,17 +419,14 @@ class TestNeoOnly:
             assert "status" in task
             assert "changed" in task
     
-    def test_json_error_output(self, fixtures_dir: Path):
+    def test_json_error_output(self, fixtures_dir: Path, sansible_worker: SansibleWorker):
         """Sansible should output JSON errors when --json flag is used."""
-        result = subprocess.run(
+        result = sansible_worker.run(
             [
-                sys.executable, "-m", "sansible.cli.playbook",
                 "-i", "nonexistent_inventory.ini",
                 "nonexistent_playbook.yml",
                 "--json",
             ],
-            capture_output=True,
-            text=True,
             timeout=30,
         )
         
@@ -294,15 +439,21 @@ class TestNeoOnly:
         assert data["error"] is True
 
 
-@pytest.mark.skipif(not ANSIBLE_AVAILABLE, reason=SKIP_REASON)
+@pytest.mark.usefixtures("requires_ansible")
 class TestIdempotency:
     """Test that running playbooks twice produces expected results."""
     
-    def test_second_run_less_changes(self, inventory_file: Path, fixtures_dir: Path):
+    def test_second_run_less_changes(
+        self,
+        inventory_file: Path,
+        fixtures_dir: Path,
+        smoke_vars: Dict[str, Any],
+        sansible_worker: SansibleWorker,
+    ):
         """Running playbook twice should show fewer changes on second run."""
         playbook = str(fixtures_dir / "playbooks" / "linux_smoke.yml")
         
-        runner = GoldenTestRunner(str(inventory_file), playbook)
+        runner = GoldenTestRunner(str(inventory_file), playbook, smoke_vars, sansible_worker)
         
         # First run
         exit1, result1 = runner.run_sansible()
@@ -324,5 +475,41 @@ class TestIdempotency:
         assert exit1 == exit2 == 0
 
 
+class TestFindJsonDocument:
+    """Tests for find_json_document."""
+    
+    def test_skips_leading_warnings(self):
+        text = '[WARNING]: no {inventory}\n{\n  "stats": {"localhost": {"ok": 1}}\n}\n'
+        assert find_json_document(text) == {"stats": {"localhost": {"ok": 1}}}
+    
+    def test_no_document(self):
+        assert find_json_document("no json here {") is None
+
+
+class TestProbeCache:
+    """Tests for the on-disk ansible probe cache."""
+    
+    def test_probe_result_reused(self, tmp_path: Path, monkeypatch):
+        exe = tmp_path / "ansible-playbook"
+        exe.write_text("")
+        monkeypatch.setattr(shutil, "which", lambda name: str(exe))
+        monkeypatch.setattr(sys.modules[__name__], "PROBE_CACHE_FILE", tmp_path / "probe.json")
+        
+        calls = []
+        
+        def probe() -> bool:
+            calls.append(1)
+            return True
+        
+        assert _cached_probe("x", probe) is True
+        assert _cached_probe("x", probe) is True
+        assert len(calls) == 1
+        
+        # A different ansible-playbook (new mtime) probes again
+        os.utime(exe, ns=(0, 0))
+        assert _cached_probe("x", probe) is True
+        assert len(calls) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,7 +4,11 @@ SSH Integration Tests
 Tests that run playbooks against a real SSH server in Docker.
 """
 
+import hashlib
+import importlib.util
+import json
 import os
+import socket
 import subprocess
 import sys
 import tempfile
@@ -30,12 +34,13 @@ def docker_available() -> bool:
 
 # Check if asyncssh is available
 def asyncssh_available() -> bool:
-    """Check if asyncssh is installed."""
-    try:
-        import asyncssh
-        return True
-    except ImportError:
-        return False
+    """
+    Check if asyncssh is installed.
+    
+    Only locates the package; importing it (and its crypto dependencies)
+    is left to the tests that use it.
+    """
+    return importlib.util.find_spec("asyncssh") is not None
 
 
 DOCKER_AVAILABLE = docker_available()
@@ -56,13 +61,28 @@ class SSHTestContainer:
     def __init__(self):
         self.container_id: Optional[str] = None
         self.dockerfile_path = Path(__file__).parent / "docker" / "Dockerfile.ssh"
+        # Tagged with the Dockerfile's hash, so an unchanged image is reused
+        digest = hashlib.sha256(self.dockerfile_path.read_bytes()).hexdigest()[:12]
+        self.image = f"{self.IMAGE_NAME}:{digest}"
+    
+    def image_exists(self) -> bool:
+        """Check if the image for the current Dockerfile is already built."""
+        result = subprocess.run(
+            ["docker", "image", "inspect", self.image],
+            capture_output=True,
+            timeout=30,
+        )
+        return result.returncode == 0
     
     def build(self) -> bool:
-        """Build the SSH test container image."""
+        """Build the SSH test container image (skipped if already built)."""
+        if self.image_exists():
+            return True
+        
         result = subprocess.run(
             [
                 "docker", "build",
-                "-t", self.IMAGE_NAME,
+                "-t", self.image,
                 "-f", str(self.dockerfile_path),
                 str(self.dockerfile_path.parent),
             ],
@@ -83,7 +103,9 @@ class SSHTestContainer:
                 "-d",
                 "--name", self.CONTAINER_NAME,
                 "-p", f"{self.SSH_PORT}:22",
-                self.IMAGE_NAME,
+                # RAM-backed /tmp for the files the playbooks create
+                "--tmpfs", "/tmp:rw,size=64m",
+                self.image,
             ],
             capture_output=True,
             text=True,
@@ -100,23 +122,27 @@ class SSHTestContainer:
     
     def _wait_for_ssh(self, timeout: int = 30) -> bool:
         """Wait for SSH server to be ready."""
-        start = time.time()
-        while time.time() - start < timeout:
-            result = subprocess.run(
-                [
-                    "docker", "exec", self.CONTAINER_NAME,
-                    "nc", "-z", "localhost", "22",
-                ],
-                capture_output=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                # Give it a moment more to fully initialize
-                time.sleep(1)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._ssh_banner_received():
                 return True
-            time.sleep(0.5)
+            time.sleep(0.05)
         return False
     
+    def _ssh_banner_received(self) -> bool:
+        """
+        Check that sshd answers on the published port.
+        
+        Docker's port proxy accepts connections before anything listens in
+        the container, so a successful connect is not enough; the server's
+        "SSH-" identification line is.
+        """
+        try:
+            with socket.create_connection(("127.0.0.1", self.SSH_PORT), timeout=1) as sock:
+                return sock.recv(255).startswith(b"SSH-")
+        except OSError:
+            return False
+    
     def stop(self) -> None:
         """Stop and remove the container."""
         subprocess.run(
@@ -133,9 +159,9 @@ sshtest ansible_host=127.0.0.1 ansible_port={self.SSH_PORT} ansible_user={self.S
 """
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def ssh_container() -> Generator[SSHTestContainer, None, None]:
-    """Start SSH container for tests."""
+    """Start SSH container for tests (once per session)."""
     container = SSHTestContainer()
     
     if not DOCKER_AVAILABLE:
@@ -156,16 +182,22 @@ def ssh_container() -> Generator[SSHTestContainer, None, None]:
     container.stop()
 
 
-@pytest.fixture
-def ssh_inventory(ssh_container: SSHTestContainer, tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def ssh_files(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory for the SSH test inputs, written once per session."""
+    return tmp_path_factory.mktemp("sansible_ssh")
+
+
+@pytest.fixture(scope="session")
+def ssh_inventory(ssh_container: SSHTestContainer, ssh_files: Path) -> Path:
     """Create inventory file for SSH container."""
-    inventory_file = tmp_path / "inventory.ini"
+    inventory_file = ssh_files / "inventory.ini"
     inventory_file.write_text(ssh_container.get_inventory_content())
     return inventory_file
 
 
-@pytest.fixture
-def ssh_playbook(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def ssh_playbook(ssh_files: Path) -> Path:
     """Create a simple SSH test playbook."""
     playbook_content = """---
 - name: SSH Integration Test
@@ -198,13 +230,14 @@ def ssh_playbook(tmp_path: Path) -> Path:
     - name: Cleanup test file
       shell: rm -f /tmp/sansible_test_file.txt
 """
-    playbook_file = tmp_path / "ssh_test.yml"
+    playbook_file = ssh_files / "ssh_test.yml"
     playbook_file.write_text(playbook_content)
     return playbook_file
 
 
 @pytest.mark.skipif(not DOCKER_AVAILABLE, reason=SKIP_DOCKER)
 @pytest.mark.skipif(not ASYNCSSH_AVAILABLE, reason=SKIP_ASYNCSSH)
+@pytest.mark.xdist_group("ssh_container")  # One worker, one container
 class TestSSHIntegration:
     """SSH integration tests with Docker container."""
     
@@ -235,13 +268,14 @@ class TestSSHIntegration:
                 "--json",
             ],
             capture_output=True,
-            text=True,
             timeout=60,
         )
         
-        assert result.returncode == 0, f"Failed: {result.stdout}\n{result.stderr}"
+        assert result.returncode == 0, (
+            f"Failed: {result.stdout.decode(errors='replace')}\n"
+            f"{result.stderr.decode(errors='replace')}"
+        )
         
-        import json
         data = json.loads(result.stdout)
         assert data.get("stats", {}).get("sshtest", {}).get("failed", 1) == 0
     
@@ -274,11 +308,13 @@ class TestSSHIntegration:
                 "--json",
             ],
             capture_output=True,
-            text=True,
             timeout=60,
         )
         
-        assert result.returncode == 0, f"Failed: {result.stdout}\n{result.stderr}"
+        assert result.returncode == 0, (
+            f"Failed: {result.stdout.decode(errors='replace')}\n"
+            f"{result.stderr.decode(errors='replace')}"
+        )
     
     def test_ssh_file_operations(self, ssh_inventory: Path, ssh_playbook: Path):
         """Test full playbook with file operations."""
@@ -291,13 +327,14 @@ class TestSSHIntegration:
                 "--json",
             ],
             capture_output=True,
-            text=True,
             timeout=120,
         )
         
-        assert result.returncode == 0, f"Failed: {result.stdout}\n{result.stderr}"
+        assert result.returncode == 0, (
+            f"Failed: {result.stdout.decode(errors='replace')}\n"
+            f"{result.stderr.decode(errors='replace')}"
+        )
         
-        import json
         data = json.loads(result.stdout)
         stats = data.get("stats", {}).get("sshtest", {})
         assert stats.get("failed", 1) == 0
@@ -7,41 +7,28 @@ from unittest.mock import AsyncMock, MagicMock
 
 from sansible.engine.scheduler import HostContext
 from sansible.engine.inventory import Host
+from sansible.engine.playbook import Play, Task
 from sansible.connections.base import RunResult
+from sansible.modules.base import become_command
+from sansible.modules.builtin_command import CommandModule
+from sansible.modules.builtin_shell import ShellModule
+from sansible.modules.win_command import WinCommandModule
 
 
 class TestBecomeInHostContext:
     """Test become fields in HostContext."""
     
-    def test_host_context_has_become_field(self):
-        """HostContext has become field."""
-        host = Host(name="test", variables={})
-        ctx = HostContext(host=host, become=True)
-        assert ctx.become is True
-    
-    def test_host_context_become_default_false(self):
-        """HostContext become defaults to False."""
-        host = Host(name="test", variables={})
-        ctx = HostContext(host=host)
-        assert ctx.become is False
-    
-    def test_host_context_has_become_user(self):
-        """HostContext has become_user field."""
-        host = Host(name="test", variables={})
-        ctx = HostContext(host=host, become=True, become_user="root")
-        assert ctx.become_user == "root"
-    
-    def test_host_context_become_user_default_root(self):
-        """HostContext become_user defaults to root."""
-        host = Host(name="test", variables={})
-        ctx = HostContext(host=host, become=True)
-        assert ctx.become_user == "root"
-    
-    def test_host_context_has_become_method(self):
-        """HostContext has become_method field."""
-        host = Host(name="test", variables={})
-        ctx = HostContext(host=host, become=True, become_method="sudo")
-        assert ctx.become_method == "sudo"
+    @pytest.mark.parametrize("kwargs, attr, expected", [
+        ({"become": True}, "become", True),
+        ({}, "become", False),  # become defaults to False
+        ({"become": True, "become_user": "root"}, "become_user", "root"),
+        ({"become": True}, "become_user", "root"),  # become_user defaults to root
+        ({"become": True, "become_method": "sudo"}, "become_method", "sudo"),
+    ])
+    def test_host_context_become_fields(self, kwargs, attr, expected):
+        """HostContext carries the become fields and their defaults."""
+        ctx = HostContext(host=Host(name="test", variables={}), **kwargs)
+        assert getattr(ctx, attr) == expected
 
 
 class TestBecomeInPlay:
@@ -49,19 +36,16 @@ class TestBecomeInPlay:
     
     def test_play_has_become_field(self):
         """Play dataclass has become field."""
-        from sansible.engine.playbook import Play
         play = Play(name="test", hosts="all", tasks=[], become=True)
         assert play.become is True
     
     def test_play_become_default_false(self):
         """Play become defaults to False."""
-        from sansible.engine.playbook import Play
         play = Play(name="test", hosts="all", tasks=[])
         assert play.become is False
     
     def test_play_has_become_user(self):
         """Play has become_user field."""
-        from sansible.engine.playbook import Play
         play = Play(name="test", hosts="all", tasks=[], become=True, become_user="admin")
         assert play.become_user == "admin"
 
@@ -71,24 +55,33 @@ class TestBecomeInTask:
     
     def test_task_has_become_field(self):
         """Task dataclass has become field."""
-        from sansible.engine.playbook import Task
         task = Task(name="test", module="command", args={"cmd": "whoami"}, become=True)
         assert task.become is True
     
     def test_task_become_default_none(self):
         """Task become defaults to None (inherit from play)."""
-        from sansible.engine.playbook import Task
         task = Task(name="test", module="command", args={"cmd": "whoami"})
         assert task.become is None
 
 
+class TestBecomeCommand:
+    """Test the become command builder directly (no module or connection)."""
+    
+    @pytest.mark.parametrize("method, user, expected", [
+        ("sudo", "root", "sudo -u root whoami"),
+        ("su", "admin", "su - admin -c 'whoami'"),
+        ("doas", "root", "sudo -u root whoami"),  # Unknown methods fall back to sudo
+    ])
+    def test_become_command(self, method, user, expected):
+        assert become_command("whoami", method, user) == expected
+
+
 class TestBecomeCommandWrapping:
     """Test that commands are wrapped with sudo/runas."""
     
     @pytest.mark.asyncio
     async def test_command_wrapped_with_sudo(self):
         """Command module wraps command with sudo when become=True."""
-        from sansible.modules.builtin_command import CommandModule
         
         host = Host(name="test", variables={"ansible_connection": "ssh"})
         ctx = HostContext(host=host, become=True, become_method="sudo", become_user="root")
@@ -107,7 +100,6 @@ class TestBecomeCommandWrapping:
     @pytest.mark.asyncio
     async def test_shell_wrapped_with_sudo(self):
         """Shell module wraps command with sudo when become=True."""
-        from sansible.modules.builtin_shell import ShellModule
         
         host = Host(name="test", variables={"ansible_connection": "ssh"})
         ctx = HostContext(host=host, become=True, become_method="sudo", become_user="root")
@@ -125,7 +117,6 @@ class TestBecomeCommandWrapping:
     @pytest.mark.asyncio
     async def test_become_false_no_sudo(self):
         """Command not wrapped when become=False."""
-        from sansible.modules.builtin_command import CommandModule
         
         host = Host(name="test", variables={"ansible_connection": "ssh"})
         ctx = HostContext(host=host, become=False)
@@ -147,7 +138,6 @@ class TestWindowsBecome:
     @pytest.mark.asyncio
     async def test_win_command_with_become(self):
         """Win_command uses runas when become=True."""
-        from sansible.modules.win_command import WinCommandModule
         
         host = Host(name="test", variables={"ansible_connection": "winrm"})
         ctx = HostContext(host=host, become=True, become_user="Administrator")
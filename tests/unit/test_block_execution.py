@@ -2,14 +2,9 @@
 Tests for block rescue/always execution in the runner.
 """
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock
-
 from sansible.engine.scheduler import HostContext
 from sansible.engine.inventory import Host
-from sansible.engine.playbook import Play, Task
-from sansible.engine.results import TaskResult, TaskStatus
-from sansible.connections.base import RunResult
+from sansible.engine.playbook import PlaybookParser, Task
 
 
 class TestBlockMetadataOnTasks:
@@ -66,8 +61,6 @@ class TestRescueExecution:
     
     def test_rescue_task_has_metadata(self, tmp_path):
         """Rescue tasks have _is_rescue=True."""
-        from sansible.engine.playbook import PlaybookParser
-        
         playbook_content = """
 - name: Test
   hosts: localhost
@@ -98,8 +91,6 @@ class TestAlwaysExecution:
     
     def test_always_task_has_metadata(self, tmp_path):
         """Always tasks have _is_always=True."""
-        from sansible.engine.playbook import PlaybookParser
-        
         playbook_content = """
 - name: Test
   hosts: localhost
@@ -140,8 +131,6 @@ class TestBlockExecutionOrder:
     
     def test_tasks_in_block_order(self, tmp_path):
         """Block tasks come before rescue before always."""
-        from sansible.engine.playbook import PlaybookParser
-        
         playbook_content = """
 - name: Test
   hosts: localhost
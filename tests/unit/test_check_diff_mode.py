@@ -7,7 +7,7 @@ These tests are written FIRST, before implementation.
 import pytest
 from pathlib import Path
 from typing import Optional
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 
 from sansible.modules.base import Module, ModuleResult, register_module
 from sansible.engine.scheduler import HostContext
@@ -61,20 +61,17 @@ class TestCheckMode:
         return ctx
     
     @pytest.mark.asyncio
-    async def test_copy_module_check_mode_no_file_transfer(self):
+    async def test_copy_module_check_mode_no_file_transfer(self, tmp_path):
         """In check mode, copy module should NOT actually transfer files."""
         from sansible.modules.builtin_copy import CopyModule
         
+        src = tmp_path / "test.txt"
+        src.write_text("x" * 100)
         ctx = self.create_context(check_mode=True)
-        args = {"src": "/tmp/test.txt", "dest": "/remote/test.txt"}
+        args = {"src": str(src), "dest": "/remote/test.txt"}
         
-        # Patch Path.exists to return True
-        with patch.object(Path, 'exists', return_value=True):
-            with patch.object(Path, 'is_dir', return_value=False):
-                with patch.object(Path, 'stat') as mock_stat:
-                    mock_stat.return_value = MagicMock(st_size=100)
-                    module = CopyModule(args, ctx)
-                    result = await module.run()
+        module = CopyModule(args, ctx)
+        result = await module.run()
         
         # Should report what WOULD change
         assert result.changed == True
@@ -82,6 +79,24 @@ class TestCheckMode:
         # Should NOT actually put files
         assert len(ctx.connection.files_put) == 0
     
+    @pytest.mark.asyncio
+    async def test_copy_module_uploads_outside_check_mode(self, tmp_path):
+        """Outside check mode, copy uploads the file and reports its size."""
+        from sansible.modules.builtin_copy import CopyModule
+        
+        src = tmp_path / "test.txt"
+        src.write_text("hello")
+        ctx = self.create_context()
+        
+        result = await CopyModule({"src": str(src), "dest": "/remote/test.txt"}, ctx).run()
+        missing = await CopyModule({"src": str(tmp_path / "nope"), "dest": "/r"}, ctx).run()
+        directory = await CopyModule({"src": str(tmp_path), "dest": "/r"}, ctx).run()
+        
+        assert result.changed and result.results["size"] == 5
+        assert ctx.connection.files_put == [(str(src), "/remote/test.txt", None)]
+        assert missing.failed and "not found" in missing.msg
+        assert directory.failed
+    
     @pytest.mark.asyncio
     async def test_command_module_check_mode_no_execution(self):
         """In check mode, command module should NOT execute commands."""
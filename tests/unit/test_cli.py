@@ -12,11 +12,35 @@ class TestMainCLI:
         parser = main.create_parser()
         assert parser.prog == "sansible"
     
+    def test_parser_is_reused(self):
+        assert main.create_parser() is main.create_parser()
+        first = main.create_parser().parse_args(["all", "-m", "ping"])
+        second = main.create_parser().parse_args(["web", "-m", "command"])
+        assert first is not second
+        assert first.module == "ping"
+    
+    def test_version_info_matches_version(self):
+        from sansible.release import VERSION_INFO
+        assert ".".join(map(str, VERSION_INFO)) == __version__
+    
     def test_version_string(self):
         version = main.get_version_string()
         assert __version__ in version
         assert "pure-python" in version.lower()
     
+    def test_version_flag(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            main.create_parser().parse_args(["--version"])
+        assert exc.value.code == 0
+        assert __version__ in capsys.readouterr().out
+    
+    def test_main_version_skips_parser(self, capsys, monkeypatch):
+        def no_parser():
+            raise AssertionError("parser built for --version")
+        monkeypatch.setattr(main, "create_parser", no_parser)
+        assert main.main(["--version"]) == 0
+        assert __version__ in capsys.readouterr().out
+    
     def test_main_no_args_shows_help(self, capsys):
         result = main.main([])
         assert result == 0
@@ -32,6 +56,28 @@ class TestPlaybookCLI:
     def test_version_string(self):
         version = playbook.get_version_string()
         assert __version__ in version
+    
+    def test_parse_extra_vars(self, tmp_path):
+        vars_file = tmp_path / "vars.yml"
+        vars_file.write_text("from_file: 1\n")
+        
+        result = playbook._parse_extra_vars([
+            '{"a": 1}',
+            "b=2",
+            "c=hello world",
+            "d=[1, 2]",
+            "e=true",
+            f"@{vars_file}",
+        ])
+        
+        assert result == {
+            "a": 1,
+            "b": 2,
+            "c": "hello world",
+            "d": [1, 2],
+            "e": True,
+            "from_file": 1,
+        }
 
 
 class TestInventoryCLI:
@@ -0,0 +1,119 @@
+"""Unit tests for platform concurrency utilities."""
+
+import concurrent.futures
+import os
+
+from sansible.platform import concurrency
+
+
+def _square(x):
+    if x < 0:
+        raise ValueError("negative")
+    return x * x
+
+
+def _crash(x):
+    if x == 0:
+        os._exit(1)
+    return x
+
+
+class TestRunParallelThreads:
+    """Tests for run_parallel_threads."""
+    
+    def test_small_batch_in_order(self):
+        results = concurrency.run_parallel_threads(_square, [1, 2, 3])
+        assert [r.value for r in results] == [1, 4, 9]
+        assert [r.task_id for r in results] == [0, 1, 2]
+    
+    def test_large_batch_in_order(self):
+        items = range(concurrency.SMALL_BATCH_SIZE * 3)
+        results = concurrency.run_parallel_threads(_square, items, max_workers=4)
+        assert [r.value for r in results] == [i * i for i in items]
+    
+    def test_generator_consumed_within_window(self):
+        produced = []
+        
+        def items():
+            for i in range(50):
+                produced.append(i)
+                yield i
+        
+        def work(x):
+            # Beyond the small-batch probe, only a bounded window of items
+            # may have been pulled so far
+            assert len(produced) <= max(x + 1 + 4, concurrency.SMALL_BATCH_SIZE + 1)
+            return x
+        
+        results = concurrency.run_parallel_threads(work, items(), max_workers=2, max_inflight=4)
+        
+        assert [r.value for r in results] == list(range(50))
+        assert all(r.success for r in results)
+    
+    def test_errors_captured(self):
+        results = concurrency.run_parallel_threads(_square, [2, -1])
+        assert results[0].success and results[0].value == 4
+        assert not results[1].success
+        assert isinstance(results[1].error, ValueError)
+    
+    def test_empty(self):
+        assert concurrency.run_parallel_threads(_square, []) == []
+
+
+class TestRunParallelProcesses:
+    """Tests for run_parallel_processes."""
+    
+    def test_results_and_pool_reuse(self):
+        results = concurrency.run_parallel_processes(_square, [1, 2, -1], max_workers=2)
+        pool = concurrency._PROC_POOL
+        again = concurrency.run_parallel_processes(_square, [3], max_workers=2)
+        
+        assert [r.value for r in results[:2]] == [1, 4]
+        assert isinstance(results[2].error, ValueError)
+        assert again[0].value == 9
+        assert concurrency._PROC_POOL is pool
+    
+    def test_crashing_worker_reported_and_pool_replaced(self):
+        results = concurrency.run_parallel_processes(
+            _crash, range(20), max_workers=2, max_inflight=2
+        )
+        again = concurrency.run_parallel_processes(_square, [3], max_workers=2)
+        
+        assert len(results) == 20
+        assert not all(r.success for r in results)
+        assert all(
+            isinstance(r.error, concurrent.futures.BrokenExecutor)
+            for r in results if not r.success
+        )
+        assert again[0].value == 9
+
+
+class TestWorkerPool:
+    """Tests for WorkerPool."""
+    
+    def test_submit_and_shutdown(self):
+        with concurrency.WorkerPool(num_workers=2) as pool:
+            pool.submit(_square, 3)
+            result = pool.get_result(timeout=5)
+        
+        assert result.success and result.value == 9
+        assert pool._workers == []
+    
+    def test_full_result_queue_applies_backpressure(self):
+        pool = concurrency.WorkerPool(num_workers=1, max_pending=1)
+        for i in range(3):
+            pool.submit(_square, i)
+        
+        assert pool.get_result(timeout=5).value == 0
+        assert pool.get_result(timeout=5).value == 1
+        assert pool.get_result(timeout=5).value == 4
+        pool.shutdown()
+    
+    def test_shutdown_with_uncollected_results(self):
+        pool = concurrency.WorkerPool(num_workers=1, max_pending=1)
+        for i in range(3):
+            pool.submit(_square, i)
+        
+        pool.shutdown()  # must not hang on the full result queue
+        
+        assert pool._workers == []
@@ -1,6 +1,7 @@
 """Unit tests for platform filesystem utilities."""
 
 import os
+import sys
 import tempfile
 import pytest
 from sansible.platform import fs
@@ -21,6 +22,18 @@ class TestFileReadWrite:
         content = fs.read_bytes(test_file)
         assert content == b"\x00\x01\x02\x03"
     
+    def test_read_file_universal_newlines(self, tmp_path):
+        test_file = tmp_path / "crlf.txt"
+        fs.write_bytes(test_file, b"a\r\nb\rc\n")
+        assert fs.read_file(test_file) == "a\nb\nc\n"
+    
+    def test_read_bytes_empty_and_pseudo_files(self, tmp_path):
+        test_file = tmp_path / "empty.bin"
+        fs.write_bytes(test_file, b"")
+        assert fs.read_bytes(test_file) == b""
+        if os.path.exists("/proc/self/status"):
+            assert b"Name:" in fs.read_bytes("/proc/self/status")
+    
     def test_atomic_write(self, tmp_path):
         test_file = tmp_path / "atomic.txt"
         fs.atomic_write(test_file, "atomic content")
@@ -31,6 +44,16 @@ class TestFileReadWrite:
         fs.write_file(test_file, "original")
         fs.atomic_write(test_file, "updated")
         assert fs.read_file(test_file) == "updated"
+    
+    def test_atomic_write_bytes(self, tmp_path):
+        test_file = tmp_path / "atomic.bin"
+        fs.atomic_write(test_file, bytearray(b"\x00\xff" * 100000))
+        assert fs.read_bytes(test_file) == b"\x00\xff" * 100000
+    
+    def test_atomic_write_failure_cleans_up(self, tmp_path):
+        with pytest.raises(OSError):
+            fs.atomic_write(tmp_path, "content")
+        assert not list(tmp_path.glob(".tmp_*"))
 
 
 class TestDirectoryOperations:
@@ -64,6 +87,59 @@ class TestFileCopy:
         fs.write_file(src, "copy me")
         fs.copy_file(src, dst)
         assert fs.read_file(dst) == "copy me"
+    
+    def test_copy_tree(self, tmp_path):
+        src = tmp_path / "src"
+        (src / "sub").mkdir(parents=True)
+        fs.write_file(src / "a.txt", "a")
+        fs.write_bytes(src / "sub" / "b.bin", b"\x00" * 70000)
+        os.utime(src / "a.txt", (1000000000, 1000000000))
+        
+        fs.copy_tree(src, tmp_path / "dst")
+        
+        assert fs.read_file(tmp_path / "dst" / "a.txt") == "a"
+        assert fs.read_bytes(tmp_path / "dst" / "sub" / "b.bin") == b"\x00" * 70000
+        assert os.stat(tmp_path / "dst" / "a.txt").st_mtime == 1000000000
+    
+    def test_copy_tree_existing_destination(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "dst").mkdir()
+        with pytest.raises(FileExistsError):
+            fs.copy_tree(tmp_path / "src", tmp_path / "dst")
+    
+    def test_copy_tree_falls_back_without_kernel_copy(self, tmp_path, monkeypatch):
+        def unsupported(*args):
+            raise OSError("not supported")
+        monkeypatch.setattr(fs, "_HAS_COPY_FILE_RANGE", True)
+        monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+        src = tmp_path / "src"
+        src.mkdir()
+        fs.write_file(src / "a.txt", "fallback")
+        
+        fs.copy_tree(src, tmp_path / "dst")
+        
+        assert fs.read_file(tmp_path / "dst" / "a.txt") == "fallback"
+
+
+class TestPermissions:
+    """Tests for executable checks and permissions."""
+    
+    def test_is_executable_windows_extensions(self, monkeypatch):
+        monkeypatch.setattr(fs, "IS_WINDOWS", True)
+        assert fs.is_executable("C:\\tools\\SETUP.EXE")
+        assert fs.is_executable("run.ps1")
+        assert not fs.is_executable("notes.txt")
+        assert not fs.is_executable("exe")
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_make_executable_follows_read_bits(self, tmp_path):
+        script = tmp_path / "run.sh"
+        script.touch()
+        os.chmod(script, 0o640)
+        
+        assert fs.make_executable(script)
+        
+        assert os.stat(script).st_mode & 0o777 == 0o750
 
 
 class TestContextManagers:
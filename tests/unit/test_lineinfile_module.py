@@ -156,3 +156,134 @@ class TestWinLineinfileModule:
         from sansible.modules.win_lineinfile import WinLineinfileModule
         assert WinLineinfileModule is not None
         assert WinLineinfileModule.name == "win_lineinfile"
+    
+    @pytest.mark.asyncio
+    async def test_win_lineinfile_base64_round_trip(self):
+        """Win_lineinfile reads and writes the file as base64 bytes."""
+        import base64
+        from sansible.modules.win_lineinfile import WinLineinfileModule
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        original = base64.b64encode(b'a = "$x"\r\nb\r\n').decode()
+        ctx.connection.run = AsyncMock(side_effect=[
+            RunResult(rc=0, stdout=original, stderr=""),  # read file
+            RunResult(rc=0, stdout="", stderr=""),  # write file
+        ])
+        
+        module = WinLineinfileModule({
+            "path": "C:\\it's\\app.ini",
+            "line": "c",
+        }, ctx)
+        result = await module.run()
+        
+        assert not result.failed
+        assert result.changed is True
+        write_ps = ctx.connection.run.call_args_list[1][0][0]
+        assert "$path = 'C:\\it''s\\app.ini'" in write_ps
+        expected = base64.b64encode(b'a = "$x"\r\nb\r\nc').decode()
+        assert f"FromBase64String('{expected}')" in write_ps
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding,bom", [
+        ("utf-16-le", b"\xff\xfe"),
+        ("cp1252", b""),
+        ("utf-8", b"\xef\xbb\xbf"),
+    ])
+    async def test_win_lineinfile_keeps_encoding(self, encoding, bom):
+        """Win_lineinfile writes the file back in the encoding it was read in."""
+        import base64
+        from sansible.modules.win_lineinfile import WinLineinfileModule
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        original = base64.b64encode(bom + "café\r\n".encode(encoding)).decode()
+        ctx.connection.run = AsyncMock(side_effect=[
+            RunResult(rc=0, stdout=original, stderr=""),
+            RunResult(rc=0, stdout="", stderr=""),
+        ])
+        
+        result = await WinLineinfileModule({"path": "C:\\a.txt", "line": "naïve"}, ctx).run()
+        
+        assert not result.failed
+        write_ps = ctx.connection.run.call_args_list[1][0][0]
+        expected = base64.b64encode(bom + "café\r\nnaïve".encode(encoding)).decode()
+        assert f"FromBase64String('{expected}')" in write_ps
+    
+    @pytest.mark.asyncio
+    async def test_win_lineinfile_undecodable_fails(self):
+        """Win_lineinfile refuses to rewrite bytes it cannot decode."""
+        import base64
+        from sansible.modules.win_lineinfile import WinLineinfileModule
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        # 0x81 is undefined in cp1252 and invalid as UTF-8
+        original = base64.b64encode(b"a\x81b\r\n").decode()
+        ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout=original, stderr=""))
+        
+        result = await WinLineinfileModule({"path": "C:\\a.txt", "line": "c"}, ctx).run()
+        
+        assert result.failed
+        assert "unsupported encoding" in result.msg.lower()
+        assert ctx.connection.run.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_win_lineinfile_precheck_unchanged(self):
+        """Win_lineinfile skips the transfer when the line is already present."""
+        from sansible.modules.win_lineinfile import UNCHANGED_MARKER, WinLineinfileModule
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        ctx.connection.run = AsyncMock(
+            return_value=RunResult(rc=0, stdout=UNCHANGED_MARKER + "\r\n", stderr="")
+        )
+        
+        module = WinLineinfileModule({
+            "path": "C:\\app.ini",
+            "regexp": "^port=",
+            "line": "port=80",
+        }, ctx)
+        result = await module.run()
+        
+        assert not result.failed
+        assert result.changed is False
+        assert ctx.connection.run.call_count == 1
+        read_ps = ctx.connection.run.call_args[0][0]
+        assert "$regexp = '^port='" in read_ps
+    
+    def test_win_lineinfile_is_unchanged(self):
+        """Win_lineinfile detects literal no-op edits without splitting lines."""
+        from sansible.modules.win_lineinfile import WinLineinfileModule
+        
+        content = "a=1\r\nport=80\r\nb=2"
+        assert WinLineinfileModule._is_unchanged(content, "present", "port=80")
+        assert WinLineinfileModule._is_unchanged(content, "present", "b=2")
+        assert not WinLineinfileModule._is_unchanged(content, "present", "port=8")
+        assert not WinLineinfileModule._is_unchanged(content, "present", "port=80", "^port")
+        assert WinLineinfileModule._is_unchanged(content, "absent", "c=3")
+        assert not WinLineinfileModule._is_unchanged(content, "absent", "a=1")
+    
+    def test_win_lineinfile_ensure_absent(self):
+        """Win_lineinfile removes every line matching regexp or literal line."""
+        from sansible.modules.win_lineinfile import WinLineinfileModule
+        
+        module = WinLineinfileModule.__new__(WinLineinfileModule)
+        
+        lines = ["#a", "b", "#c", "b$"]
+        assert module._ensure_absent(lines, regexp="^#") is True
+        assert lines == ["b", "b$"]
+        
+        assert module._ensure_absent(lines, line="b") is True
+        assert lines == ["b$"]
+        
+        assert module._ensure_absent(lines, regexp="^x") is False
+        assert lines == ["b$"]
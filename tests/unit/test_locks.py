@@ -0,0 +1,70 @@
+"""Unit tests for platform locking utilities."""
+
+import threading
+import time
+
+import pytest
+
+from sansible.platform import locks
+
+
+class TestSimpleLock:
+    """Tests for SimpleLock."""
+    
+    def test_context_manager(self):
+        lock = locks.SimpleLock()
+        with lock as held:
+            assert held is lock
+            assert not lock.acquire(blocking=False)
+        assert lock.acquire(blocking=False)
+        lock.release()
+    
+    def test_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            locks.SimpleLock().other = 1
+
+
+class TestFileLock:
+    """Tests for FileLock."""
+    
+    def test_acquire_release(self, tmp_path):
+        lock = locks.FileLock(str(tmp_path / "a.lock"))
+        with lock:
+            assert lock.is_locked
+            other = locks.FileLock(str(tmp_path / "a.lock"))
+            assert not other.acquire(blocking=False)
+        assert not lock.is_locked
+        assert other.acquire(blocking=False)
+        other.release()
+    
+    def test_contended_acquire_backs_off_briefly(self, tmp_path):
+        path = str(tmp_path / "b.lock")
+        holder = locks.FileLock(path)
+        holder.acquire()
+        threading.Timer(0.02, holder.release).start()
+        
+        start = time.monotonic()
+        with locks.FileLock(path, timeout=5):
+            waited = time.monotonic() - start
+        
+        assert waited < 0.1
+    
+    def test_timeout(self, tmp_path):
+        path = str(tmp_path / "c.lock")
+        with locks.FileLock(path):
+            with pytest.raises(locks.LockError):
+                locks.FileLock(path, timeout=0.05).acquire()
+    
+    def test_fd_reused_and_content_preserved(self, tmp_path):
+        path = tmp_path / "d.lock"
+        path.write_text("1234")
+        lock = locks.FileLock(str(path))
+        
+        with lock:
+            fd = lock._fd
+        with lock:
+            assert lock._fd == fd
+        
+        assert path.read_text() == "1234"
+        lock.close()
+        assert lock._fd is None
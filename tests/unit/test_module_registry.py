@@ -0,0 +1,43 @@
+"""
+Tests for the module registry's lazy lookups.
+"""
+
+import subprocess
+import sys
+
+from sansible.modules import base
+from sansible.modules.base import _module_file, get_module
+
+
+class TestModuleFile:
+    """Test mapping module names to the files that register them."""
+    
+    def test_every_registered_module_maps_to_its_file(self):
+        """The naming convention plus overrides covers the whole registry."""
+        base._ensure_modules_imported()
+        for name, cls in base._modules.items():
+            assert _module_file(name) == cls.__module__, name
+    
+    def test_fqcn_has_no_file(self):
+        """Dotted names are never builtin files."""
+        assert _module_file("community.general.foo") is None
+
+
+class TestGetModule:
+    """Test get_module lookups."""
+    
+    def test_unknown_module(self):
+        """Unknown names return None rather than raising."""
+        assert get_module("no_such_module") is None
+        assert get_module("community.general.foo") is None
+    
+    def test_imports_only_requested_module(self):
+        """Looking up one module leaves the others unimported."""
+        code = (
+            "import sys\n"
+            "from sansible.modules.base import get_module\n"
+            "assert get_module('debug').name == 'debug'\n"
+            "assert 'sansible.modules.builtin_debug' in sys.modules\n"
+            "assert 'sansible.modules.builtin_copy' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,6 +1,7 @@
 """Unit tests for platform path utilities."""
 
 import os
+import sys
 import pytest
 from sansible.platform import paths
 
@@ -22,6 +23,10 @@ class TestPathNormalization:
     
     def test_to_posix_preserves_forward_slashes(self):
         assert paths.to_posix("foo/bar/baz") == "foo/bar/baz"
+    
+    def test_to_posix_accepts_pathlike(self):
+        import pathlib
+        assert paths.to_posix(pathlib.PurePosixPath("foo/bar")) == "foo/bar"
 
 
 class TestPathJoining:
@@ -64,6 +69,11 @@ class TestPathUtilities:
         assert result != "~"
         assert os.path.isdir(result)
     
+    def test_expand_user_leaves_other_paths(self):
+        import pathlib
+        assert paths.expand_user("a/~b") == "a/~b"
+        assert paths.expand_user(pathlib.PurePosixPath("x/y")) == "x/y"
+    
     def test_basename(self):
         assert paths.basename("/foo/bar/baz.txt") == "baz.txt"
     
@@ -75,3 +85,42 @@ class TestPathUtilities:
         root, ext = paths.splitext("file.tar.gz")
         assert ext == ".gz"
         assert root == "file.tar"
+    
+    def test_file_kind(self, tmp_path):
+        (tmp_path / "f.txt").write_text("x")
+        assert paths.file_kind(tmp_path / "f.txt") == "file"
+        assert paths.file_kind(tmp_path) == "dir"
+        assert paths.file_kind(tmp_path / "missing") == "missing"
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need privileges")
+    def test_cached_realpath_cached_until_cleared(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        link = tmp_path / "link"
+        link.symlink_to(tmp_path / "a")
+        
+        assert paths.cached_realpath(link) == os.path.realpath(tmp_path / "a")
+        link.unlink()
+        link.symlink_to(tmp_path / "b")
+        assert paths.cached_realpath(link) == os.path.realpath(tmp_path / "a")
+        assert paths.realpath(link) == os.path.realpath(tmp_path / "b")
+        
+        paths.clear_realpath_cache()
+        assert paths.cached_realpath(link) == os.path.realpath(tmp_path / "b")
+    
+    def test_safe_join(self, tmp_path):
+        assert paths.safe_join(tmp_path, "x", "..", "y") == os.path.join(str(tmp_path), "y")
+        with pytest.raises(ValueError):
+            paths.safe_join(tmp_path, "..", "escape")
+    
+    def test_safe_join_sibling_prefix(self, tmp_path):
+        base = tmp_path / "app"
+        with pytest.raises(ValueError):
+            paths.safe_join(base, "..", "app2", "x")
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX root")
+    def test_safe_join_root_base(self):
+        assert paths.safe_join("/", "etc") == "/etc"
+    
+    def test_safe_join_base_itself(self, tmp_path):
+        assert paths.safe_join(tmp_path, "x", "..") == os.path.abspath(tmp_path)
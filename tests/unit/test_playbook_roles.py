@@ -2,10 +2,16 @@
 Tests for playbook parsing and role expansion.
 """
 
+import sys
+
 import pytest
+import yaml
 from pathlib import Path
 
-from sansible.engine.playbook import PlaybookParser, Play, Task, SUPPORTED_MODULES
+from sansible.engine.playbook import (
+    PlaybookParser, Play, Task, SUPPORTED_MODULES, YAML_LOADER, _clone_plays,
+    _load_yaml, _load_yaml_documents, _parse_cache, clear_parse_cache,
+)
 from sansible.engine.errors import ParseError, UnsupportedFeatureError
 
 
@@ -398,3 +404,148 @@ class TestSupportedModules:
         """Test that newly added modules are supported."""
         new_modules = {'file', 'template'}
         assert new_modules.issubset(SUPPORTED_MODULES)
+
+
+class TestParseCache:
+    """Test the process-wide parse cache."""
+    
+    PLAYBOOK = """
+- hosts: all
+  tasks:
+    - include_tasks: extra.yml
+"""
+    
+    def _write(self, tmp_path: Path, msg: str = "one") -> Path:
+        (tmp_path / "extra.yml").write_text(f"- debug:\n    msg: {msg}\n")
+        playbook_file = tmp_path / "playbook.yml"
+        playbook_file.write_text(self.PLAYBOOK)
+        return playbook_file
+    
+    def test_hit_returns_independent_copy(self, tmp_path: Path):
+        """A second parse reuses the cache but not the objects."""
+        playbook_file = self._write(tmp_path)
+        first = PlaybookParser(playbook_file).parse()
+        first[0].tasks[0].args["msg"] = "mutated"
+        
+        second = PlaybookParser(playbook_file).parse()
+        
+        assert second[0].tasks[0].args["msg"] == "one"
+        assert second[0] is not first[0]
+    
+    def test_changed_dependency_invalidates(self, tmp_path: Path):
+        """Editing an included file is picked up."""
+        playbook_file = self._write(tmp_path)
+        PlaybookParser(playbook_file).parse()
+        
+        (tmp_path / "extra.yml").write_text("- debug:\n    msg: two, longer\n")
+        plays = PlaybookParser(playbook_file).parse()
+        
+        assert plays[0].tasks[0].args["msg"] == "two, longer"
+    
+    def test_earlier_role_path_invalidates(self, tmp_path: Path, monkeypatch):
+        """A role appearing next to the playbook shadows the cwd copy."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "play").mkdir()
+        (tmp_path / "roles" / "r" / "tasks").mkdir(parents=True)
+        (tmp_path / "roles" / "r" / "tasks" / "main.yml").write_text("- debug:\n    msg: cwd\n")
+        playbook_file = tmp_path / "play" / "playbook.yml"
+        playbook_file.write_text("- hosts: all\n  roles:\n    - r\n")
+        assert PlaybookParser(playbook_file).parse()[0].tasks[0].args["msg"] == "cwd"
+        
+        role_dir = tmp_path / "play" / "roles" / "r" / "tasks"
+        role_dir.mkdir(parents=True)
+        (role_dir / "main.yml").write_text("- debug:\n    msg: playbook dir\n")
+        plays = PlaybookParser(playbook_file).parse()
+        
+        assert plays[0].tasks[0].args["msg"] == "playbook dir"
+    
+    def test_clone_shares_no_containers(self):
+        """Cloned plays can be modified without touching the cached ones."""
+        task = Task(name="t", module="debug", args={"msg": ["a"]}, tags=["x"])
+        task._role_vars["v"] = {"k": 1}
+        play = Play(name="p", hosts="all", tasks=[task], vars={"a": [1]})
+        
+        clone = _clone_plays([play])[0]
+        clone.tasks[0].args["msg"].append("b")
+        clone.tasks[0].tags.append("y")
+        clone.tasks[0]._role_vars["v"]["k"] = 2
+        clone.vars["a"].append(2)
+        
+        assert task.args == {"msg": ["a"]}
+        assert task.tags == ["x"]
+        assert task._role_vars == {"v": {"k": 1}}
+        assert play.vars == {"a": [1]}
+    
+    def test_clear(self, tmp_path: Path):
+        """clear_parse_cache empties the cache."""
+        PlaybookParser(self._write(tmp_path)).parse()
+        assert _parse_cache
+        
+        clear_parse_cache()
+        
+        assert not _parse_cache
+
+
+class TestYamlLoading:
+    """Test the node-walking YAML loader matches yaml.load."""
+    
+    DOCUMENTS = """
+base: &base
+  become: yes
+  retries: 3
+  ratio: 0.5
+  nothing: ~
+  when: "{{ x }}"
+task:
+  <<: *base
+  tags: [a, *base]
+1: int key
+when: 2024-01-01
+---
+---
+- plain
+- !!str 42
+"""
+    
+    def test_matches_load_all(self):
+        """Every tag, merge key and alias builds the same value."""
+        expected = list(yaml.load_all(self.DOCUMENTS, Loader=YAML_LOADER))
+        assert _load_yaml_documents(self.DOCUMENTS) == expected
+    
+    def test_single_document(self):
+        """_load_yaml returns None for empty input and rejects streams."""
+        assert _load_yaml("") is None
+        assert _load_yaml("a: [1, b]") == {"a": [1, "b"]}
+        with pytest.raises(yaml.YAMLError):
+            _load_yaml("a: 1\n---\nb: 2\n")
+    
+    def test_recursive_alias(self):
+        """Self-referencing aliases point back at their container."""
+        data = _load_yaml("a: &x [*x]")
+        assert data["a"][0] is data["a"]
+    
+    def test_nested_aliases_built_once(self):
+        """Aliases share one value, so nested anchors cannot blow up."""
+        lines = ["l0: &l0 [lol, lol, lol, lol, lol, lol, lol, lol, lol, lol]"]
+        for i in range(1, 20):
+            refs = ", ".join([f"*l{i - 1}"] * 10)
+            lines.append(f"l{i}: &l{i} [{refs}]")
+        
+        data = _load_yaml("\n".join(lines))
+        
+        assert data["l19"][0] is data["l19"][9] is data["l18"]
+        assert data["l1"][0] is data["l0"]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+class TestSlots:
+    """Test parsed objects carry no per-instance __dict__."""
+    
+    def test_task_and_play_use_slots(self):
+        task = Task(name="t", module="debug", args={})
+        task._is_rescue = True
+        play = Play(name="p", hosts="all", tasks=[task])
+        assert not hasattr(task, "__dict__")
+        assert not hasattr(play, "__dict__")
+        with pytest.raises(AttributeError):
+            task.undeclared = 1
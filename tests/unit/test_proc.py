@@ -1,5 +1,6 @@
 """Unit tests for platform process utilities."""
 
+import os
 import sys
 import pytest
 from sansible.platform import proc
@@ -51,6 +52,15 @@ class TestQuoting:
         assert "hello" in result
 
 
+class TestPosixQuoting:
+    """Tests for the POSIX quoting fast path."""
+    
+    @pytest.mark.parametrize("arg", ["", "plain", "a/b-c.d", "it's", "a b", "$HOME", "caf\u00e9"])
+    def test_matches_shlex_quote(self, arg):
+        import shlex
+        assert proc._quote_posix(arg) == shlex.quote(arg)
+
+
 class TestUtilities:
     """Tests for process utilities."""
     
@@ -66,3 +76,59 @@ class TestUtilities:
     def test_is_command_available(self):
         # Python should always be available
         assert proc.is_command_available("python") or proc.is_command_available("python3")
+
+
+class TestWindowsQuoting:
+    """Tests for cmd.exe argument quoting."""
+    
+    def test_plain_argument_unchanged(self):
+        assert proc._quote_windows("C:\\tools\\app.exe") == "C:\\tools\\app.exe"
+    
+    def test_quotes_and_backslashes(self):
+        assert proc._quote_windows('say "hi"') == '"say \\"hi\\""'
+        assert proc._quote_windows('a b\\') == '"a b\\\\"'
+        assert proc._quote_windows('a\\"b') == '"a\\\\\\"b"'
+        assert proc._quote_windows("") == '""'
+
+
+class TestLargeOutput:
+    """Tests for capturing large output."""
+    
+    def test_run_captures_large_stdout(self):
+        result = proc.run([sys.executable, "-c", "import sys; sys.stdout.write('x' * 2000000)"])
+        assert result.success
+        assert len(result.stdout) == 2000000
+    
+    def test_run_env_override(self):
+        result = proc.run(
+            [sys.executable, "-c", "import os; print(os.environ['SANSIBLE_TEST_VAR'])"],
+            env={"SANSIBLE_TEST_VAR": "set"},
+        )
+        assert result.stdout.strip() == "set"
+    
+    def test_run_inherits_env_without_overrides(self, monkeypatch):
+        monkeypatch.setenv("SANSIBLE_TEST_VAR", "inherited")
+        result = proc.run(
+            [sys.executable, "-c", "import os; print(os.environ['SANSIBLE_TEST_VAR'])"],
+        )
+        assert result.stdout.strip() == "inherited"
+
+
+class TestWhich:
+    """Tests for which()."""
+    
+    def test_which_follows_path_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PATH", str(tmp_path))
+        assert proc.which("python") is None
+        
+        monkeypatch.setenv("PATH", os.path.dirname(sys.executable))
+        assert proc.which(os.path.basename(sys.executable)) is not None
+
+
+class TestProcessResult:
+    """Tests for ProcessResult."""
+    
+    def test_slots(self):
+        result = proc.ProcessResult(0, "out", "", ["true"])
+        assert not hasattr(result, "__dict__")
+        assert result.success and not result.failed
@@ -151,8 +151,8 @@ class TestWinStatModule:
         ctx = HostContext(host=host)
         
         ctx.connection = MagicMock()
-        # Return valid JSON from PowerShell
-        ps_output = '{"Exists":true,"IsDirectory":false,"Length":1024,"Mode":"Archive"}'
+        # Return the pipe-delimited stat line from PowerShell
+        ps_output = "False|1024|-a----|2024-01-01T00:00:00.0000000+00:00|2024-01-01T00:00:00.0000000+00:00"
         ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout=ps_output, stderr=""))
         
         module = WinStatModule({"path": "C:\\Windows\\System32\\cmd.exe"}, ctx)
@@ -161,3 +161,41 @@ class TestWinStatModule:
         assert not result.failed
         stat = result.results.get("stat", {})
         assert stat.get("exists") is True
+        assert stat.get("isreg") is True
+        assert stat.get("mode") == "-a----"
+    
+    @pytest.mark.asyncio
+    async def test_win_stat_missing(self):
+        """Win_stat returns exists=False for a missing path."""
+        from sansible.modules.win_stat import WinStatModule
+        from sansible.connections.base import RunResult
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout="NOEXIST\r\n", stderr=""))
+        
+        module = WinStatModule({"path": "C:\\missing.txt"}, ctx)
+        result = await module.run()
+        
+        assert not result.failed
+        assert result.results["stat"] == {"exists": False, "path": "C:\\missing.txt"}
+    
+    @pytest.mark.asyncio
+    async def test_win_stat_quotes_path(self):
+        """Win_stat passes the path as a single-quoted PowerShell literal."""
+        from sansible.modules.win_stat import WinStatModule
+        from sansible.connections.base import RunResult
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        
+        ctx.connection = MagicMock()
+        ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout="NOEXIST", stderr=""))
+        
+        module = WinStatModule({"path": "C:\\it's $HOME"}, ctx)
+        await module.run()
+        
+        script = ctx.connection.run.call_args[0][0]
+        assert "$path = 'C:\\it''s $HOME'" in script
@@ -0,0 +1,124 @@
+"""Unit tests for platform terminal utilities."""
+
+import io
+import os
+
+from sansible.platform import tty
+
+
+class FakeTTY(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestSupportsColor:
+    """Tests for supports_color."""
+    
+    def test_not_a_tty(self):
+        assert not tty.supports_color(io.StringIO())
+    
+    def test_env_changes_are_respected_after_refresh(self, monkeypatch):
+        monkeypatch.setattr(tty, "IS_WINDOWS", False)
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.delenv("FORCE_COLOR", raising=False)
+        monkeypatch.setenv("TERM", "xterm")
+        tty.refresh_env_snapshot()
+        assert tty.supports_color(FakeTTY())
+        
+        monkeypatch.setenv("NO_COLOR", "1")
+        assert tty.supports_color(FakeTTY())  # still the old snapshot
+        tty.refresh_env_snapshot()
+        assert not tty.supports_color(FakeTTY())
+        
+        monkeypatch.delenv("NO_COLOR")
+        monkeypatch.setenv("TERM", "dumb")
+        tty.refresh_env_snapshot()
+        assert not tty.supports_color(FakeTTY())
+        
+        monkeypatch.undo()
+        tty.refresh_env_snapshot()
+    
+    def test_windows_probe_runs_once(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(tty, "_windows_vt_enabled", None)
+        monkeypatch.setattr(tty, "IS_WINDOWS", True)
+        
+        def probe(*args):
+            calls.append(args)
+            return False
+        
+        tty._supports_color_cached.cache_clear()
+        monkeypatch.setattr(tty, "_windows_supports_color", probe)
+        for _ in range(3):
+            tty._supports_color_cached(True, False, False, "", "", "", "")
+        tty._supports_color_cached.cache_clear()
+        
+        assert len(calls) == 1
+
+
+class TestColorPrinter:
+    """Tests for ColorPrinter."""
+    
+    def test_disabled_returns_plain_text(self):
+        printer = tty.ColorPrinter(io.StringIO())
+        assert not printer.enabled
+        assert printer.red("x") == "x"
+        assert printer.success("ok") == "ok"
+    
+    def test_enabled_wraps(self, monkeypatch):
+        monkeypatch.setattr(tty, "supports_color", lambda stream: True)
+        printer = tty.ColorPrinter(FakeTTY())
+        assert printer.red("x") == tty.Colors.RED + "x" + tty.Colors.RESET
+        assert printer.success("{}") == (
+            tty.Colors.BRIGHT_GREEN + tty.Colors.BOLD + "{}" + tty.Colors.RESET
+        )
+
+
+class TestTerminalSize:
+    """Tests for the cached get_terminal_size."""
+    
+    def _fake_size(self, monkeypatch, calls):
+        def fake():
+            calls.append(1)
+            return os.terminal_size((100, 40))
+        monkeypatch.setattr(tty.os, "get_terminal_size", fake)
+        tty.clear_terminal_size_cache()
+    
+    def test_cached_until_resize(self, monkeypatch):
+        calls = []
+        self._fake_size(monkeypatch, calls)
+        monkeypatch.setattr(tty, "_term_size_watched", False)
+        monkeypatch.setattr(tty, "_watch_resize", lambda: True)
+        
+        assert tty.get_terminal_size() == (100, 40)
+        assert tty.get_terminal_size() == (100, 40)
+        assert len(calls) == 1
+        
+        tty._on_resize(None, None)
+        tty.get_terminal_size()
+        assert len(calls) == 2
+        tty.clear_terminal_size_cache()
+    
+    def test_unwatched_cache_expires(self, monkeypatch):
+        calls = []
+        self._fake_size(monkeypatch, calls)
+        monkeypatch.setattr(tty, "_term_size_watched", False)
+        monkeypatch.setattr(tty, "_watch_resize", lambda: False)
+        
+        tty.get_terminal_size()
+        tty.get_terminal_size()
+        assert len(calls) == 1
+        
+        monkeypatch.setattr(tty, "TERM_SIZE_TTL", 0.0)
+        tty.get_terminal_size()
+        assert len(calls) == 2
+        tty.clear_terminal_size_cache()
+    
+    def test_default_when_not_a_terminal(self, monkeypatch):
+        def fail():
+            raise OSError("not a terminal")
+        monkeypatch.setattr(tty.os, "get_terminal_size", fail)
+        monkeypatch.setattr(tty, "_watch_resize", lambda: False)
+        tty.clear_terminal_size_cache()
+        assert tty.get_terminal_size() == (80, 24)
+        tty.clear_terminal_size_cache()
@@ -0,0 +1,49 @@
+"""Unit tests for platform user utilities."""
+
+import os
+import sys
+
+import pytest
+
+from sansible.platform import users
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX accounts")
+class TestPosixUsers:
+    """Tests for user lookups on POSIX."""
+    
+    def test_current_user_exists(self):
+        name = users.get_current_user()
+        assert users.user_exists(name)
+        assert users.get_user_home(name)
+    
+    def test_unknown_user(self):
+        assert not users.user_exists("no-such-user-sansible")
+        assert users.get_user_home("no-such-user-sansible") is None
+    
+    def test_uid_and_root(self):
+        assert users.get_uid_gid() == (os.getuid(), os.getgid())
+        assert users.is_root() == (os.getuid() == 0)
+    
+    def test_current_user_info(self):
+        import pwd
+        entry = pwd.getpwuid(os.getuid())
+        assert users.current_user_info() == (os.getuid(), os.getgid(), entry.pw_name, entry.pw_dir)
+        assert users.get_current_user() == entry.pw_name
+    
+    def test_user_context(self):
+        with users.UserContext("nobody") as ctx:
+            assert ctx._original_uid == os.getuid()
+    
+    def test_lookups_cached(self):
+        users._pw_by_name_cached.cache_clear()
+        name = users.get_current_user()
+        users.user_exists(name)
+        users.get_user_home(name)
+        assert users._pw_by_name_cached.cache_info().hits == 1
+    
+    def test_missing_user_not_cached(self):
+        users._pw_by_name_cached.cache_clear()
+        assert not users.user_exists("sansible-no-such-user")
+        assert not users.user_exists("sansible-no-such-user")
+        assert users._pw_by_name_cached.cache_info().currsize == 0
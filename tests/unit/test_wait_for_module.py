@@ -141,3 +141,67 @@ class TestWinWaitForModule:
         from sansible.modules.win_wait_for import WinWaitForModule
         assert WinWaitForModule is not None
         assert WinWaitForModule.name == "win_wait_for"
+    
+    @pytest.mark.asyncio
+    async def test_win_wait_for_port_direct_probe(self):
+        """Win_wait_for connects directly from the controller when it can."""
+        import asyncio
+        from sansible.modules.win_wait_for import WinWaitForModule
+        
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        
+        try:
+            host = Host(name="test", variables={"ansible_host": "127.0.0.1"})
+            ctx = HostContext(host=host)
+            ctx.connection = MagicMock()
+            ctx.connection.run = AsyncMock(return_value=RunResult(rc=1, stdout="", stderr=""))
+            
+            module = WinWaitForModule({"port": port, "timeout": 5}, ctx)
+            result = await module.run()
+            
+            assert not result.failed
+            ctx.connection.run.assert_not_awaited()
+        finally:
+            server.close()
+            await server.wait_closed()
+    
+    @pytest.mark.asyncio
+    async def test_win_wait_for_port_use_remote(self):
+        """Win_wait_for with use_remote always probes from the target."""
+        from sansible.modules.win_wait_for import WinWaitForModule
+        
+        host = Host(name="test", variables={"ansible_host": "127.0.0.1"})
+        ctx = HostContext(host=host)
+        ctx.connection = MagicMock()
+        ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout="", stderr=""))
+        
+        module = WinWaitForModule({"port": 5985, "use_remote": True, "timeout": 5}, ctx)
+        result = await module.run()
+        
+        assert not result.failed
+        ctx.connection.run.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_win_wait_for_path_backoff(self):
+        """Win_wait_for polls with growing delays until the condition holds."""
+        from sansible.modules.win_wait_for import WinWaitForModule
+        
+        host = Host(name="test", variables={"ansible_connection": "winrm"})
+        ctx = HostContext(host=host)
+        ctx.connection = MagicMock()
+        missing = RunResult(rc=1, stdout="", stderr="")
+        ctx.connection.run = AsyncMock(side_effect=[missing, missing, RunResult(rc=0, stdout="", stderr="")])
+        
+        delays = []
+        async def fake_sleep(seconds):
+            delays.append(seconds)
+        
+        with patch("sansible.modules.win_wait_for.asyncio.sleep", fake_sleep):
+            module = WinWaitForModule({"path": "C:\\ready.flag", "sleep": 5, "timeout": 30}, ctx)
+            result = await module.run()
+        
+        assert not result.failed
+        assert len(delays) == 2
+        assert 0.1 <= delays[0] <= 0.11
+        assert 0.2 <= delays[1] <= 0.22
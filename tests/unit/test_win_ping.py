@@ -0,0 +1,75 @@
+"""
+Tests for win_ping module.
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sansible.engine.scheduler import HostContext
+from sansible.engine.inventory import Host
+from sansible.connections.base import RunResult
+
+
+def make_context() -> HostContext:
+    host = Host(name="test", variables={"ansible_connection": "winrm"})
+    ctx = HostContext(host=host)
+    ctx.connection = MagicMock()
+    ctx.connection.run = AsyncMock(return_value=RunResult(rc=0, stdout="pong", stderr=""))
+    return ctx
+
+
+class TestWinPingModule:
+    """Tests for the win_ping module."""
+    
+    @pytest.mark.asyncio
+    async def test_win_ping_runs_powershell(self):
+        """Without a connectivity signal, win_ping runs PowerShell."""
+        from sansible.modules.win_ping import WinPingModule
+        
+        ctx = make_context()
+        result = await WinPingModule({}, ctx).run()
+        
+        assert not result.failed
+        assert result.results == {"ping": "pong"}
+        ctx.connection.run.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_win_ping_recent_success(self):
+        """A recent successful command short-circuits win_ping."""
+        from sansible.modules.win_ping import WinPingModule
+        
+        ctx = make_context()
+        ctx.connection.last_success = time.monotonic()
+        result = await WinPingModule({}, ctx).run()
+        
+        assert not result.failed
+        ctx.connection.run.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_win_ping_wsman_identify(self):
+        """A successful WS-Management Identify skips PowerShell."""
+        from sansible.modules.win_ping import WinPingModule
+        
+        ctx = make_context()
+        ctx.connection.last_success = time.monotonic() - 60
+        ctx.connection.wsman_identify = AsyncMock(return_value=True)
+        result = await WinPingModule({"data": "hello"}, ctx).run()
+        
+        assert not result.failed
+        assert result.msg == "hello"
+        ctx.connection.run.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_win_ping_identify_fails_falls_back(self):
+        """A failed Identify falls back to PowerShell."""
+        from sansible.modules.win_ping import WinPingModule
+        
+        ctx = make_context()
+        ctx.connection.wsman_identify = AsyncMock(return_value=False)
+        ctx.connection.run = AsyncMock(return_value=RunResult(rc=1, stdout="", stderr="boom"))
+        result = await WinPingModule({}, ctx).run()
+        
+        assert result.failed
+        assert "boom" in result.msg
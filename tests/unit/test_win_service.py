@@ -4,6 +4,9 @@ TDD Tests for win_service module.
 These tests are written FIRST, before implementation.
 """
 
+import json
+import re
+
 import pytest
 from pathlib import Path
 from typing import Optional
@@ -40,18 +43,20 @@ class MockWinRMConnection(Connection):
                   timeout: Optional[int] = None, cwd: Optional[str] = None,
                   environment: Optional[dict] = None) -> RunResult:
         self.commands_run.append(command)
-        # Simulate PowerShell responses
+        # Simulate the fused PowerShell service script
         if "Get-Service" in command:
-            # Extract service name from command
-            for name, info in self._service_states.items():
-                if name in command:
-                    if info["exists"]:
-                        # Return state in format expected by module
-                        state = info["state"].capitalize()
-                        return RunResult(rc=0, stdout=state, stderr="")
-                    else:
-                        return RunResult(rc=1, stdout="", stderr="Service not found")
-            return RunResult(rc=1, stdout="", stderr="Service not found")
+            match = re.search(r"\$name = '([^']*)'", command)
+            info = self._service_states.get(match.group(1)) if match else None
+            if info is None or not info["exists"]:
+                return RunResult(rc=0, stdout='{"exists":false}', stderr="")
+            desired = re.search(r"\$desired = '([^']*)'", command).group(1)
+            current = info["state"]
+            target = {"started": "running", "stopped": "stopped",
+                      "restarted": "running", "paused": "paused"}.get(desired, current)
+            changed = desired == "restarted" or target != current
+            info["state"] = target
+            payload = {"exists": True, "state": target.capitalize(), "changed": changed}
+            return RunResult(rc=0, stdout=json.dumps(payload), stderr="")
         return RunResult(rc=0, stdout="", stderr="")
     
     async def put(self, local_path: Path, remote_path: str,
@@ -199,3 +204,41 @@ class TestWinServiceModule:
         
         assert result.failed == False
         assert result.changed == False  # No change needed
+    
+    @pytest.mark.asyncio
+    async def test_win_service_single_round_trip(self):
+        """win_service reads and converges state in one PowerShell call."""
+        from sansible.modules.win_service import WinServiceModule
+        
+        ctx = self.create_context()
+        ctx.connection.set_service_state("spooler", state="stopped", exists=True)
+        
+        args = {"name": "spooler", "state": "started", "start_mode": "auto"}
+        module = WinServiceModule(args, ctx)
+        result = await module.run()
+        
+        assert result.changed == True
+        assert len(ctx.connection.commands_run) == 1
+        assert "-StartupType $mode" in ctx.connection.commands_run[0]
+    
+    @pytest.mark.asyncio
+    async def test_win_service_missing(self):
+        """win_service fails for unknown services unless state=absent."""
+        from sansible.modules.win_service import WinServiceModule
+        
+        ctx = self.create_context()
+        
+        result = await WinServiceModule({"name": "nope", "state": "started"}, ctx).run()
+        assert result.failed == True
+        
+        result = await WinServiceModule({"name": "nope", "state": "absent"}, ctx).run()
+        assert result.failed == False
+        assert result.changed == False
+    
+    def test_win_service_script_quotes_state_and_mode(self):
+        """State and start mode are PowerShell-quoted, not spliced raw."""
+        from sansible.modules.win_service import WinServiceModule
+        
+        script = WinServiceModule._build_script("svc", "x'; Stop-Computer; '", "it's", False)
+        assert "$desired = 'x''; Stop-Computer; '''" in script
+        assert "$mode = 'it''s'" in script
@@ -0,0 +1,66 @@
+"""
+Tests for win_slurp module.
+"""
+
+import base64
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sansible.engine.scheduler import HostContext
+from sansible.engine.inventory import Host
+from sansible.connections.base import RunResult
+
+
+def make_context(result: RunResult) -> HostContext:
+    host = Host(name="test", variables={"ansible_connection": "winrm"})
+    ctx = HostContext(host=host)
+    ctx.connection = MagicMock()
+    ctx.connection.run = AsyncMock(return_value=result)
+    return ctx
+
+
+class TestWinSlurpModule:
+    """Tests for the win_slurp module."""
+    
+    @pytest.mark.asyncio
+    async def test_win_slurp_joins_blocks(self):
+        """Win_slurp concatenates the per-block base64 lines."""
+        from sansible.modules.win_slurp import READ_BLOCK_SIZE, WinSlurpModule
+        
+        data = bytes(range(256)) * (READ_BLOCK_SIZE // 256) + b"tail"
+        blocks = [data[:READ_BLOCK_SIZE], data[READ_BLOCK_SIZE:]]
+        stdout = "\r\n".join(base64.b64encode(b).decode() for b in blocks) + "\r\n"
+        ctx = make_context(RunResult(rc=0, stdout=stdout, stderr=""))
+        
+        result = await WinSlurpModule({"src": "C:\\data.bin"}, ctx).run()
+        
+        assert not result.failed
+        assert base64.b64decode(result.results["content"]) == data
+        ctx.connection.run.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_win_slurp_fills_each_block(self):
+        """Win_slurp refills a block after a short read before encoding it."""
+        from sansible.modules.win_slurp import WinSlurpModule
+        
+        ctx = make_context(RunResult(rc=0, stdout="", stderr=""))
+        
+        await WinSlurpModule({"src": "C:\\data.bin"}, ctx).run()
+        
+        script = ctx.connection.run.call_args[0][0]
+        assert "$stream.Read($buffer, $filled, $buffer.Length - $filled)" in script
+        assert "[Convert]::ToBase64String($buffer, 0, $filled)" in script
+        assert "while ($filled -eq $buffer.Length)" in script
+    
+    @pytest.mark.asyncio
+    async def test_win_slurp_missing_file(self):
+        """Win_slurp fails when the file does not exist."""
+        from sansible.modules.win_slurp import WinSlurpModule
+        
+        ctx = make_context(RunResult(rc=1, stdout="", stderr="FILE_NOT_FOUND"))
+        
+        result = await WinSlurpModule({"src": "C:\\missing.bin"}, ctx).run()
+        
+        assert result.failed
+        assert "File not found" in result.msg
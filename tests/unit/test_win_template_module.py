@@ -2,9 +2,11 @@
 Tests for win_template module.
 """
 
-import pytest
+import base64
 import os
 import tempfile
+
+import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from sansible.engine.scheduler import HostContext
@@ -215,10 +217,10 @@ class TestWinTemplateModule:
             ctx.check_mode = False
             ctx.hostvars = {}
             
-            # Mock Test-Path returning True (file exists)
+            # Mock the write script reporting that dest exists
             check_result = MagicMock()
             check_result.rc = 0
-            check_result.stdout = "True"
+            check_result.stdout = "SKIPPED"
             check_result.stderr = ""
             
             ctx.connection.run = AsyncMock(return_value=check_result)
@@ -333,9 +335,33 @@ class TestWinTemplateModule:
             result = await module.run()
             
             assert not result.failed
-            # Check that Set-Content command contains CRLF
-            # (the content should have \r\n after newline conversion)
-            write_cmd = [c for c in captured_content if "Set-Content" in c][0]
-            assert write_cmd is not None
+            # The uploaded payload should have \r\n after newline conversion
+            write_cmd = [c for c in captured_content if "FromBase64String" in c][0]
+            b64 = write_cmd.split("FromBase64String('")[1].split("'")[0]
+            assert base64.b64decode(b64) == b"Line1\r\nLine2\r\nLine3\r\n"
+            assert len(captured_content) == 1
+        finally:
+            os.unlink(template_path)
+    
+    def test_win_template_compiles_once(self):
+        """Win_template reuses the compiled template until the file changes."""
+        from sansible.modules.win_template import _load_template
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.j2', delete=False) as f:
+            f.write("v={{ value }}")
+            template_path = f.name
+        
+        try:
+            first = _load_template(template_path)
+            assert _load_template(template_path) is first
+            assert first.render(value=1) == "v=1"
+            
+            with open(template_path, 'w') as f:
+                f.write("changed={{ value }}")
+            os.utime(template_path, ns=(0, 0))
+            
+            second = _load_template(template_path)
+            assert second is not first
+            assert second.render(value=2) == "changed=2"
         finally:
             os.unlink(template_path)
@@ -0,0 +1,120 @@
+"""
+Tests for win_user module.
+"""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sansible.engine.scheduler import HostContext
+from sansible.engine.inventory import Host
+from sansible.connections.base import RunResult
+
+
+def make_context(payload: dict, check_mode: bool = False) -> HostContext:
+    host = Host(name="winhost", variables={"ansible_connection": "winrm"})
+    ctx = HostContext(host=host, check_mode=check_mode)
+    ctx.connection = MagicMock()
+    ctx.connection.run = AsyncMock(
+        return_value=RunResult(rc=0, stdout=json.dumps(payload), stderr="")
+    )
+    return ctx
+
+
+class TestWinUserModule:
+    """Tests for the win_user module."""
+    
+    @pytest.mark.asyncio
+    async def test_win_user_single_round_trip(self):
+        """Create, groups and enable run as one PowerShell script."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({"exists": False, "changed": True, "actions": ["created", "group+:Users"]})
+        module = WinUserModule({
+            "name": "o'brien",
+            "password": "secret",
+            "groups": ["Users", "Remote Desktop Users"],
+        }, ctx)
+        result = await module.run()
+        
+        assert not result.failed
+        assert result.changed is True
+        assert "created" in result.msg
+        ctx.connection.run.assert_awaited_once()
+        script = ctx.connection.run.call_args[0][0]
+        assert "$name = 'o''brien'" in script
+        assert "$groups = @('Users', 'Remote Desktop Users')" in script
+        assert "ForEach-Object -Parallel" in script
+    
+    @pytest.mark.asyncio
+    async def test_win_user_unchanged(self):
+        """An existing, converged user reports no change."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({"exists": True, "changed": False, "actions": []})
+        result = await WinUserModule({"name": "bob"}, ctx).run()
+        
+        assert not result.failed
+        assert result.changed is False
+        assert "unchanged" in result.msg
+    
+    @pytest.mark.asyncio
+    async def test_win_user_report_after_other_output(self):
+        """Only the last line is parsed as the JSON report."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({})
+        ctx.connection.run.return_value = RunResult(
+            rc=0,
+            stdout='WARNING: exists already\n{"exists": true, "changed": false, "actions": []}\n',
+            stderr="",
+        )
+        result = await WinUserModule({"name": "bob"}, ctx).run()
+        
+        assert not result.failed
+        assert result.changed is False
+    
+    @pytest.mark.asyncio
+    async def test_win_user_check_mode(self):
+        """Check mode only reports what would happen."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({"exists": True, "changed": False, "actions": []}, check_mode=True)
+        result = await WinUserModule({"name": "bob", "state": "absent"}, ctx).run()
+        
+        assert result.changed is True
+        assert "Would remove" in result.msg
+        assert "$checkMode = $true" in ctx.connection.run.call_args[0][0]
+    
+    @pytest.mark.asyncio
+    async def test_win_user_failure(self):
+        """Errors raised inside the script fail the task."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({"exists": False, "changed": False, "actions": [],
+                            "failed": True, "msg": "Access is denied."})
+        result = await WinUserModule({"name": "bob"}, ctx).run()
+        
+        assert result.failed
+        assert "Access is denied." in result.msg
+    
+    @pytest.mark.asyncio
+    async def test_win_user_check_mode_uses_cache(self):
+        """A recent result for the same user answers check mode without a round-trip."""
+        from sansible.modules.win_user import WinUserModule
+        
+        ctx = make_context({"exists": False, "changed": True, "actions": ["created"]})
+        await WinUserModule({"name": "carol"}, ctx).run()
+        ctx.connection.run.reset_mock()
+        
+        ctx.check_mode = True
+        result = await WinUserModule({"name": "carol"}, ctx).run()
+        
+        assert result.changed is False
+        assert "unchanged" in result.msg
+        ctx.connection.run.assert_not_awaited()
+        
+        result = await WinUserModule({"name": "carol", "state": "absent"}, ctx).run()
+        assert "Would remove" in result.msg
+        ctx.connection.run.assert_not_awaited()
@@ -0,0 +1,213 @@
+"""
+Tests for the WinRM connection's persistent runspace pool.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from sansible.connections import winrm_psrp
+from sansible.engine.inventory import Host
+
+
+class FakePool:
+    opened = 0
+    
+    def __init__(self, wsman):
+        self.closed = False
+    
+    def open(self):
+        FakePool.opened += 1
+    
+    def close(self):
+        self.closed = True
+
+
+class FakePowerShell:
+    def __init__(self, pool):
+        self.pool = pool
+        self.output = []
+        self.streams = SimpleNamespace(error=[])
+        self.had_errors = False
+        self.local_scope = None
+    
+    def add_script(self, script, use_local_scope=False):
+        self.output = [f"ran:{script}"]
+        self.local_scope = use_local_scope
+    
+    def add_parameters(self, parameters):
+        self.output.append(parameters)
+    
+    def invoke(self):
+        pass
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    monkeypatch.setattr(winrm_psrp, "HAS_PYPSRP", True)
+    monkeypatch.setattr(winrm_psrp, "RunspacePool", FakePool)
+    monkeypatch.setattr(winrm_psrp, "PowerShell", FakePowerShell)
+    FakePool.opened = 0
+    conn = winrm_psrp.WinRMConnection(Host(name="win", variables={}))
+    conn._wsman = object()
+    conn._client = SimpleNamespace(execute_ps=lambda script: (f"client:{script}", None, False))
+    return conn
+
+
+class TestWinRMRunspacePool:
+    """The runspace pool is opened once and reused."""
+    
+    def test_pool_reused_across_commands(self, connection):
+        first = connection._run_powershell("a")
+        second = connection._run_powershell("b")
+        
+        assert (first.rc, first.stdout) == (0, "ran:a")
+        assert second.stdout == "ran:b"
+        assert FakePool.opened == 1
+    
+    @pytest.mark.asyncio
+    async def test_close_releases_pool(self, connection):
+        connection._run_powershell("a")
+        pool = connection._pool
+        
+        await connection.close()
+        
+        assert pool.closed
+        assert connection._pool is None
+    
+    def test_falls_back_when_pool_cannot_open(self, connection, monkeypatch):
+        def broken_open(self):
+            raise OSError("no shell")
+        monkeypatch.setattr(FakePool, "open", broken_open)
+        
+        result = connection._run_powershell("a")
+        
+        assert result.stdout == "client:a"
+        assert connection._pool is None
+    
+    def test_invoke_does_not_hold_the_pool_lock(self, connection, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+        
+        class SlowPowerShell(FakePowerShell):
+            def invoke(self):
+                started.set()
+                release.wait(5)
+        
+        monkeypatch.setattr(winrm_psrp, "PowerShell", SlowPowerShell)
+        worker = threading.Thread(target=connection._run_powershell, args=("slow",))
+        worker.start()
+        assert started.wait(5)
+        pool = connection._pool
+        
+        # Neither another script nor close() waits for the hung invoke
+        monkeypatch.setattr(winrm_psrp, "PowerShell", FakePowerShell)
+        outputs = []
+        other = threading.Thread(target=lambda: (
+            outputs.append(connection._run_powershell("fast").stdout),
+            connection._close_pool(),
+        ))
+        other.start()
+        other.join(2)
+        blocked = other.is_alive()
+        release.set()
+        worker.join()
+        other.join()
+        
+        assert not blocked
+        assert outputs == ["ran:fast"]
+        assert pool.closed
+    
+    def test_failed_open_not_retried(self, connection, monkeypatch):
+        attempts = []
+        def broken_open(self):
+            attempts.append(1)
+            raise OSError("no shell")
+        monkeypatch.setattr(FakePool, "open", broken_open)
+        
+        connection._run_powershell("a")
+        result = connection._run_powershell("b")
+        
+        assert result.stdout == "client:b"
+        assert len(attempts) == 1
+    
+    def test_scripts_run_in_local_scope(self, connection, monkeypatch):
+        shells = []
+        monkeypatch.setattr(
+            winrm_psrp, "PowerShell",
+            lambda pool: shells.append(FakePowerShell(pool)) or shells[-1],
+        )
+        
+        connection._run_powershell("$ErrorActionPreference = 'Stop'")
+        connection._run_powershell("Write-Output $name", {"name": "x"})
+        
+        assert [ps.local_scope for ps in shells] == [True, True]
+    
+    @pytest.mark.asyncio
+    async def test_cwd_and_environment_restored(self, connection):
+        result = await connection.run(
+            "Get-Location", cwd="C:\\it's", environment={"FOO": "a'b"}
+        )
+        script = result.stdout
+        
+        assert script.startswith("ran:Push-Location -LiteralPath 'C:\\it''s' -ErrorAction Stop\n")
+        assert "[Environment]::SetEnvironmentVariable('FOO', 'a''b')" in script
+        body, restore = script.split("} finally {")
+        assert "Get-Location" in body
+        assert "$__sansible_env[$__name]" in restore
+        assert "Pop-Location" in restore
+    
+    @pytest.mark.asyncio
+    async def test_plain_command_not_wrapped(self, connection):
+        result = await connection.run("Get-Location")
+        assert result.stdout == "ran:Get-Location"
+
+
+class TestWinRMRunScript:
+    """Parameters are bound out of band, not spliced into the script."""
+    
+    @pytest.mark.asyncio
+    async def test_parameters_bound_with_param_block(self, connection):
+        result = await connection.run_script("Write-Output $name", {"name": "o'brien"})
+        
+        assert result.rc == 0
+        assert "ran:param($name)\nWrite-Output $name" in result.stdout
+        assert "o'brien" in result.stdout  # passed as a value, unquoted
+    
+    def test_fallback_renders_assignments(self, connection, monkeypatch):
+        def broken_open(self):
+            raise OSError("no shell")
+        monkeypatch.setattr(FakePool, "open", broken_open)
+        
+        result = connection._run_powershell("Write-Output $name", {"name": "o'brien"})
+        
+        assert result.stdout == "client:$name = 'o''brien'\nWrite-Output $name"
+
+
+class TestScriptCacheMaintenance:
+    """The remote ScriptBlock cache is cleared on an interval and after big scripts."""
+    
+    def test_cleared_every_interval(self, connection, monkeypatch):
+        monkeypatch.setattr(winrm_psrp, "SCRIPT_CACHE_CLEAR_INTERVAL", 3)
+        
+        scripts = [connection._with_cache_maintenance(f"s{i}") for i in range(7)]
+        
+        cleared = [s.startswith(winrm_psrp.CLEAR_SCRIPT_CACHE_PS) for s in scripts]
+        assert cleared == [False, False, False, True, False, False, True]
+        assert scripts[3].endswith("s3")
+    
+    def test_cleared_after_large_script(self, connection, monkeypatch):
+        monkeypatch.setattr(winrm_psrp, "SCRIPT_CACHE_CLEAR_SIZE", 10)
+        
+        big = connection._with_cache_maintenance("x" * 11)
+        after = connection._with_cache_maintenance("small")
+        again = connection._with_cache_maintenance("small")
+        
+        assert not big.startswith(winrm_psrp.CLEAR_SCRIPT_CACHE_PS)
+        assert after.startswith(winrm_psrp.CLEAR_SCRIPT_CACHE_PS)
+        assert again == "small"
+    
+    def test_clear_cannot_fail_the_script(self):
+        script = winrm_psrp.CLEAR_SCRIPT_CACHE_PS
+        assert script.startswith("try {") and script.rstrip().endswith("catch {}")
+        assert "$null -ne" in script